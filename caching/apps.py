@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class CachingConfig(AppConfig):
+    name = "caching"
+
+    def ready(self) -> None:
+        """
+        Invalidate cached querysets whenever a model is saved or deleted, and
+        drop local copies of tags that other workers invalidated.
+        """
+        from caching import bus
+        from caching.signals import connect_table_invalidation
+        from caching.tags import drop_local_generations
+
+        connect_table_invalidation()
+        bus.subscribe(drop_local_generations)
@@ -0,0 +1,517 @@
+import logging
+import pickle  # nosec B403
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+from weakref import WeakSet
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.db import DatabaseCache as DjangoDatabaseCache
+
+from caching import metrics
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Every TieredCache instance (Django creates one per thread), so the local
+# tiers can be purged from anywhere in the process.
+_tiered_caches: WeakSet[BaseTieredCache] = WeakSet()
+
+
+def drop_local_keys(keys: Iterable[str]) -> None:
+    """Drop ``keys`` from the local tier of every tiered cache in the process."""
+    keys = list(keys)
+    for tiered_cache in list(_tiered_caches):
+        tiered_cache.drop_local(keys)
+
+
+@dataclass(slots=True)
+class _Operation:
+    # False when the call is nested inside another operation on the same
+    # cache (e.g. DatabaseCache.get calling get_many) and must not be counted.
+    outermost: bool
+    seconds: float = 0.0
+    # Pickled sizes by full cache key, shared with the operations nested in
+    # this one (e.g. on the shared tier of a TieredCache).
+    sizes: dict[str, int] = field(default_factory=dict)
+
+
+# Sizes of the operation in progress, for the local tier to fill in with the
+# lengths of the pickles it makes anyway.
+_pickled_sizes: ContextVar[dict[str, int] | None] = ContextVar(
+    "cache_pickled_sizes",
+    default=None,
+)
+
+
+def _note_size(key: str, pickled: bytes) -> None:
+    """Record the pickled size of ``key`` for the cache operation in progress."""
+    if (sizes := _pickled_sizes.get()) is not None:
+        sizes[key] = len(pickled)
+
+
+# ids of the instrumented caches with an operation in progress.
+_active_caches: ContextVar[frozenset[int]] = ContextVar(
+    "instrumented_caches",
+    default=frozenset(),
+)
+
+
+class InstrumentedCacheMixin(BaseCache):
+    """
+    Reports hits, misses, writes, bytes and latency to caching.metrics.
+
+    Operations are recorded under ``metrics_name`` (the METRICS_NAME option)
+    and grouped by key prefix.
+    """
+
+    metrics_name = "cache"
+
+    def _set_metrics_name(self, params: dict[str, Any], default: str) -> None:
+        self.metrics_name = params.get("OPTIONS", {}).get("METRICS_NAME", default)
+
+    @contextmanager
+    def _operation(self) -> Iterator[_Operation]:
+        active = _active_caches.get()
+        if id(self) in active:
+            yield _Operation(outermost=False)
+            return
+
+        operation = _Operation(outermost=True)
+        if (sizes := _pickled_sizes.get()) is not None:
+            operation.sizes = sizes
+        token = _active_caches.set(active | {id(self)})
+        sizes_token = _pickled_sizes.set(operation.sizes)
+        start = time.perf_counter()
+        try:
+            yield operation
+        finally:
+            operation.seconds = time.perf_counter() - start
+            _pickled_sizes.reset(sizes_token)
+            _active_caches.reset(token)
+
+    def _value_size(
+        self,
+        op: _Operation,
+        key: str,
+        value: Any,
+        version: int | None,
+    ) -> int:
+        """Return the size of ``value``, reusing a pickle made during ``op``."""
+        if isinstance(value, bytes | str):
+            return metrics.value_size(value)
+        full_key = self.make_key(key, version=version)
+        if full_key not in op.sizes:
+            op.sizes[full_key] = metrics.value_size(value)
+        return op.sizes[full_key]
+
+    def add(
+        self,
+        key: str,
+        value: Any,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> bool:
+        with self._operation() as op:
+            added = super().add(key, value, timeout, version=version)
+        if op.outermost:
+            metrics.record(
+                self.metrics_name,
+                key,
+                op.seconds,
+                sets=int(added),
+                bytes_written=self._value_size(op, key, value, version) if added else 0,
+            )
+        return added
+
+    def get(self, key: str, default: Any = None, version: int | None = None) -> Any:
+        with self._operation() as op:
+            value = super().get(key, _MISSING, version=version)
+        hit = value is not _MISSING
+        if op.outermost:
+            metrics.record(
+                self.metrics_name,
+                key,
+                op.seconds,
+                hits=int(hit),
+                misses=int(not hit),
+                bytes_read=self._value_size(op, key, value, version) if hit else 0,
+            )
+        return value if hit else default
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> None:
+        with self._operation() as op:
+            super().set(key, value, timeout, version=version)
+        if op.outermost:
+            metrics.record(
+                self.metrics_name,
+                key,
+                op.seconds,
+                sets=1,
+                bytes_written=self._value_size(op, key, value, version),
+            )
+
+    def delete(self, key: str, version: int | None = None) -> bool:
+        with self._operation() as op:
+            deleted = super().delete(key, version=version)
+        if op.outermost:
+            metrics.record(self.metrics_name, key, op.seconds, deletes=int(deleted))
+        return deleted
+
+    def get_many(self, keys: Any, version: int | None = None) -> dict[str, Any]:
+        keys = list(keys)
+        with self._operation() as op:
+            found = super().get_many(keys, version=version)
+        if op.outermost:
+            seconds = op.seconds / max(len(keys), 1)
+            for key in keys:
+                hit = key in found
+                metrics.record(
+                    self.metrics_name,
+                    key,
+                    seconds,
+                    hits=int(hit),
+                    misses=int(not hit),
+                    bytes_read=(
+                        self._value_size(op, key, found[key], version) if hit else 0
+                    ),
+                )
+        return found
+
+    def set_many(
+        self,
+        data: dict[str, Any],
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> list[str]:
+        with self._operation() as op:
+            failed = super().set_many(data, timeout, version=version)
+        if op.outermost:
+            seconds = op.seconds / max(len(data), 1)
+            for key, value in data.items():
+                stored = key not in failed
+                metrics.record(
+                    self.metrics_name,
+                    key,
+                    seconds,
+                    sets=int(stored),
+                    bytes_written=(
+                        self._value_size(op, key, value, version) if stored else 0
+                    ),
+                )
+        return failed
+
+    def delete_many(self, keys: Any, version: int | None = None) -> None:
+        keys = list(keys)
+        with self._operation() as op:
+            super().delete_many(keys, version=version)
+        if op.outermost:
+            seconds = op.seconds / max(len(keys), 1)
+            for key in keys:
+                metrics.record(self.metrics_name, key, seconds, deletes=1)
+
+    def incr(self, key: str, delta: int = 1, version: int | None = None) -> int:
+        found = True
+        try:
+            with self._operation() as op:
+                value = super().incr(key, delta, version=version)
+        except ValueError:
+            found = False
+            raise
+        finally:
+            if op.outermost:
+                metrics.record(
+                    self.metrics_name,
+                    key,
+                    op.seconds,
+                    hits=int(found),
+                    misses=int(not found),
+                    sets=int(found),
+                )
+        return value
+
+
+class DatabaseCache(InstrumentedCacheMixin, DjangoDatabaseCache):
+    """Django's DatabaseCache with operation statistics."""
+
+    def __init__(self, table: str, params: dict[str, Any]) -> None:
+        super().__init__(table, params)
+        self._set_metrics_name(params, table)
+
+
+class BaseTieredCache(BaseCache):
+    """
+    Two-tier cache: a bounded per-process LRU in front of a shared backend.
+
+    Reads are served from the local tier when possible and fall through to the
+    shared tier (configured as another alias in CACHES) on a miss. Writes go to
+    both tiers. Local entries never outlive LOCAL_TIMEOUT seconds, which bounds
+    how long another worker can serve a value that was changed elsewhere.
+
+    Local keys are the fully versioned cache keys, so bumping a key's version
+    (or the cache VERSION setting on deploy) makes every worker's local copy
+    unreachable at once instead of waiting for it to expire.
+
+    OPTIONS:
+        SHARED_ALIAS: alias of the shared cache in CACHES (default "shared").
+        LOCAL_MAX_ENTRIES: maximum number of entries kept in-process.
+        LOCAL_TIMEOUT: maximum lifetime in seconds of a local entry.
+    """
+
+    def __init__(self, location: str, params: dict[str, Any]) -> None:
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._shared_alias = options.get("SHARED_ALIAS", "shared")
+        self._local_max_entries = int(options.get("LOCAL_MAX_ENTRIES", 1000))
+        self._local_timeout = float(options.get("LOCAL_TIMEOUT", 30))
+
+        # key -> (pickled value, monotonic expiry)
+        self._local: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        _tiered_caches.add(self)
+        self._counters = {
+            "local": dict.fromkeys(("hits", "misses", "evictions", "expirations"), 0),
+            "shared": dict.fromkeys(("hits", "misses"), 0),
+        }
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self._shared_alias]
+
+    # Local tier helpers
+
+    def _local_ttl(self, timeout: float | None) -> float:
+        """Cap a shared-tier timeout (seconds, or None for forever) locally."""
+        if timeout is None:
+            return self._local_timeout
+        return min(timeout, self._local_timeout)
+
+    def _local_get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                self._counters["local"]["misses"] += 1
+                return _MISSING
+            pickled, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._local[key]
+                self._counters["local"]["expirations"] += 1
+                self._counters["local"]["misses"] += 1
+                return _MISSING
+            self._local.move_to_end(key)
+            self._counters["local"]["hits"] += 1
+        _note_size(key, pickled)
+        return pickle.loads(pickled)  # nosec B301
+
+    def _dumps(self, key: str, value: Any) -> bytes:
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        _note_size(key, pickled)
+        return pickled
+
+    def _local_set(self, key: str, pickled: bytes, timeout: float | None) -> None:
+        ttl = self._local_ttl(timeout)
+        if ttl <= 0:
+            self._local_delete(key)
+            return
+        with self._lock:
+            self._local[key] = (pickled, time.monotonic() + ttl)
+            self._local.move_to_end(key)
+            while len(self._local) > self._local_max_entries:
+                self._local.popitem(last=False)
+                self._counters["local"]["evictions"] += 1
+
+    def _local_delete(self, key: str) -> None:
+        with self._lock:
+            self._local.pop(key, None)
+
+    def _seconds(self, timeout: float | None) -> float | None:
+        """Resolve DEFAULT_TIMEOUT and return a relative timeout in seconds."""
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return None if timeout is None else float(timeout)
+
+    def _record_shared(self, hit: bool) -> None:
+        with self._lock:
+            self._counters["shared"]["hits" if hit else "misses"] += 1
+
+    # Cache API
+
+    def add(
+        self,
+        key: str,
+        value: Any,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> bool:
+        local_key = self.make_and_validate_key(key, version=version)
+        # Pickled first, so the metrics of both tiers reuse its length.
+        pickled = self._dumps(local_key, value)
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._local_set(local_key, pickled, self._seconds(timeout))
+        else:
+            # Another worker owns the value; make sure we re-read it.
+            self._local_delete(local_key)
+        return added
+
+    def get(self, key: str, default: Any = None, version: int | None = None) -> Any:
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self._local_get(local_key)
+        if value is not _MISSING:
+            return value
+
+        value = self.shared.get(key, _MISSING, version=version)
+        self._record_shared(value is not _MISSING)
+        if value is _MISSING:
+            return default
+        self._local_set(local_key, self._dumps(local_key, value), None)
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> None:
+        local_key = self.make_and_validate_key(key, version=version)
+        pickled = self._dumps(local_key, value)
+        self.shared.set(key, value, timeout, version=version)
+        self._local_set(local_key, pickled, self._seconds(timeout))
+
+    def touch(
+        self,
+        key: str,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> bool:
+        self.make_and_validate_key(key, version=version)
+        return bool(self.shared.touch(key, timeout, version=version))
+
+    def delete(self, key: str, version: int | None = None) -> bool:
+        local_key = self.make_and_validate_key(key, version=version)
+        self._local_delete(local_key)
+        return bool(self.shared.delete(key, version=version))
+
+    def get_many(self, keys: Any, version: int | None = None) -> dict[str, Any]:
+        found: dict[str, Any] = {}
+        missing: dict[str, str] = {}
+        for key in keys:
+            local_key = self.make_and_validate_key(key, version=version)
+            value = self._local_get(local_key)
+            if value is _MISSING:
+                missing[key] = local_key
+            else:
+                found[key] = value
+
+        if missing:
+            shared_values = self.shared.get_many(list(missing), version=version)
+            for key, local_key in missing.items():
+                hit = key in shared_values
+                self._record_shared(hit)
+                if hit:
+                    found[key] = shared_values[key]
+                    pickled = self._dumps(local_key, shared_values[key])
+                    self._local_set(local_key, pickled, None)
+        return found
+
+    def set_many(
+        self,
+        data: dict[str, Any],
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> list[str]:
+        local_keys = {
+            key: self.make_and_validate_key(key, version=version) for key in data
+        }
+        pickled = {key: self._dumps(local_keys[key], data[key]) for key in data}
+        failed = self.shared.set_many(data, timeout, version=version)
+        seconds = self._seconds(timeout)
+        for key, local_key in local_keys.items():
+            if key in failed:
+                self._local_delete(local_key)
+            else:
+                self._local_set(local_key, pickled[key], seconds)
+        return failed
+
+    def delete_many(self, keys: Any, version: int | None = None) -> None:
+        keys = list(keys)
+        for key in keys:
+            self._local_delete(self.make_and_validate_key(key, version=version))
+        self.shared.delete_many(keys, version=version)
+
+    def incr(self, key: str, delta: int = 1, version: int | None = None) -> int:
+        local_key = self.make_and_validate_key(key, version=version)
+        try:
+            value = self.shared.incr(key, delta, version=version)
+        except ValueError:
+            self._local_delete(local_key)
+            raise
+        self._local_set(local_key, self._dumps(local_key, value), None)
+        return value
+
+    def has_key(self, key: str, version: int | None = None) -> bool:
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def clear(self) -> None:
+        self.clear_local()
+        self.shared.clear()
+
+    # Tier management and statistics
+
+    def drop_local(self, keys: Iterable[str], version: int | None = None) -> None:
+        """Drop ``keys`` from this process's local tier only."""
+        local_keys = [self.make_key(key, version=version) for key in keys]
+        with self._lock:
+            for local_key in local_keys:
+                self._local.pop(local_key, None)
+
+    def clear_local(self) -> None:
+        """Drop every entry in this process's local tier."""
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return hit ratio and eviction counters for each tier."""
+        with self._lock:
+            result: dict[str, dict[str, Any]] = {
+                tier: dict(counts) for tier, counts in self._counters.items()
+            }
+            result["local"]["entries"] = len(self._local)
+            result["local"]["max_entries"] = self._local_max_entries
+        for counts in result.values():
+            lookups = counts["hits"] + counts["misses"]
+            counts["hit_ratio"] = counts["hits"] / lookups if lookups else 0.0
+        return result
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for counts in self._counters.values():
+                for name in counts:
+                    counts[name] = 0
+
+
+class TieredCache(InstrumentedCacheMixin, BaseTieredCache):
+    """
+    Two-tier cache with operation statistics.
+
+    Takes the OPTIONS of BaseTieredCache, plus METRICS_NAME: the name the
+    cache's statistics are reported under (default "tiered").
+    """
+
+    def __init__(self, location: str, params: dict[str, Any]) -> None:
+        super().__init__(location, params)
+        self._set_metrics_name(params, "tiered")
@@ -0,0 +1,136 @@
+"""
+Invalidation bus between workers, backed only by the database.
+
+Per-process caches (the local tier of TieredCache, model snapshots) copy
+values from the shared cache and would otherwise serve them until they
+expire. ``publish`` records a tag's new generation in the Generation table;
+every worker calls ``poll`` (from CacheInvalidationMiddleware) at most once
+per CACHE_BUS_POLL_INTERVAL seconds, and passes the tags changed since its
+last poll to the subscribed callbacks, which drop their local copies. A
+change made on one node therefore reaches every node within roughly the
+poll interval, with no service besides the database.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two polls of the same worker.
+POLL_INTERVAL = getattr(settings, "CACHE_BUS_POLL_INTERVAL", 1.0)
+# Rows are re-read for this long after their timestamp, so a node whose clock
+# is slightly behind another node's still sees that node's changes.
+CLOCK_SKEW = timedelta(seconds=getattr(settings, "CACHE_BUS_CLOCK_SKEW", 5))
+
+Subscriber = Callable[[list[str]], None]
+
+_subscribers: list[Subscriber] = []
+_poll_lock = threading.Lock()
+_next_poll = 0.0
+_cursor: datetime | None = None
+# name -> (value, updated_at) of the rows seen within the clock skew window.
+_seen: dict[str, tuple[int, datetime]] = {}
+
+
+def subscribe(callback: Subscriber) -> None:
+    """Call ``callback`` with the names of the tags other workers changed."""
+    if callback not in _subscribers:
+        _subscribers.append(callback)
+
+
+def publish(generations: Mapping[str, int]) -> None:
+    """Record new generations of cache tags for the other workers to pick up."""
+    if not generations:
+        return
+    Generation = apps.get_model("caching", "Generation")
+    now = timezone.now()
+    try:
+        # A savepoint keeps a failure here from breaking the caller's transaction.
+        with transaction.atomic():
+            Generation.objects.bulk_create(
+                [
+                    Generation(name=name, value=value, updated_at=now)
+                    for name, value in generations.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["name"],
+                update_fields=["value", "updated_at"],
+            )
+    except DatabaseError:
+        # Other workers fall back to their local timeouts.
+        logger.exception("Could not publish cache invalidations")
+
+
+def poll(force: bool = False) -> list[str]:
+    """
+    Notify subscribers of the tags changed since the last poll.
+
+    Returns the changed names. Calls within POLL_INTERVAL of the previous poll
+    return immediately unless ``force`` is set, as do calls made while
+    another thread is polling.
+    """
+    global _next_poll
+
+    if not force and time.monotonic() < _next_poll:
+        return []
+    if not _poll_lock.acquire(blocking=False):
+        return []
+    try:
+        _next_poll = time.monotonic() + POLL_INTERVAL
+        changed = _read_changes()
+    except DatabaseError:
+        logger.exception("Could not poll for cache invalidations")
+        return []
+    finally:
+        _poll_lock.release()
+
+    if changed:
+        logger.debug("Dropping local copies of cache tags: %s", ", ".join(changed))
+        for callback in list(_subscribers):
+            callback(changed)
+    return changed
+
+
+def _read_changes() -> list[str]:
+    global _cursor
+
+    Generation = apps.get_model("caching", "Generation")
+    if _cursor is None:
+        # A new process has nothing local to drop yet; start from now.
+        _cursor = timezone.now()
+        return []
+
+    rows = Generation.objects.filter(updated_at__gte=_cursor - CLOCK_SKEW).values_list(
+        "name",
+        "value",
+        "updated_at",
+    )
+    changed = []
+    for name, value, updated_at in rows:
+        previous = _seen.get(name)
+        if previous is None or previous[0] != value:
+            changed.append(name)
+        _seen[name] = (value, updated_at)
+        _cursor = max(_cursor, updated_at)
+
+    horizon = _cursor - CLOCK_SKEW
+    for name in [name for name, (_, at) in _seen.items() if at < horizon]:
+        del _seen[name]
+    return changed
+
+
+def reset() -> None:
+    """Forget the poll position, as if the process had just started."""
+    global _next_poll, _cursor
+    with _poll_lock:
+        _next_poll = 0.0
+        _cursor = None
+        _seen.clear()
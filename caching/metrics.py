@@ -0,0 +1,135 @@
+"""
+Per-process cache statistics.
+
+Instrumented cache backends report every operation here, grouped by cache and
+by key prefix (``heatmap``, ``taxonomy-chart``, ``cache-tag`` and so on). The
+numbers are kept per worker process and reset when it restarts.
+"""
+
+import pickle  # nosec B403
+import threading
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any
+
+FRAGMENT_KEY_PREFIX = "template.cache."
+
+
+@dataclass(slots=True)
+class CacheCounters:
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    deletes: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    calls: int = 0
+    seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def avg_latency_ms(self) -> float:
+        return self.seconds * 1000 / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["hit_ratio"] = self.hit_ratio
+        data["avg_latency_ms"] = self.avg_latency_ms
+        return data
+
+
+_lock = threading.Lock()
+_counters: defaultdict[tuple[str, str], CacheCounters] = defaultdict(CacheCounters)
+
+# Totals for the request currently being served, when one is being tracked.
+_request_counters: ContextVar[CacheCounters | None] = ContextVar(
+    "cache_request_counters",
+    default=None,
+)
+
+
+def key_prefix(key: str) -> str:
+    """
+    Return the group a cache key belongs to.
+
+    Template fragment keys ("template.cache.heatmap.<hash>") are grouped by
+    fragment name; other keys by their first ":" or "." separated segment.
+    """
+    if key.startswith(FRAGMENT_KEY_PREFIX):
+        key = key.removeprefix(FRAGMENT_KEY_PREFIX)
+    for index, char in enumerate(key):
+        if char in ":.":
+            return key[:index]
+    return key
+
+
+def value_size(value: Any) -> int:
+    """Approximate the stored size of a cached value in bytes."""
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode())
+    try:
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+    except Exception:  # Unpicklable values are simply not measured.
+        return 0
+
+
+def record(
+    cache_name: str,
+    key: str,
+    seconds: float,
+    *,
+    hits: int = 0,
+    misses: int = 0,
+    sets: int = 0,
+    deletes: int = 0,
+    bytes_read: int = 0,
+    bytes_written: int = 0,
+) -> None:
+    """Add one cache operation to the process and request totals."""
+    targets = [_counters[(cache_name, key_prefix(key))]]
+    request_counters = _request_counters.get()
+    if request_counters is not None:
+        targets.append(request_counters)
+
+    with _lock:
+        for counters in targets:
+            counters.calls += 1
+            counters.seconds += seconds
+            counters.hits += hits
+            counters.misses += misses
+            counters.sets += sets
+            counters.deletes += deletes
+            counters.bytes_read += bytes_read
+            counters.bytes_written += bytes_written
+
+
+def snapshot() -> dict[tuple[str, str], CacheCounters]:
+    """Return a copy of the counters, keyed by (cache name, key prefix)."""
+    with _lock:
+        return {
+            group: CacheCounters(**asdict(counters))
+            for group, counters in sorted(_counters.items())
+        }
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+
+
+def start_request() -> CacheCounters:
+    """Start collecting totals for the current request."""
+    counters = CacheCounters()
+    _request_counters.set(counters)
+    return counters
+
+
+def finish_request() -> None:
+    _request_counters.set(None)
@@ -0,0 +1,60 @@
+import logging
+from collections.abc import Callable
+
+from django.http import HttpRequest, HttpResponse
+
+from caching import bus, metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CacheMetricsMiddleware:
+    """
+    Log the cache traffic of each request and report it in Server-Timing.
+
+    Meant for development: it is only installed when DEBUG is on, and the
+    header shows up in the browser's network panel next to the request.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        counters = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.finish_request()
+
+        if counters.calls:
+            logger.debug(
+                "%s %s: %s cache calls, %s hits, %s misses, %s sets, %.1f ms",
+                request.method,
+                request.path,
+                counters.calls,
+                counters.hits,
+                counters.misses,
+                counters.sets,
+                counters.seconds * 1000,
+            )
+        response["Server-Timing"] = (
+            f'cache;dur={counters.seconds * 1000:.1f};desc="{counters.hits} hits, '
+            f'{counters.misses} misses, {counters.calls} calls"'
+        )
+        return response
+
+
+class CacheInvalidationMiddleware:
+    """
+    Pick up cache tags invalidated by other workers before serving a request.
+
+    Polls the invalidation bus, which queries the database at most once per
+    CACHE_BUS_POLL_INTERVAL seconds per process.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        bus.poll()
+        return self.get_response(request)
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Generation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('value', models.BigIntegerField()),
+                ('updated_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+import logging
+
+from django.db import models
+
+logger = logging.getLogger(__name__)
+
+
+class Generation(models.Model):
+    """
+    Latest generation of a cache tag, shared by every worker through the database.
+
+    Workers poll for rows updated since their last poll and drop their
+    in-process copies of the changed tags (see caching.bus).
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    value = models.BigIntegerField()
+    updated_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return f"{self.name}={self.value}"
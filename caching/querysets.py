@@ -0,0 +1,106 @@
+"""
+Opt-in caching of queryset results.
+
+``queryset.cached(timeout)`` stores the rows a queryset fetches under a key
+built from its compiled SQL and parameters. The entry is registered under a
+``table:<db_table>`` cache tag for every table the SQL mentions, and the
+receivers in caching.signals invalidate those tags whenever an instance of a
+model listed in CACHED_QUERYSET_MODELS is saved or deleted, so cached results
+never outlive a change made through the ORM's save()/delete(). A cached query
+that reads an unlisted table logs a warning. Bulk ``update()`` and raw SQL
+bypass the signals and must invalidate the table tags themselves.
+"""
+
+import hashlib
+import logging
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, Self, cast
+
+from django.apps import apps
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, models
+
+from caching.signals import invalidated_tables
+from caching.tags import get_or_set, table_tag
+
+logger = logging.getLogger(__name__)
+
+_UNCACHED = object()
+
+
+def query_tables(sql: str, using: str) -> list[str]:
+    """Return the tables of installed models referenced in ``sql``."""
+    quote_name = connections[using].ops.quote_name
+    return sorted(
+        {
+            model._meta.db_table
+            for model in apps.get_models(include_auto_created=True)
+            if quote_name(model._meta.db_table) in sql
+        },
+    )
+
+
+class CachedQuerySet(models.QuerySet):
+    """Queryset with an opt-in ``cached()`` method."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._cache_timeout: Any = _UNCACHED
+
+    def cached(self, timeout: float | None = DEFAULT_TIMEOUT) -> Self:
+        """
+        Return a copy whose results are read from and stored in the cache.
+
+        ``timeout`` is in seconds (None to keep results until a table
+        changes). Prefetched relations are not cached and are fetched as usual.
+        """
+        clone = self.all()
+        clone._cache_timeout = timeout
+        return clone
+
+    if TYPE_CHECKING:
+        # The stubs' values() returns a plain QuerySet, which has no cached().
+        def values(
+            self,
+            *fields: Any,
+            **expressions: Any,
+        ) -> CachedQuerySet[Any, dict[str, Any]]: ...
+
+    def _clone(self) -> Self:
+        clone: Self = super()._clone()  # type: ignore[misc]
+        clone._cache_timeout = self._cache_timeout
+        return clone
+
+    def _fetch_all(self) -> None:
+        if self._result_cache is None and self._cache_timeout is not _UNCACHED:
+            self._result_cache = self._fetch_cached()
+        super()._fetch_all()
+
+    def _fetch_cached(self) -> list[Any] | None:
+        try:
+            sql, params = self.query.sql_with_params()
+        except EmptyResultSet:
+            return None
+
+        # The iterable class is part of the key: values() and values_list()
+        # over the same SQL build different rows.
+        raw_key = f"{self.db}|{self._iterable_class.__name__}|{sql}|{params!r}"
+        digest = hashlib.md5(raw_key.encode(), usedforsecurity=False).hexdigest()
+        tables = query_tables(sql, self.db)
+        if stale := set(tables) - invalidated_tables:
+            logger.warning(
+                "Cached query reads %s, which are missing from "
+                "CACHED_QUERYSET_MODELS and never invalidated",
+                ", ".join(sorted(stale)),
+            )
+        tags = [table_tag(table) for table in tables]
+        # The stubs type the iterable classes against plain querysets only.
+        iterable_class = cast(Callable[[Any], Iterable[Any]], self._iterable_class)
+        rows: list[Any] = get_or_set(
+            f"queryset:{digest}",
+            lambda: list(iterable_class(self)),
+            tags,
+            self._cache_timeout,
+        )
+        return rows
@@ -0,0 +1,145 @@
+"""
+Token-bucket rate limiting stored in the cache.
+
+Each bucket holds up to ``capacity`` tokens and refills continuously at
+``capacity / period`` tokens a second; a request takes one token or is
+refused with the number of seconds until one is available. A bucket is a
+single cache entry of (tokens, last update), so checking it costs one cache
+read plus one write, and an idle bucket simply expires once it would be
+full again.
+
+Every worker must see the same bucket, so buckets bypass the per-process
+tier of a TieredCache and live in its shared cache only; otherwise each
+worker would refill from its own stale copy and the effective limit would
+grow with the number of workers. With the DatabaseCache as the shared tier,
+as configured here, that read and write are about four SQL queries per
+bucket (a SELECT to read it; a COUNT, a SELECT and an UPDATE or INSERT to
+write it), so a signed-in request with both buckets pays about eight.
+Setting RATE_LIMIT_CACHE_ALIAS to a Memcached or Redis alias removes them.
+
+Buckets are read and written without a lock, so concurrent requests for
+the same bucket can occasionally both take the last token. That is fine
+for throttling; it is not a quota.
+
+Limits are written as "<requests>/<period>", where the period is a unit
+(s, m, h, d) optionally preceded by a multiplier: "30/m", "5/10s".
+"""
+
+import logging
+import math
+import re
+import time
+from functools import lru_cache
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpRequest
+
+from caching.backends import BaseTieredCache
+
+logger = logging.getLogger(__name__)
+
+# Cache alias holding the buckets (the shared tier of a TieredCache).
+CACHE_ALIAS = getattr(settings, "RATE_LIMIT_CACHE_ALIAS", "default")
+# Limits for scopes missing from settings.RATE_LIMITS.
+DEFAULT_LIMITS: dict[str, str | None] = {"user": "30/m", "ip": "120/m"}
+
+_RATE_RE = re.compile(r"^(\d+)/(\d*)([smhd])$")
+_UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+
+class Rate(NamedTuple):
+    capacity: int
+    period: float
+
+    @property
+    def refill(self) -> float:
+        """Tokens added per second."""
+        return self.capacity / self.period
+
+
+def bucket_cache() -> BaseCache:
+    """Return the cache holding the buckets, skipping any per-process tier."""
+    cache = caches[CACHE_ALIAS]
+    return cache.shared if isinstance(cache, BaseTieredCache) else cache
+
+
+@lru_cache
+def parse_rate(rate: str) -> Rate:
+    match = _RATE_RE.match(rate.strip())
+    if not match or int(match[1]) == 0:
+        raise ImproperlyConfigured(f"Invalid rate limit {rate!r}")
+    multiplier = int(match[2] or 1)
+    return Rate(int(match[1]), float(multiplier * _UNITS[match[3]]))
+
+
+def take(key: str, rate: Rate) -> float:
+    """
+    Take a token from the bucket ``key``.
+
+    Returns 0 if the request is allowed, otherwise the number of seconds
+    until the bucket holds a token again.
+    """
+    cache = bucket_cache()
+    now = time.time()
+    tokens, updated = cache.get(key) or (rate.capacity, now)
+    tokens = min(rate.capacity, tokens + max(now - updated, 0) * rate.refill)
+    if tokens < 1:
+        return (1 - tokens) / rate.refill
+    cache.set(key, (tokens - 1, now), math.ceil(rate.period))
+    return 0.0
+
+
+def client_ip(request: HttpRequest) -> str:
+    """
+    Return the client's address, looking through trusted proxies.
+
+    With RATE_LIMIT_PROXY_COUNT set to the number of proxies in front of the
+    site, the address is read from X-Forwarded-For, skipping the entries those
+    proxies appended; anything further left is client-controlled.
+    """
+    proxies: int = getattr(settings, "RATE_LIMIT_PROXY_COUNT", 0)
+    forwarded: str = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    if proxies and forwarded:
+        hops = [hop.strip() for hop in forwarded.split(",")]
+        return hops[max(len(hops) - proxies, 0)]
+    return str(request.META.get("REMOTE_ADDR", ""))
+
+
+def limits_for(scope: str) -> dict[str, str | None]:
+    limits: dict[str, dict[str, str | None]] = getattr(settings, "RATE_LIMITS", {})
+    return limits.get(scope, DEFAULT_LIMITS)
+
+
+def check(request: HttpRequest, scope: str) -> float:
+    """
+    Charge ``request`` to the user and IP buckets of ``scope``.
+
+    Returns 0 if every bucket allowed the request, otherwise the number of
+    seconds the client should wait before retrying. Buckets are checked in
+    turn and the first refusal stops the check.
+    """
+    limits = limits_for(scope)
+    identities = {}
+    if request.user.is_authenticated:
+        identities["user"] = str(request.user.pk)
+    identities["ip"] = client_ip(request)
+
+    for kind, identity in identities.items():
+        limit = limits.get(kind)
+        if not limit or not identity:
+            continue
+        retry_after = take(f"ratelimit:{scope}:{kind}:{identity}", parse_rate(limit))
+        if retry_after:
+            logger.info(
+                "Rate limited %s request from %s %s (retry in %.1fs)",
+                scope,
+                kind,
+                identity,
+                retry_after,
+            )
+            return retry_after
+    return 0.0
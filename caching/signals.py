@@ -0,0 +1,62 @@
+import logging
+from typing import Any
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from caching.tags import invalidate_tags, table_tag
+
+logger = logging.getLogger(__name__)
+
+# Tables whose writes invalidate their table tag, filled by
+# connect_table_invalidation().
+invalidated_tables: set[str] = set()
+
+
+def invalidate_table(sender: type[models.Model], **kwargs: Any) -> None:
+    """Invalidate cached querysets that read from the changed model's table."""
+    invalidate_tags(table_tag(sender._meta.db_table))
+
+
+def invalidate_through_table(
+    sender: type[models.Model],
+    action: str,
+    **kwargs: Any,
+) -> None:
+    """Invalidate cached querysets that read from a changed many-to-many table."""
+    if action.startswith("post_"):
+        invalidate_tags(table_tag(sender._meta.db_table))
+
+
+def connect_table_invalidation() -> None:
+    """
+    Connect the invalidation receivers to the models in CACHED_QUERYSET_MODELS.
+
+    Tables are opted in rather than out: every receiver costs each save and
+    delete a cache write and takes bulk deletes off Django's fast path, which
+    write-heavy internal tables (outbox, ledger, counter shards, feeds) should
+    not pay for rows that are never read through ``.cached()``. The automatic
+    many-to-many tables of an opted-in model are connected with it.
+    Receivers are connected per model rather than to every sender, so the
+    historical models used by migrations are left alone.
+    """
+    for label in getattr(settings, "CACHED_QUERYSET_MODELS", []):
+        model = apps.get_model(label)
+        through = [
+            field.remote_field.through
+            for field in model._meta.local_many_to_many
+            if field.remote_field.through._meta.auto_created
+        ]
+        for connected in [model, *through]:
+            uid = f"caching.table:{connected._meta.label_lower}"
+            post_save.connect(invalidate_table, sender=connected, dispatch_uid=uid)
+            post_delete.connect(invalidate_table, sender=connected, dispatch_uid=uid)
+            if connected._meta.auto_created:
+                m2m_changed.connect(
+                    invalidate_through_table,
+                    sender=connected,
+                    dispatch_uid=uid,
+                )
+            invalidated_tables.add(connected._meta.db_table)
@@ -0,0 +1,83 @@
+"""
+Per-process snapshots of small, rarely changing tables.
+
+A ``ModelSnapshot`` keeps every row of a model in memory so lookups by primary
+key or slug need no query. The snapshot is registered under a cache tag
+(``snapshot:<app_label>.<model>``) whose generation is compared on each
+access; calling ``invalidate()`` from the model's post_save/post_delete
+receivers bumps it, and every process reloads the table on its next lookup.
+"""
+
+import copy
+import logging
+import threading
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db import models
+
+from caching.tags import get_generations, invalidate_tags
+
+logger = logging.getLogger(__name__)
+
+
+class ModelSnapshot[M: models.Model]:
+    """
+    In-memory copy of a model's table, reloaded when its cache tag changes.
+
+    ``index_by`` lists the unique fields, besides the primary key, that rows
+    can be looked up by. ``all()`` returns the shared instances, which must be
+    treated as read-only; ``get()`` and ``get_by()`` return copies.
+    """
+
+    def __init__(self, model: type[M], index_by: tuple[str, ...] = ("slug",)) -> None:
+        self.model = model
+        self.index_by = index_by
+        self.tag = f"snapshot:{model._meta.label_lower}"
+
+        self._lock = threading.Lock()
+        self._generation: int | None = None
+        self._rows: tuple[M, ...] = ()
+        self._indexes: dict[str, dict[Any, M]] = {}
+
+    def _current(self) -> dict[str, dict[Any, M]]:
+        generation = get_generations([self.tag])[self.tag]
+        if generation == self._generation:
+            return self._indexes
+
+        with self._lock:
+            if generation != self._generation:
+                # The generation is read before the query, so a change made
+                # while loading leaves the snapshot stale and it reloads again.
+                rows = tuple(self.model._default_manager.all())
+                self._indexes = {
+                    field: {getattr(row, field): row for row in rows}
+                    for field in ("pk", *self.index_by)
+                }
+                self._rows = rows
+                self._generation = generation
+                logger.debug("Loaded %s %s rows", len(rows), self.model.__name__)
+            return self._indexes
+
+    def all(self) -> tuple[M, ...]:
+        """Return every row, in the model's default ordering."""
+        self._current()
+        return self._rows
+
+    def get(self, pk: Any) -> M | None:
+        return self.get_by("pk", pk)
+
+    def get_by(self, field: str, value: Any) -> M | None:
+        """Return a copy of the row whose ``field`` equals ``value``, if any."""
+        index = self._current()[field]
+        if field == "pk":
+            try:
+                value = self.model._meta.pk.to_python(value)  # type: ignore[union-attr]
+            except ValidationError:
+                return None
+        row = index.get(value)
+        return copy.copy(row) if row is not None else None
+
+    def invalidate(self) -> None:
+        """Make every process reload the snapshot on its next lookup."""
+        invalidate_tags(self.tag)
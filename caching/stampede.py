@@ -0,0 +1,168 @@
+"""
+Cache stampede protection.
+
+``get_or_compute`` stores values in an envelope that records when the value
+goes stale, how long it took to compute, and the generations of its cache
+tags. When an entry is stale, only the worker that wins a lock in the cache
+recomputes it; everyone else keeps serving the stale value in the meantime.
+Entries are also refreshed probabilistically shortly before they expire
+("XFetch"), with the chance growing as expiry approaches and with the cost of
+the recomputation, so hot keys are usually rebuilt before they ever go stale.
+"""
+
+import logging
+import math
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from caching.tags import fingerprint
+
+logger = logging.getLogger(__name__)
+
+# How long a stale value may still be served while it is being recomputed.
+STALE_GRACE = getattr(settings, "CACHE_STAMPEDE_GRACE", 300)
+# How long a recompute lock is held before another worker may take over.
+LOCK_TIMEOUT = getattr(settings, "CACHE_STAMPEDE_LOCK_TIMEOUT", 30)
+# How long a worker waits for another worker's first computation of a key.
+COLD_WAIT = getattr(settings, "CACHE_STAMPEDE_COLD_WAIT", 1.0)
+COLD_POLL_INTERVAL = 0.05
+
+_counters: Counter[str] = Counter()
+_counters_lock = threading.Lock()
+
+
+class _Envelope(NamedTuple):
+    value: Any
+    # Wall-clock time after which the value is stale, or None for never.
+    stale_at: float | None
+    # Seconds the last computation took, used to scale early refreshes.
+    delta: float
+    # Generations of the entry's cache tags when it was computed.
+    fingerprint: str
+
+
+def _count(path: str) -> None:
+    with _counters_lock:
+        _counters[path] += 1
+
+
+def stats() -> dict[str, int]:
+    """Return how often each path through ``get_or_compute`` was taken."""
+    with _counters_lock:
+        return dict(_counters)
+
+
+def reset_stats() -> None:
+    with _counters_lock:
+        _counters.clear()
+
+
+def _lock_key(key: str) -> str:
+    return f"{key}:lock"
+
+
+def _should_refresh_early(envelope: _Envelope, now: float, beta: float) -> bool:
+    if envelope.stale_at is None or envelope.delta <= 0:
+        return False
+    # -log(U) is exponentially distributed, so the refresh point lands a little
+    # earlier the longer the value takes to compute.
+    jitter = envelope.delta * beta * -math.log(1.0 - random.random())  # nosec B311
+    return now + jitter >= envelope.stale_at
+
+
+def _compute_and_store(
+    key: str,
+    compute: Callable[[], Any],
+    timeout: float | None,
+    digest: str,
+) -> tuple[Any, str]:
+    start = time.perf_counter()
+    value = compute()
+    delta = time.perf_counter() - start
+
+    stale_at = None if timeout is None else time.time() + timeout
+    hard_timeout = None if timeout is None else timeout + STALE_GRACE
+    cache.set(key, _Envelope(value, stale_at, delta, digest), hard_timeout)
+    return value, digest
+
+
+def get_or_compute(
+    key: str,
+    compute: Callable[[], Any],
+    timeout: float | None,
+    tags: Iterable[str] = (),
+    beta: float = 1.0,
+) -> Any:
+    """
+    Return the cached value for ``key``, recomputing it at most once at a time.
+
+    ``timeout`` is the number of seconds the value stays fresh (None for as
+    long as its tags are unchanged). Invalidating any of ``tags`` marks the
+    value stale rather than removing it, so it can still be served while one
+    worker recomputes it. ``beta`` above 1.0 favours earlier refreshes.
+    """
+    return get_or_compute_versioned(key, compute, timeout, tags, beta)[0]
+
+
+def get_or_compute_versioned(
+    key: str,
+    compute: Callable[[], Any],
+    timeout: float | None,
+    tags: Iterable[str] = (),
+    beta: float = 1.0,
+) -> tuple[Any, str]:
+    """
+    Like ``get_or_compute``, also returning the tag fingerprint of the value.
+
+    The fingerprint is that of the generations the value was computed under,
+    which differs from the current ``fingerprint(tags)`` while a stale value
+    is served; validators such as ETags must be derived from it.
+    """
+    digest = fingerprint(tags)
+    envelope = cache.get(key)
+    now = time.time()
+
+    if isinstance(envelope, _Envelope):
+        is_fresh = envelope.fingerprint == digest and (
+            envelope.stale_at is None or now < envelope.stale_at
+        )
+        if is_fresh and not _should_refresh_early(envelope, now, beta):
+            _count("hit")
+            return envelope.value, envelope.fingerprint
+
+        if not cache.add(_lock_key(key), 1, LOCK_TIMEOUT):
+            _count("stale_served" if not is_fresh else "hit")
+            return envelope.value, envelope.fingerprint
+
+        _count("stale_refresh" if not is_fresh else "early_refresh")
+        try:
+            return _compute_and_store(key, compute, timeout, digest)
+        finally:
+            cache.delete(_lock_key(key))
+
+    # Nothing cached at all: one worker computes, the others briefly wait.
+    if cache.add(_lock_key(key), 1, LOCK_TIMEOUT):
+        _count("miss")
+        try:
+            return _compute_and_store(key, compute, timeout, digest)
+        finally:
+            cache.delete(_lock_key(key))
+
+    deadline = time.monotonic() + COLD_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(COLD_POLL_INTERVAL)
+        envelope = cache.get(key)
+        if isinstance(envelope, _Envelope) and envelope.fingerprint == digest:
+            _count("waited")
+            return envelope.value, envelope.fingerprint
+
+    logger.warning("Timed out waiting for cache key %s, computing it anyway", key)
+    _count("wait_timeout")
+    return _compute_and_store(key, compute, timeout, digest)
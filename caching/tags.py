@@ -0,0 +1,175 @@
+"""
+Tag-based cache invalidation.
+
+Cached entries are registered under one or more dependency tags such as
+``movie:12`` or ``catalog``. Each tag has a generation number stored in the
+cache, and the generations of an entry's tags are folded into its key.
+Invalidating a tag bumps its generation, which is O(1) and never scans keys:
+entries built against the old generation simply stop being looked up and
+age out of the cache on their own.
+"""
+
+import hashlib
+import logging
+import time
+from collections.abc import Callable, Iterable, Mapping
+from functools import partial
+from typing import Any
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+
+from caching import bus
+from caching.backends import drop_local_keys
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY_PREFIX = "cache-tag"
+
+
+def movie_tag(pk: int) -> str:
+    return f"movie:{pk}"
+
+
+def director_tag(pk: int) -> str:
+    return f"director:{pk}"
+
+
+def series_tag(pk: int) -> str:
+    return f"series:{pk}"
+
+
+def user_tag(pk: int) -> str:
+    return f"user:{pk}"
+
+
+def table_tag(db_table: str) -> str:
+    return f"table:{db_table}"
+
+
+def generation_key(tag: str) -> str:
+    return f"{GENERATION_KEY_PREFIX}:{tag}"
+
+
+def _new_generation() -> int:
+    # Seeding from the clock means a generation lost to eviction (or a flushed
+    # cache) never comes back with a value an old entry was built against.
+    return time.time_ns()
+
+
+def get_generations(tags: Iterable[str]) -> dict[str, int]:
+    """Return the current generation of each tag, creating missing ones."""
+    keys = {tag: generation_key(tag) for tag in tags}
+    found = cache.get_many(keys.values())
+
+    generations: dict[str, int] = {}
+    missing: dict[str, int] = {}
+    for tag, key in keys.items():
+        if key in found:
+            generations[tag] = found[key]
+        else:
+            generations[tag] = missing[key] = _new_generation()
+
+    if missing:
+        cache.set_many(missing, timeout=None)
+    return generations
+
+
+def _digest(tags: Iterable[str], generations: Mapping[str, int]) -> str:
+    joined = ";".join(f"{tag}={generations[tag]}" for tag in sorted(set(tags)))
+    if not joined:
+        return ""
+    return hashlib.md5(joined.encode(), usedforsecurity=False).hexdigest()
+
+
+def fingerprint(tags: Iterable[str]) -> str:
+    """Return a digest of the current generations of ``tags``."""
+    generations = get_generations(tags)
+    return _digest(generations, generations)
+
+
+def tagged_key(key: str, tags: Iterable[str]) -> str:
+    """Return ``key`` qualified by the current generations of ``tags``."""
+    digest = fingerprint(tags)
+    return f"{key}.{digest}" if digest else key
+
+
+def get_or_set(
+    key: str,
+    default: Callable[[], Any],
+    tags: Iterable[str],
+    timeout: float | None = DEFAULT_TIMEOUT,
+) -> Any:
+    """
+    Return the cached value for ``key`` under ``tags``, computing it on a miss.
+    """
+    return cache.get_or_set(tagged_key(key, tags), default, timeout)
+
+
+def get_or_set_many(
+    entries: Mapping[str, Iterable[str]],
+    compute: Callable[[list[str]], Mapping[str, Any]],
+    timeout: float | None = DEFAULT_TIMEOUT,
+) -> dict[str, Any]:
+    """
+    Batch version of ``get_or_set``.
+
+    ``entries`` maps each key to its tags. The generations of all tags and
+    then all entries are read with one ``get_many`` each; ``compute`` is
+    called once with the keys that were missing and returns their values.
+    """
+    entries = {key: list(tags) for key, tags in entries.items()}
+    generations = get_generations({tag for tags in entries.values() for tag in tags})
+    qualified = {}
+    for key, tags in entries.items():
+        digest = _digest(tags, generations)
+        qualified[key] = f"{key}.{digest}" if digest else key
+
+    found = cache.get_many(qualified.values())
+    values = {
+        key: found[cache_key]
+        for key, cache_key in qualified.items()
+        if cache_key in found
+    }
+
+    missing = [key for key in entries if key not in values]
+    if missing:
+        computed = compute(missing)
+        cache.set_many(
+            {qualified[key]: value for key, value in computed.items()},
+            timeout,
+        )
+        values.update(computed)
+    return values
+
+
+def invalidate_tags(*tags: str) -> None:
+    """
+    Invalidate every entry registered under any of ``tags``.
+
+    Inside a transaction the generations are bumped once it commits, so
+    readers cannot cache uncommitted rows under the new generations and a
+    rollback invalidates nothing.
+    """
+    transaction.on_commit(partial(_bump_generations, tags))
+
+
+def _bump_generations(tags: tuple[str, ...]) -> None:
+    generations = {}
+    for tag in tags:
+        key = generation_key(tag)
+        try:
+            generations[tag] = cache.incr(key)
+        except ValueError:
+            # Nothing has been cached under this tag since it was last evicted.
+            generations[tag] = _new_generation()
+            cache.set(key, generations[tag], timeout=None)
+    # Let the other workers drop their local copies of the old generations.
+    bus.publish(generations)
+    logger.debug("Invalidated cache tags: %s", ", ".join(tags))
+
+
+def drop_local_generations(tags: list[str]) -> None:
+    """Forget this process's local copies of the generations of ``tags``."""
+    drop_local_keys([generation_key(tag) for tag in tags])
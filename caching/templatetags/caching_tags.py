@@ -0,0 +1,86 @@
+from typing import Any
+
+from django import template
+from django.core.cache.utils import make_template_fragment_key
+from django.template.base import FilterExpression, NodeList, Parser, Token
+from django.template.context import Context
+
+from caching.stampede import get_or_compute
+
+register = template.Library()
+
+
+class TaggedCacheNode(template.Node):
+    def __init__(
+        self,
+        nodelist: NodeList,
+        expire_time: FilterExpression,
+        fragment_name: str,
+        vary_on: list[FilterExpression],
+        tags: list[FilterExpression],
+    ) -> None:
+        self.nodelist = nodelist
+        self.expire_time = expire_time
+        self.fragment_name = fragment_name
+        self.vary_on = vary_on
+        self.tags = tags
+
+    def render(self, context: Context) -> str:
+        expire_time = self.expire_time.resolve(context)
+        try:
+            timeout = None if expire_time is None else int(expire_time)
+        except (TypeError, ValueError) as e:
+            raise template.TemplateSyntaxError(
+                f"'tagged_cache' tag got a non-integer timeout value: {expire_time!r}",
+            ) from e
+
+        vary_on = [var.resolve(context) for var in self.vary_on]
+        tags = [str(tag.resolve(context)) for tag in self.tags]
+        key = make_template_fragment_key(self.fragment_name, vary_on)
+
+        return str(
+            get_or_compute(key, lambda: self.nodelist.render(context), timeout, tags),
+        )
+
+
+@register.tag("tagged_cache")
+def do_tagged_cache(parser: Parser, token: Token) -> TaggedCacheNode:
+    """
+    Caches a template fragment under a set of invalidation tags.
+
+    Usage::
+
+        {% tagged_cache [expire_time] [fragment_name] [var1] .. depends_on [tag1] .. %}
+            .. some expensive processing ..
+        {% endtagged_cache %}
+
+    Works like Django's ``{% cache %}`` tag, but the fragment goes stale as soon
+    as any of its tags is passed to ``caching.tags.invalidate_tags``. Stale
+    fragments are re-rendered by one request at a time (see caching.stampede).
+    """
+    nodelist = parser.parse(("endtagged_cache",))
+    parser.delete_first_token()
+    bits = token.split_contents()
+    if "depends_on" not in bits:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires a 'depends_on' list of cache tags.",
+        )
+    split = bits.index("depends_on")
+    args, tag_bits = bits[1:split], bits[split + 1 :]
+    if len(args) < 2 or not tag_bits:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires a timeout, a fragment name and at least one tag.",
+        )
+    return TaggedCacheNode(
+        nodelist,
+        parser.compile_filter(args[0]),
+        args[1],
+        [parser.compile_filter(arg) for arg in args[2:]],
+        [parser.compile_filter(tag) for tag in tag_bits],
+    )
+
+
+@register.filter
+def cache_tag(kind: str, pk: Any) -> str:
+    """Builds a cache tag in a template, e.g. {{ "movie"|cache_tag:movie.pk }}."""
+    return f"{kind}:{pk}"
@@ -0,0 +1,115 @@
+from typing import cast
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from caching.backends import TieredCache
+
+TIERED_CACHES = {
+    "default": {
+        "BACKEND": "caching.backends.TieredCache",
+        "OPTIONS": {
+            "SHARED_ALIAS": "shared",
+            "LOCAL_MAX_ENTRIES": 2,
+            "LOCAL_TIMEOUT": 30,
+        },
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tiered-shared",
+    },
+}
+
+
+@override_settings(CACHES=TIERED_CACHES)
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.cache = cast(TieredCache, caches["default"])
+        self.shared = caches["shared"]
+        self.cache.clear()
+        self.cache.reset_stats()
+
+    def test_local_tier_serves_repeat_reads(self) -> None:
+        """Test that a value read once is served locally without the shared tier."""
+        self.shared.set("greeting", "hello")
+
+        self.assertEqual(self.cache.get("greeting"), "hello")
+        # Removing it from the shared tier does not affect the local copy.
+        self.shared.delete("greeting")
+        self.assertEqual(self.cache.get("greeting"), "hello")
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["local"]["hits"], 1)
+        self.assertEqual(stats["shared"]["hits"], 1)
+        self.assertEqual(stats["local"]["hit_ratio"], 0.5)
+
+    def test_writes_go_to_both_tiers(self) -> None:
+        """Test that set and delete reach the shared tier as well."""
+        self.cache.set("key", [1, 2, 3])
+        self.assertEqual(self.shared.get("key"), [1, 2, 3])
+
+        self.cache.delete("key")
+        self.assertIsNone(self.shared.get("key"))
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_local_values_are_copies(self) -> None:
+        """Test that mutating a returned value does not alter the local tier."""
+        self.cache.set("items", [1])
+        self.cache.get("items").append(2)
+        self.assertEqual(self.cache.get("items"), [1])
+
+    def test_lru_eviction_is_counted(self) -> None:
+        """Test that the least recently used entry is evicted past the size cap."""
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["local"]["evictions"], 1)
+        self.assertEqual(stats["local"]["entries"], 2)
+
+        # "b" was evicted locally but is still available from the shared tier.
+        self.assertEqual(self.cache.get("b"), 2)
+        self.assertEqual(self.cache.stats()["shared"]["hits"], 1)
+
+    def test_local_entries_expire_after_local_timeout(self) -> None:
+        """Test that local entries are re-read from the shared tier after the cap."""
+        with mock.patch("caching.backends.time.monotonic", return_value=100.0):
+            self.cache.set("key", "old")
+        self.shared.set("key", "new")
+
+        with mock.patch("caching.backends.time.monotonic", return_value=131.0):
+            self.assertEqual(self.cache.get("key"), "new")
+
+        self.assertEqual(self.cache.stats()["local"]["expirations"], 1)
+
+    def test_version_bump_bypasses_local_copy(self) -> None:
+        """Test that a new key version is not answered by a stale local entry."""
+        self.cache.set("key", "v1")
+        self.shared.set("key", "v2", version=2)
+
+        self.assertEqual(self.cache.get("key", version=2), "v2")
+
+    def test_get_many_fetches_misses_in_one_call(self) -> None:
+        """Test that get_many combines local hits with one shared lookup."""
+        self.cache.set("local", 1)
+        self.shared.set_many({"remote": 2, "other": 3})
+
+        with mock.patch.object(
+            self.shared,
+            "get_many",
+            wraps=self.shared.get_many,
+        ) as shared_get_many:
+            result = self.cache.get_many(["local", "remote", "other", "absent"])
+
+        self.assertEqual(result, {"local": 1, "remote": 2, "other": 3})
+        shared_get_many.assert_called_once()
+
+    def test_incr_updates_local_copy(self) -> None:
+        """Test that incr keeps the local tier in step with the shared value."""
+        self.cache.set("counter", 1)
+        self.assertEqual(self.cache.incr("counter", 5), 6)
+        self.shared.delete("counter")
+        self.assertEqual(self.cache.get("counter"), 6)
@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from caching import bus
+from caching.tags import generation_key, get_generations
+from caching.tests.test_backends import TIERED_CACHES
+
+
+@override_settings(CACHES=TIERED_CACHES)
+class InvalidationBusTests(TestCase):
+    def setUp(self) -> None:
+        caches["default"].clear()
+        bus.reset()
+        # The first poll only records where this process starts reading.
+        bus.poll(force=True)
+
+    def test_poll_reports_published_tags_once(self) -> None:
+        """Test that each published change is reported by one poll."""
+        bus.publish({"movie:1": 2, "catalog": 7})
+
+        self.assertEqual(sorted(bus.poll(force=True)), ["catalog", "movie:1"])
+        self.assertEqual(bus.poll(force=True), [])
+
+        bus.publish({"movie:1": 3})
+        self.assertEqual(bus.poll(force=True), ["movie:1"])
+
+    def test_poll_is_throttled(self) -> None:
+        """Test that polls within the interval do not query the database."""
+        bus.poll()
+        bus.publish({"movie:1": 2})
+        with self.assertNumQueries(0):
+            self.assertEqual(bus.poll(), [])
+
+    def test_remote_invalidation_drops_local_generation(self) -> None:
+        """Test that a tag changed by another worker is re-read after a poll."""
+        old = get_generations(["movie:1"])["movie:1"]
+
+        # Another worker bumps the generation in the shared tier.
+        caches["shared"].set(generation_key("movie:1"), old + 1, None)
+        bus.publish({"movie:1": old + 1})
+        self.assertEqual(get_generations(["movie:1"])["movie:1"], old)
+
+        bus.poll(force=True)
+        self.assertEqual(get_generations(["movie:1"])["movie:1"], old + 1)
+
+    def test_middleware_polls(self) -> None:
+        """Test that every request gives the bus a chance to poll."""
+        with mock.patch("caching.bus.poll") as poll:
+            self.client.get("/")
+        poll.assert_called_once_with()
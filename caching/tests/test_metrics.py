@@ -0,0 +1,130 @@
+import pickle
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from caching import metrics
+from config.tests.factories import UserFactory
+
+INSTRUMENTED_CACHES = {
+    "default": {
+        "BACKEND": "caching.backends.TieredCache",
+        "OPTIONS": {"SHARED_ALIAS": "shared", "METRICS_NAME": "default"},
+    },
+    "shared": {
+        "BACKEND": "caching.backends.DatabaseCache",
+        "LOCATION": "my_cache_table",
+        "OPTIONS": {"METRICS_NAME": "shared"},
+    },
+}
+
+
+@override_settings(CACHES=INSTRUMENTED_CACHES)
+class CacheMetricsTests(TestCase):
+    def setUp(self) -> None:
+        caches["default"].clear()
+        metrics.reset()
+
+    def test_key_prefix(self) -> None:
+        """Test that keys are grouped by fragment name or leading segment."""
+        self.assertEqual(metrics.key_prefix("template.cache.heatmap.abc"), "heatmap")
+        self.assertEqual(
+            metrics.key_prefix("taxonomy-chart:director:3"),
+            "taxonomy-chart",
+        )
+        self.assertEqual(metrics.key_prefix("plain"), "plain")
+
+    def test_records_hits_misses_and_bytes_per_tier(self) -> None:
+        """Test that both tiers report their own hits, misses and writes."""
+        cache = caches["default"]
+        cache.get("heatmap:1")
+        cache.set("heatmap:1", "x" * 10)
+        caches["default"].clear_local()  # type: ignore[attr-defined]
+        cache.get("heatmap:1")
+
+        counters = metrics.snapshot()
+        default = counters[("default", "heatmap")]
+        self.assertEqual((default.hits, default.misses, default.sets), (1, 1, 1))
+        self.assertEqual(default.bytes_written, 10)
+        shared = counters[("shared", "heatmap")]
+        self.assertEqual((shared.hits, shared.misses), (1, 1))
+
+    def test_sizes_reuse_the_local_pickle(self) -> None:
+        """Test that values are measured without being pickled a second time."""
+        cache = caches["default"]
+        value = {"plot_data": list(range(100))}
+        with mock.patch(
+            "caching.metrics.value_size",
+            wraps=metrics.value_size,
+        ) as value_size:
+            cache.set("chart:1", value)
+            cache.get("chart:1")
+
+        value_size.assert_not_called()
+        size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        counters = metrics.snapshot()
+        default = counters[("default", "chart")]
+        self.assertEqual((default.bytes_written, default.bytes_read), (size, size))
+        self.assertEqual(counters[("shared", "chart")].bytes_written, size)
+
+    def test_get_many_counts_each_key(self) -> None:
+        """Test that a batch read records a hit or miss for every key."""
+        cache = caches["default"]
+        cache.set("chart:1", 1)
+        cache.get_many(["chart:1", "chart:2"])
+
+        counters = metrics.snapshot()[("default", "chart")]
+        self.assertEqual((counters.hits, counters.misses), (1, 1))
+
+
+@override_settings(CACHES=INSTRUMENTED_CACHES, CACHE_METRICS_TOKEN="s3cret")
+class CacheStatsViewTests(TestCase):
+    def setUp(self) -> None:
+        metrics.reset()
+        self.user, self.password = UserFactory.create()
+        caches["default"].get("heatmap:1")
+
+    def test_stats_page_requires_staff(self) -> None:
+        """Test that only staff can see the cache statistics page."""
+        self.client.login(username=self.user.username, password=self.password)
+        response = self.client.get(reverse("caching:stats"))
+        self.assertEqual(response.status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse("caching:stats"))
+        self.assertContains(response, "heatmap")
+        self.assertContains(response, "Tiers of")
+
+    def test_metrics_endpoint_accepts_bearer_token(self) -> None:
+        """Test that the metrics endpoint is readable with the configured token."""
+        response = self.client.get(reverse("caching:metrics"))
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.get(
+            reverse("caching:metrics"),
+            headers={"Authorization": "Bearer s3cret"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'cache_misses_total{cache="default",prefix="heatmap"} 1',
+            response.content.decode(),
+        )
+
+
+@override_settings(CACHES=INSTRUMENTED_CACHES)
+class CacheMetricsMiddlewareTests(TestCase):
+    @override_settings(
+        MIDDLEWARE=[
+            "caching.middleware.CacheMetricsMiddleware",
+            "django.contrib.sessions.middleware.SessionMiddleware",
+            "django.contrib.auth.middleware.AuthenticationMiddleware",
+            "django.contrib.messages.middleware.MessageMiddleware",
+        ],
+    )
+    def test_server_timing_header(self) -> None:
+        """Test that a request's cache traffic is reported in Server-Timing."""
+        response = self.client.get(reverse("home"))
+        self.assertTrue(response["Server-Timing"].startswith("cache;dur="))
@@ -0,0 +1,75 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from caching.querysets import query_tables
+from config.tests.factories import (
+    CollectionFactory,
+    DirectorFactory,
+    MovieFactory,
+    ReviewFactory,
+    UserFactory,
+)
+from movies.models import Collection, Director, FeedEntry, Tag
+
+
+class CachedQuerySetTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.director = DirectorFactory.create(name="Agatha", slug="agatha")
+
+    def test_results_are_served_from_cache(self) -> None:
+        """Test that a repeated cached query does not hit the database."""
+        self.assertEqual(list(Director.objects.cached(60)), [self.director])
+        with self.assertNumQueries(0):
+            self.assertEqual(list(Director.objects.cached(60)), [self.director])
+
+    def test_save_invalidates_cached_results(self) -> None:
+        """Test that saving a model invalidates cached queries on its table."""
+        list(Director.objects.cached(60))
+        with self.captureOnCommitCallbacks(execute=True):
+            other = DirectorFactory.create(name="Dorothy", slug="dorothy")
+
+        self.assertEqual(list(Director.objects.cached(60)), [self.director, other])
+
+    def test_joined_table_invalidates_cached_results(self) -> None:
+        """Test that a change to a joined table invalidates the cached query."""
+        user, _ = UserFactory.create()
+        CollectionFactory.create(user=user)
+        queryset = Collection.objects.select_related("user").filter(is_public=True)
+        list(queryset.cached(60))
+
+        user.username = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+
+        collection = list(queryset.cached(60))[0]
+        self.assertEqual(collection.user.username, "renamed")
+
+    def test_values_and_instances_are_cached_separately(self) -> None:
+        """Test that values() over the same query is not served model instances."""
+        list(Director.objects.cached(60))
+        names = list(Director.objects.cached(60).values_list("name", flat=True))
+        self.assertEqual(names, ["Agatha"])
+
+    def test_query_tables(self) -> None:
+        """Test that every table mentioned in the SQL is found."""
+        sql = str(Collection.objects.select_related("user").query)
+        self.assertEqual(
+            query_tables(sql, "default"),
+            ["movies_collection", "users_customuser"],
+        )
+
+    def test_unlisted_tables_are_not_invalidated(self) -> None:
+        """Test that only CACHED_QUERYSET_MODELS writes touch the cache."""
+        user, _ = UserFactory.create()
+        review = ReviewFactory.create(user=user, movie=MovieFactory.create())
+        FeedEntry.objects.create(
+            owner=user,
+            review=review,
+            created_at=review.created_at,
+        )
+        # Without receivers the delete takes Django's single-query fast path.
+        with self.assertNumQueries(1):
+            FeedEntry.objects.filter(owner=user).delete()
+        with self.assertLogs("caching.querysets", "WARNING"):
+            list(Tag.objects.cached(60))
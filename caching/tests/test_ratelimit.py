@@ -0,0 +1,110 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpRequest
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from caching import ratelimit
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "ratelimit-tests",
+        },
+    },
+    RATE_LIMITS={"test": {"user": "2/m", "ip": "3/m"}},
+    RATE_LIMIT_PROXY_COUNT=0,
+)
+class TokenBucketTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        clock = mock.patch("caching.ratelimit.time.time", return_value=1000.0)
+        self.clock = clock.start()
+        self.addCleanup(clock.stop)
+
+    def request(self, user_pk: int | None = None, ip: str = "10.0.0.1") -> HttpRequest:
+        request = RequestFactory().post("/", REMOTE_ADDR=ip)
+        request.user = (
+            mock.Mock(is_authenticated=True, pk=user_pk) if user_pk else AnonymousUser()
+        )
+        return request
+
+    def test_parse_rate(self) -> None:
+        """Test that rates accept a unit with an optional multiplier."""
+        self.assertEqual(ratelimit.parse_rate("30/m"), ratelimit.Rate(30, 60.0))
+        self.assertEqual(ratelimit.parse_rate("5/10s"), ratelimit.Rate(5, 10.0))
+        for rate in ["30", "0/m", "3/w", "a/m"]:
+            with self.subTest(rate=rate), self.assertRaises(ImproperlyConfigured):
+                ratelimit.parse_rate(rate)
+
+    def test_bucket_empties_and_refills(self) -> None:
+        """Test that a bucket refuses once empty and refills over time."""
+        rate = ratelimit.parse_rate("2/m")
+        self.assertEqual(ratelimit.take("bucket", rate), 0)
+        self.assertEqual(ratelimit.take("bucket", rate), 0)
+        self.assertAlmostEqual(ratelimit.take("bucket", rate), 30.0)
+
+        self.clock.return_value += 30
+        self.assertEqual(ratelimit.take("bucket", rate), 0)
+        self.assertAlmostEqual(ratelimit.take("bucket", rate), 30.0)
+
+    def test_user_and_ip_buckets(self) -> None:
+        """Test that users are limited on their own, and IPs across users."""
+        self.assertEqual(ratelimit.check(self.request(user_pk=1), "test"), 0)
+        self.assertEqual(ratelimit.check(self.request(user_pk=1), "test"), 0)
+        self.assertGreater(ratelimit.check(self.request(user_pk=1), "test"), 0)
+
+        # A second user from the same address drains the IP bucket.
+        self.assertEqual(ratelimit.check(self.request(user_pk=2), "test"), 0)
+        self.assertGreater(ratelimit.check(self.request(user_pk=2), "test"), 0)
+        self.assertEqual(ratelimit.check(self.request(ip="10.0.0.2"), "test"), 0)
+
+    def test_scopes_are_independent(self) -> None:
+        """Test that each scope has its own buckets and unknown ones use defaults."""
+        for _ in range(2):
+            ratelimit.check(self.request(user_pk=1), "test")
+
+        self.assertGreater(ratelimit.check(self.request(user_pk=1), "test"), 0)
+        self.assertEqual(ratelimit.check(self.request(user_pk=1), "other"), 0)
+
+    @override_settings(RATE_LIMIT_PROXY_COUNT=1)
+    def test_client_ip_behind_proxy(self) -> None:
+        """Test that only the entry added by the trusted proxy is used."""
+        request = RequestFactory().get(
+            "/",
+            REMOTE_ADDR="10.0.0.254",
+            HTTP_X_FORWARDED_FOR="1.2.3.4, 5.6.7.8",
+        )
+        self.assertEqual(ratelimit.client_ip(request), "5.6.7.8")
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "caching.backends.TieredCache",
+            "OPTIONS": {"SHARED_ALIAS": "shared"},
+        },
+        "shared": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "ratelimit-shared-tests",
+        },
+    },
+)
+class TieredBucketTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_buckets_skip_the_local_tier(self) -> None:
+        """Test that a bucket drained by another worker is seen at once."""
+        rate = ratelimit.parse_rate("2/m")
+        self.assertEqual(ratelimit.take("bucket", rate), 0)
+
+        # Another worker takes the last token through the shared cache.
+        caches["shared"].set("bucket", (0.0, time.time()))
+
+        self.assertGreater(ratelimit.take("bucket", rate), 0)
@@ -0,0 +1,38 @@
+from django.test import TestCase
+
+from caching.snapshots import ModelSnapshot
+from config.tests.factories import TagFactory
+from movies.models import Tag
+
+
+class ModelSnapshotTests(TestCase):
+    def setUp(self) -> None:
+        self.snapshot = ModelSnapshot(Tag)
+        self.tag = TagFactory.create(name="Locked Room", slug="locked-room")
+
+    def test_lookups_are_served_from_memory(self) -> None:
+        """Test that rows are loaded once and then looked up without queries."""
+        self.snapshot.all()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.snapshot.get(self.tag.pk), self.tag)
+            self.assertEqual(self.snapshot.get(str(self.tag.pk)), self.tag)
+            self.assertEqual(self.snapshot.get_by("slug", "locked-room"), self.tag)
+            self.assertIsNone(self.snapshot.get("not-a-pk"))
+
+    def test_invalidate_reloads_rows(self) -> None:
+        """Test that invalidating the snapshot picks up changed rows."""
+        self.snapshot.all()
+        Tag.objects.filter(pk=self.tag.pk).update(name="Impossible Crime")
+        # The queryset update bypassed the signals, so the old name is served.
+        self.assertEqual(self.snapshot.get(self.tag.pk).name, "Locked Room")  # type: ignore[union-attr]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.snapshot.invalidate()
+        self.assertEqual(self.snapshot.get(self.tag.pk).name, "Impossible Crime")  # type: ignore[union-attr]
+
+    def test_get_returns_a_copy(self) -> None:
+        """Test that changing a looked-up row does not change the snapshot."""
+        tag = self.snapshot.get(self.tag.pk)
+        assert tag is not None
+        tag.name = "Changed"
+        self.assertEqual(self.snapshot.all()[0].name, "Locked Room")
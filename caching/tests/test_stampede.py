@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from caching import stampede
+from caching.tags import invalidate_tags
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "stampede-tests",
+        },
+    },
+)
+class GetOrComputeTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        stampede.reset_stats()
+        self.calls = 0
+
+    def compute(self) -> int:
+        """Count how many times the value had to be computed."""
+        self.calls += 1
+        return self.calls
+
+    def test_miss_then_hit(self) -> None:
+        """Test that a value is computed once and then served from the cache."""
+        self.assertEqual(stampede.get_or_compute("key", self.compute, 60), 1)
+        self.assertEqual(stampede.get_or_compute("key", self.compute, 60), 1)
+        self.assertEqual(stampede.stats(), {"miss": 1, "hit": 1})
+
+    def test_stale_value_served_while_locked(self) -> None:
+        """Test that other workers serve the stale value while one recomputes."""
+        stampede.get_or_compute("key", self.compute, 60, tags=["movie:1"])
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tags("movie:1")
+
+        # Another worker holds the recompute lock.
+        cache.add("key:lock", 1)
+        value = stampede.get_or_compute("key", self.compute, 60, tags=["movie:1"])
+
+        self.assertEqual(value, 1)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(stampede.stats()["stale_served"], 1)
+
+    def test_stale_value_recomputed_by_lock_winner(self) -> None:
+        """Test that the worker that wins the lock recomputes a stale value."""
+        stampede.get_or_compute("key", self.compute, 60, tags=["movie:1"])
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tags("movie:1")
+
+        value = stampede.get_or_compute("key", self.compute, 60, tags=["movie:1"])
+
+        self.assertEqual(value, 2)
+        self.assertEqual(stampede.stats()["stale_refresh"], 1)
+        self.assertIsNone(cache.get("key:lock"))
+
+    def test_expired_value_is_stale(self) -> None:
+        """Test that a value past its timeout is recomputed."""
+        with mock.patch("caching.stampede.time.time", return_value=1000.0):
+            stampede.get_or_compute("key", self.compute, 60)
+        with mock.patch("caching.stampede.time.time", return_value=1061.0):
+            value = stampede.get_or_compute("key", self.compute, 60)
+
+        self.assertEqual(value, 2)
+        self.assertEqual(stampede.stats()["stale_refresh"], 1)
+
+    def test_early_refresh_before_expiry(self) -> None:
+        """Test that a fresh value can be refreshed early near its expiry."""
+        # The first computation takes 30 seconds of a 60 second lifetime.
+        with mock.patch("caching.stampede.time.perf_counter", side_effect=[0.0, 30.0]):
+            stampede.get_or_compute("key", self.compute, 60)
+
+        # A high random draw moves the refresh point past the expiry, while a
+        # low draw keeps serving the cached value.
+        with mock.patch("caching.stampede.random.random", return_value=0.1):
+            self.assertEqual(stampede.get_or_compute("key", self.compute, 60), 1)
+        with mock.patch("caching.stampede.random.random", return_value=0.99):
+            value = stampede.get_or_compute("key", self.compute, 60)
+
+        self.assertEqual(value, 2)
+        self.assertEqual(stampede.stats()["early_refresh"], 1)
+
+    def test_cold_miss_waits_for_lock_holder(self) -> None:
+        """Test that a cold miss computes anyway once the wait times out."""
+        cache.add("key:lock", 1)
+
+        with mock.patch.object(stampede, "COLD_WAIT", 0):
+            value = stampede.get_or_compute("key", self.compute, 60)
+
+        self.assertEqual(value, 1)
+        self.assertEqual(stampede.stats()["wait_timeout"], 1)
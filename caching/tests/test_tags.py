@@ -0,0 +1,109 @@
+from contextlib import suppress
+
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.template import Context, Template, TemplateSyntaxError
+from django.test import TestCase, override_settings
+
+from caching.tags import get_or_set, invalidate_tags, tagged_key
+
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tags-tests",
+    },
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CacheTagTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_tagged_key_is_stable_until_invalidated(self) -> None:
+        """Test that the key only changes when one of its tags is invalidated."""
+        key = tagged_key("fragment", ["movie:1", "catalog"])
+        self.assertEqual(key, tagged_key("fragment", ["catalog", "movie:1"]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tags("movie:2")
+        self.assertEqual(key, tagged_key("fragment", ["movie:1", "catalog"]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tags("catalog")
+        self.assertNotEqual(key, tagged_key("fragment", ["movie:1", "catalog"]))
+
+    def test_invalidating_unknown_tag_does_not_fail(self) -> None:
+        """Test that a tag evicted from the cache can still be invalidated."""
+        key = tagged_key("fragment", ["movie:1"])
+        cache.clear()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tags("movie:1")
+
+        self.assertNotEqual(key, tagged_key("fragment", ["movie:1"]))
+
+    def test_get_or_set_recomputes_after_invalidation(self) -> None:
+        """Test that get_or_set only calls the producer on a miss."""
+        calls: list[int] = []
+
+        def compute() -> int:
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(get_or_set("value", compute, ["user:3"]), 1)
+        self.assertEqual(get_or_set("value", compute, ["user:3"]), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tags("user:3")
+        self.assertEqual(get_or_set("value", compute, ["user:3"]), 2)
+
+    def test_invalidation_waits_for_commit(self) -> None:
+        """Test that tags are only invalidated once the transaction commits."""
+        key = tagged_key("fragment", ["movie:1"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tags("movie:1")
+            self.assertEqual(key, tagged_key("fragment", ["movie:1"]))
+        self.assertNotEqual(key, tagged_key("fragment", ["movie:1"]))
+
+        key = tagged_key("fragment", ["movie:1"])
+        with (
+            self.captureOnCommitCallbacks() as callbacks,
+            suppress(DatabaseError),
+            transaction.atomic(),
+        ):
+            invalidate_tags("movie:1")
+            raise DatabaseError
+        self.assertEqual(callbacks, [])
+        self.assertEqual(key, tagged_key("fragment", ["movie:1"]))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TaggedCacheTemplateTagTests(TestCase):
+    template = Template(
+        "{% load caching_tags %}"
+        '{% tagged_cache 60 greeting pk depends_on "movie"|cache_tag:pk %}'
+        "{{ name }}"
+        "{% endtagged_cache %}",
+    )
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_fragment_cached_until_tag_invalidated(self) -> None:
+        """Test that the fragment is reused until its tag is invalidated."""
+        self.assertEqual(self.template.render(Context({"pk": 1, "name": "a"})), "a")
+        self.assertEqual(self.template.render(Context({"pk": 1, "name": "b"})), "a")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_tags("movie:1")
+
+        self.assertEqual(self.template.render(Context({"pk": 1, "name": "b"})), "b")
+
+    def test_requires_depends_on(self) -> None:
+        """Test that the tag refuses to cache without dependency tags."""
+        with self.assertRaises(TemplateSyntaxError):
+            Template(
+                "{% load caching_tags %}"
+                "{% tagged_cache 60 greeting %}x{% endtagged_cache %}",
+            )
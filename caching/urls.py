@@ -0,0 +1,10 @@
+from django.urls import path
+
+from caching.views import CacheMetricsView, CacheStatsView
+
+app_name = "caching"
+
+urlpatterns = [
+    path("stats/", CacheStatsView.as_view(), name="stats"),
+    path("metrics/", CacheMetricsView.as_view(), name="metrics"),
+]
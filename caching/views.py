@@ -0,0 +1,141 @@
+import hmac
+import logging
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.core.cache import caches
+from django.http import HttpRequest, HttpResponse
+from django.views.generic import TemplateView, View
+
+from caching import metrics, stampede
+
+logger = logging.getLogger(__name__)
+
+
+def tier_stats() -> dict[str, dict[str, dict[str, Any]]]:
+    """Return the tier statistics of every configured cache that keeps them."""
+    result = {}
+    for alias in settings.CACHES:
+        backend = caches[alias]
+        stats = getattr(backend, "stats", None)
+        if callable(stats):
+            result[alias] = stats()
+    return result
+
+
+class StaffRequiredMixin(UserPassesTestMixin):
+    request: HttpRequest
+
+    def test_func(self) -> bool:
+        return bool(self.request.user.is_staff)
+
+
+class CacheStatsView(StaffRequiredMixin, TemplateView):
+    template_name = "caching/stats.html"
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context["groups"] = [
+            {"cache": cache_name, "prefix": prefix, **counters.as_dict()}
+            for (cache_name, prefix), counters in metrics.snapshot().items()
+        ]
+        context["tiers"] = tier_stats()
+        context["stampede"] = sorted(stampede.stats().items())
+        return context
+
+
+class CacheMetricsView(View):
+    """
+    Cache statistics in the Prometheus text exposition format.
+
+    Readable by staff, or by a scraper sending
+    ``Authorization: Bearer <CACHE_METRICS_TOKEN>``.
+    """
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        if not self._is_authorized(request):
+            return HttpResponse("Forbidden", status=403, content_type="text/plain")
+        return HttpResponse(
+            "\n".join(self._lines()) + "\n",
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    @staticmethod
+    def _is_authorized(request: HttpRequest) -> bool:
+        if request.user.is_staff:
+            return True
+        token = settings.CACHE_METRICS_TOKEN
+        header = request.headers.get("Authorization", "")
+        return bool(token) and hmac.compare_digest(header, f"Bearer {token}")
+
+    @staticmethod
+    def _lines() -> list[str]:
+        snapshot = metrics.snapshot()
+        series = [
+            (
+                "cache_hits_total",
+                "counter",
+                "Cache lookups that found a value.",
+                "hits",
+            ),
+            (
+                "cache_misses_total",
+                "counter",
+                "Cache lookups that found nothing.",
+                "misses",
+            ),
+            ("cache_sets_total", "counter", "Values written to the cache.", "sets"),
+            (
+                "cache_deletes_total",
+                "counter",
+                "Keys deleted from the cache.",
+                "deletes",
+            ),
+            (
+                "cache_read_bytes_total",
+                "counter",
+                "Bytes read from the cache.",
+                "bytes_read",
+            ),
+            (
+                "cache_written_bytes_total",
+                "counter",
+                "Bytes written to the cache.",
+                "bytes_written",
+            ),
+            ("cache_calls_total", "counter", "Cache operations performed.", "calls"),
+            (
+                "cache_seconds_total",
+                "counter",
+                "Time spent in cache operations.",
+                "seconds",
+            ),
+        ]
+
+        lines = []
+        for name, kind, help_text, field in series:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (cache_name, prefix), counters in snapshot.items():
+                labels = f'cache="{cache_name}",prefix="{_escape(prefix)}"'
+                lines.append(f"{name}{{{labels}}} {getattr(counters, field)}")
+
+        lines.append(
+            "# HELP cache_tier_hit_ratio Hit ratio of each tier of a tiered cache.",
+        )
+        lines.append("# TYPE cache_tier_hit_ratio gauge")
+        for alias, tiers in tier_stats().items():
+            for tier, counts in tiers.items():
+                labels = f'cache="{alias}",tier="{tier}"'
+                lines.append(f"cache_tier_hit_ratio{{{labels}}} {counts['hit_ratio']}")
+
+        lines.append("# HELP cache_stampede_total Paths taken through get_or_compute.")
+        lines.append("# TYPE cache_stampede_total counter")
+        for path, count in sorted(stampede.stats().items()):
+            lines.append(f'cache_stampede_total{{path="{path}"}} {count}')
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
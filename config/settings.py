@@ -47,12 +47,14 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "crispy_forms",
     "crispy_bootstrap5",
+    "caching",
     "movies",
     "users",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "caching.middleware.CacheInvalidationMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -67,6 +69,9 @@ if not DEBUG:
         MIDDLEWARE.index("django.middleware.security.SecurityMiddleware"),
         "whitenoise.middleware.WhiteNoiseMiddleware",
     )
+else:
+    # Logs cache usage per request and reports it in a Server-Timing header.
+    MIDDLEWARE.insert(0, "caching.middleware.CacheMetricsMiddleware")
 
 ROOT_URLCONF = "config.urls"
 
@@ -205,6 +210,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "caching": {
+            "handlers": ["file"],
+            "level": "INFO",
+            "propagate": False,
+        },
         "config": {
             "handlers": ["file"],
             "level": "INFO",
@@ -230,9 +240,86 @@ CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
 # Caching
+# The default cache keeps a small per-process LRU in front of the shared
+# database cache, so hot fragments skip the SQL round trip to my_cache_table.
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "BACKEND": "caching.backends.TieredCache",
+        "OPTIONS": {
+            "SHARED_ALIAS": "shared",
+            "LOCAL_MAX_ENTRIES": int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", 1000)),
+            "LOCAL_TIMEOUT": int(os.getenv("CACHE_LOCAL_TIMEOUT", 30)),
+            "METRICS_NAME": "default",
+        },
+    },
+    "shared": {
+        "BACKEND": "caching.backends.DatabaseCache",
         "LOCATION": "my_cache_table",  # The name of the table in the database
+        "OPTIONS": {"METRICS_NAME": "shared"},
     },
 }
+
+# Models whose tables are read by cached querysets (`.cached()`, see
+# caching.querysets), including joined tables. Only these get the save/delete
+# receivers that invalidate the table tags; other tables are written without
+# touching the cache.
+CACHED_QUERYSET_MODELS = [
+    "movies.collection",
+    "movies.director",
+    "movies.directorstats",
+    "movies.series",
+    "movies.seriesstats",
+    "movies.tagvote",
+    "users.customuser",
+]
+
+# How often each worker checks for cache tags invalidated by other workers.
+CACHE_BUS_POLL_INTERVAL = float(os.getenv("CACHE_BUS_POLL_INTERVAL", 1.0))
+
+# Bearer token that lets a scraper read /cache/metrics/ without a staff login.
+CACHE_METRICS_TOKEN = os.getenv("CACHE_METRICS_TOKEN", "")
+
+# "inline" runs the side effects of model signals (stats, logging) within the
+# request; "outbox" queues them for `manage.py run_worker` (see movies.outbox).
+SIDE_EFFECTS_MODE = os.getenv("SIDE_EFFECTS_MODE", "inline")
+
+# "direct" recomputes review aggregates and helpful counts on the title and
+# review rows; "sharded" spreads the changes over COUNTER_SHARDS rows per
+# counter, folded back by `manage.py fold_counters` (see movies.counters).
+COUNTER_MODE = os.getenv("COUNTER_MODE", "direct")
+COUNTER_SHARDS = int(os.getenv("COUNTER_SHARDS", 8))
+
+# "direct" writes tag and helpful votes as they are cast; "ledger" appends
+# them to a vote ledger folded in by `manage.py compact_votes` (see
+# movies.ledger).
+VOTE_MODE = os.getenv("VOTE_MODE", "direct")
+
+# Activity feeds (see movies.feed) keep the newest FEED_LENGTH reviews per
+# user. Reviews by users with FEED_FANOUT_MAX_FOLLOWERS or more followers are
+# read when a feed is shown instead of being copied into every feed.
+FEED_LENGTH = int(os.getenv("FEED_LENGTH", 200))
+FEED_FANOUT_MAX_FOLLOWERS = int(os.getenv("FEED_FANOUT_MAX_FOLLOWERS", 1000))
+
+# Number of neighbours stored per title by the offline recommendation jobs
+# (`manage.py build_similar_titles`, which needs the "ml" dependency group).
+SIMILAR_TITLES = int(os.getenv("SIMILAR_TITLES", 10))
+
+# Rating factors written by `manage.py train_factors` ("ml" dependency group)
+# and memory-mapped by every worker for the predicted ratings.
+FACTORS_PATH = Path(os.getenv("FACTORS_PATH", BASE_DIR / "data" / "factors.bin"))
+
+# Token buckets for write endpoints (see caching.ratelimit), per signed-in
+# user and per client IP, as "<requests>/<period>"; None disables a bucket.
+# Scopes missing here get caching.ratelimit.DEFAULT_LIMITS.
+RATE_LIMITS = {
+    "review_helpful_vote": {"user": "30/m", "ip": "120/m"},
+    "tag_vote": {"user": "30/m", "ip": "120/m"},
+    "bulk_tag_vote": {"user": "10/m", "ip": "60/m"},
+    "watchlist_toggle": {"user": "30/m", "ip": "120/m"},
+    "collection_add_item": {"user": "30/m", "ip": "120/m"},
+    "follow_toggle": {"user": "30/m", "ip": "120/m"},
+}
+
+# Number of reverse proxies in front of the site whose X-Forwarded-For entries
+# are trusted when rate limiting by client IP (0 uses REMOTE_ADDR).
+RATE_LIMIT_PROXY_COUNT = int(os.getenv("RATE_LIMIT_PROXY_COUNT", 0))
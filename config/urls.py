@@ -14,6 +14,7 @@ urlpatterns = [
     path("users/", include("users.urls")),
     path(settings.ADMIN_URL or "admin/", admin.site.urls),
     path("movies/", include("movies.urls")),
+    path("cache/", include("caching.urls")),
     path("", MysteryListView.as_view(), name="home"),
 ]
 
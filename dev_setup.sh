@@ -52,6 +52,10 @@ fi
 echo -e "${CYAN}Running database migrations...${NC}"
 uv run python manage.py migrate
 
+# 4b. Set up cache table (saving any model invalidates cached querysets in it)
+echo -e "${CYAN}Creating cache table...${NC}"
+uv run python manage.py createcachetable
+
 # 5a. Create Superuser (Idempotent)
 echo -e "${CYAN}Checking for superuser...${NC}"
 uv run python manage.py shell -c "
@@ -76,14 +80,14 @@ else:
     print('\033[0;32mDev user already exists. Skipping creation.\033[0m');
 "
 
-# 6. Set up cache table
-echo -e "${CYAN}Creating cache table...${NC}"
-uv run python manage.py createcachetable
-
 # 7. Seed database
 echo -e "${CYAN}Seeding database...${NC}"
 uv run python scripts/seed_db.py --all
 
+# 7b. Warm caches for the seeded titles
+echo -e "${CYAN}Warming caches...${NC}"
+uv run python manage.py warm_caches
+
 # 8. Verify Setup
 echo -e "${CYAN}Verifying setup...${NC}"
 uv run python manage.py check
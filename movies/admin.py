@@ -6,10 +6,15 @@ from .models import (
     Collection,
     CollectionItem,
     Director,
+    DirectorStats,
+    Follow,
     MysteryTitle,
+    OutboxEvent,
     Review,
+    ReviewerStats,
     ReviewHelpfulVote,
     Series,
+    SeriesStats,
     Tag,
     TagVote,
     WatchListEntry,
@@ -28,6 +33,69 @@ class SeriesAdmin(admin.ModelAdmin):
     prepopulated_fields = {"slug": ("name",)}
 
 
+@admin.register(DirectorStats, SeriesStats)
+class TaxonomyStatsAdmin(admin.ModelAdmin):
+    """Read-only view of the precomputed director and series stats."""
+
+    list_display = [
+        "__str__",
+        "title_count",
+        "review_count",
+        "avg_quality",
+        "avg_difficulty",
+        "fair_play_pct",
+        "updated_at",
+    ]
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: object = None) -> bool:
+        return False
+
+
+@admin.register(ReviewerStats)
+class ReviewerStatsAdmin(admin.ModelAdmin):
+    """Read-only view of the precomputed reviewer stats."""
+
+    list_display = [
+        "__str__",
+        "review_count",
+        "solved_count",
+        "fair_play_count",
+        "helpful_votes_received",
+        "follower_count",
+        "updated_at",
+    ]
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(self, request: HttpRequest, obj: object = None) -> bool:
+        return False
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    """Queued side effects, mainly to inspect the ones that keep failing."""
+
+    list_display = ["kind", "created_at", "attempts", "available_at", "locked_by"]
+    list_filter = ["kind"]
+    readonly_fields = [
+        "kind",
+        "payload",
+        "created_at",
+        "available_at",
+        "attempts",
+        "last_error",
+        "locked_by",
+        "locked_until",
+    ]
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+
 @admin.register(MysteryTitle)
 class MysteryTitleAdmin(admin.ModelAdmin):
     list_display = [
@@ -103,6 +171,12 @@ class WatchListEntryAdmin(admin.ModelAdmin):
     search_fields = ["user__username", "movie__title"]
 
 
+@admin.register(Follow)
+class FollowAdmin(admin.ModelAdmin):
+    list_display = ["follower", "followee", "created_at"]
+    search_fields = ["follower__username", "followee__username"]
+
+
 class CollectionItemInline(admin.TabularInline):
     model = CollectionItem
     extra = 1
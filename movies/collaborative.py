@@ -0,0 +1,89 @@
+"""
+Item-item collaborative filtering: "readers who liked this also liked".
+
+``build`` loads every review's (user, title, quality) into NumPy arrays,
+computes the adjusted cosine similarity between titles (movies.vectors) and
+stores each title's top neighbours through movies.similarity, incrementally
+for the titles whose reviews changed unless ``full`` is set.
+
+Imports NumPy, so only the build_similar_titles command imports this module.
+"""
+
+import logging
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from movies import similarity
+from movies.models import Review, TitleNeighbour
+from movies.vectors import item_similarities
+
+logger = logging.getLogger(__name__)
+
+KIND = TitleNeighbour.Kind.RATINGS
+
+
+class Ratings(NamedTuple):
+    """Reviews as parallel arrays of user index, title index and quality."""
+
+    users: NDArray[np.int64]
+    items: NDArray[np.int64]
+    quality: NDArray[np.float64]
+    n_users: int
+    user_ids: NDArray[np.int64]
+    movie_ids: NDArray[np.int64]
+
+
+def load_ratings() -> Ratings:
+    """Read every review's rating, sorted by user."""
+    rows = (
+        Review.objects.order_by()
+        .values_list("user_id", "movie_id", "quality")
+        .iterator(chunk_size=10_000)
+    )
+    data = np.fromiter(
+        rows,
+        dtype=[("user", np.int64), ("movie", np.int64), ("quality", np.float64)],
+    )
+    user_ids, users = np.unique(data["user"], return_inverse=True)
+    movie_ids, items = np.unique(data["movie"], return_inverse=True)
+    order = np.argsort(users, kind="stable")
+    return Ratings(
+        users[order],
+        items[order],
+        data["quality"][order],
+        len(user_ids),
+        user_ids,
+        movie_ids,
+    )
+
+
+def _similarities(
+    stale: set[int] | None,
+) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.float64]]:
+    ratings = load_ratings()
+    movie_ids = ratings.movie_ids
+    if stale is None:
+        rows = np.arange(len(movie_ids))
+    else:
+        rows = np.flatnonzero(np.isin(movie_ids, list(stale)))
+    scores = item_similarities(
+        ratings.users,
+        ratings.items,
+        ratings.quality,
+        ratings.n_users,
+        len(movie_ids),
+        rows,
+    )
+    logger.debug(
+        "Computed %s similarity rows from %s reviews",
+        len(rows),
+        len(ratings.users),
+    )
+    return movie_ids, rows, scores
+
+
+def build(full: bool = False) -> int:
+    """Recompute the rated-alike neighbours; returns the titles rewritten."""
+    return similarity.rebuild(KIND, _similarities, full)
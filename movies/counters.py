@@ -0,0 +1,115 @@
+"""
+Sharded counters for rows that many requests write at once.
+
+A title that is being reviewed heavily, or a review collecting helpful
+votes, serialises every writer on its row lock. With COUNTER_MODE set to
+"sharded", writers instead add their change to one of COUNTER_SHARDS
+CounterShard rows per counter, picked at random, so concurrent writers rarely
+wait for each other. Totals stay exact: readers add the pending shard values
+to the stored ones (``with_pending``), and ``fold`` (run periodically by the
+fold_counters command) moves them into the row and deletes the shards.
+
+A model takes part by implementing ``apply_counter_deltas``, which adds
+pending values to an instance in memory and returns the fields it changed.
+In the default "direct" mode none of this is used and the aggregates are
+recomputed on the row itself.
+"""
+
+import logging
+import random
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from typing import Protocol, cast
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, models, transaction
+
+from movies.models import CounterShard
+
+logger = logging.getLogger(__name__)
+
+DIRECT = "direct"
+SHARDED = "sharded"
+
+
+class CountedModel(Protocol):
+    pk: int
+
+    def apply_counter_deltas(self, deltas: Mapping[str, int]) -> list[str]: ...
+
+    def save(self, *, update_fields: list[str]) -> None: ...
+
+
+def is_sharded() -> bool:
+    return getattr(settings, "COUNTER_MODE", DIRECT) == SHARDED
+
+
+def increment(
+    model: type[models.Model],
+    object_id: int,
+    deltas: Mapping[str, int],
+) -> None:
+    """Add ``deltas`` to the counters of an object, on a random shard."""
+    shard = random.randrange(getattr(settings, "COUNTER_SHARDS", 8))  # nosec B311
+    CounterShard.objects.add(model._meta.label_lower, object_id, shard, dict(deltas))
+
+
+def with_pending[M: models.Model](objects: Iterable[M]) -> None:
+    """Add the pending shard values to ``objects`` (of one model) in memory."""
+    if not is_sharded():
+        return
+    by_pk = {obj.pk: obj for obj in objects}
+    if not by_pk:
+        return
+    label = next(iter(by_pk.values()))._meta.label_lower
+    for object_id, deltas in CounterShard.objects.totals(label, by_pk).items():
+        cast(CountedModel, by_pk[object_id]).apply_counter_deltas(deltas)
+
+
+def fold(limit: int = 500) -> int:
+    """
+    Move the pending values of up to ``limit`` objects into their rows.
+
+    Returns the number of objects folded.
+    """
+    pending = list(
+        CounterShard.objects.order_by()
+        .values_list("model", "object_id")
+        .distinct()[:limit],
+    )
+    for label, object_id in pending:
+        _fold_object(label, object_id)
+    if pending:
+        logger.info("Folded the counter shards of %s objects", len(pending))
+    return len(pending)
+
+
+def _fold_object(label: str, object_id: int) -> None:
+    model = apps.get_model(label)
+    with transaction.atomic():
+        # Lock the shards read here; writers that arrive meanwhile wait for
+        # them or start new rows, which the next fold picks up.
+        shards = list(
+            CounterShard.objects.select_for_update().filter(
+                model=label,
+                object_id=object_id,
+            ),
+        )
+        deltas: Counter[str] = Counter()
+        for shard in shards:
+            deltas[shard.name] += shard.value
+
+        # FOR NO KEY UPDATE does not wait for writers that only reference
+        # the row (e.g. inserting a review of the title).
+        obj = (
+            model._default_manager.select_for_update(
+                no_key=connection.features.has_select_for_no_key_update,
+            )
+            .filter(pk=object_id)
+            .first()
+        )
+        if obj is not None and any(deltas.values()):
+            counted = cast(CountedModel, obj)
+            counted.save(update_fields=counted.apply_counter_deltas(deltas))
+        CounterShard.objects.filter(pk__in=[shard.pk for shard in shards]).delete()
@@ -0,0 +1,97 @@
+"""
+The on-disk format of the rating factors shared by the trainer and the site.
+
+One file holds every array the predictions need: a magic string, the length
+of a JSON header, the header (global mean, and each array's dtype, shape and
+offset) and the arrays themselves, 64-byte aligned. ``load`` maps the file
+read-only, so every worker process shares one copy through the page cache
+and opening it costs no more than reading the header.
+
+``save`` writes a temporary file next to the target and renames it over
+the target, so readers see either the old model or the new one in full; a
+process that still has the old file mapped keeps reading it until it
+reopens.
+
+Imports NumPy: the site imports this module only through movies.predictions,
+which degrades to no predictions without it.
+"""
+
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+MAGIC = b"MMCFACT1"
+ALIGN = 64
+_LENGTH = struct.Struct("<Q")
+
+
+class Factors(NamedTuple):
+    """Arrays read from a factor file."""
+
+    global_mean: float
+    arrays: dict[str, NDArray[Any]]
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGN) * ALIGN
+
+
+def save(path: Path, global_mean: float, arrays: dict[str, NDArray[Any]]) -> None:
+    """Atomically replace ``path`` with the given arrays."""
+    offsets = {}
+    offset = 0
+    for name, array in arrays.items():
+        offsets[name] = offset
+        offset = _align(offset + array.nbytes)
+    layout = {
+        name: {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offsets[name],
+        }
+        for name, array in arrays.items()
+    }
+    header = json.dumps({"global_mean": global_mean, "arrays": layout}).encode()
+    start = _align(len(MAGIC) + _LENGTH.size + len(header))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with temporary.open("wb") as file:
+            file.write(MAGIC + _LENGTH.pack(len(header)) + header)
+            for name, array in arrays.items():
+                file.seek(start + offsets[name])
+                file.write(np.ascontiguousarray(array).tobytes())
+            file.truncate(start + offset)
+            file.flush()
+            os.fsync(file.fileno())
+        temporary.replace(path)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+def load(path: Path) -> Factors:
+    """Map the arrays of a factor file read-only; raises ValueError if malformed."""
+    with path.open("rb") as file:
+        prefix = file.read(len(MAGIC) + _LENGTH.size)
+        if len(prefix) < len(MAGIC) + _LENGTH.size or not prefix.startswith(MAGIC):
+            raise ValueError(f"{path} is not a factor file")
+        (length,) = _LENGTH.unpack(prefix[len(MAGIC) :])
+        header = json.loads(file.read(length))
+    start = _align(len(MAGIC) + _LENGTH.size + length)
+
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        offset = start + spec["offset"]
+        if offset + dtype.itemsize * int(np.prod(shape)) > len(mapped):
+            raise ValueError(f"{path} is truncated")
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=mapped, offset=offset)
+    return Factors(float(header["global_mean"]), arrays)
@@ -0,0 +1,154 @@
+"""
+Activity feeds: the recent reviews of the users someone follows.
+
+Feeds are fanned out on write. When a review is posted, a FeedEntry is
+inserted for each of its author's followers, so reading a feed is one range
+scan over the reader's entries instead of a join of the follow graph with
+the reviews table. A feed keeps its newest FEED_LENGTH entries; the older
+ones are trimmed by a separate outbox side effect, off the write path.
+
+Authors with FEED_FANOUT_MAX_FOLLOWERS or more followers are not fanned out,
+since every review of theirs would insert that many rows. Their reviews are
+read when a follower's feed is shown (fan-out on read), from each author's
+newest reviews, and merged in.
+"""
+
+import logging
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.db.models import Q
+
+from movies.models import FeedEntry, Follow, Review, ReviewerStats
+from movies.outbox import enqueue
+from users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LENGTH = 200
+DEFAULT_FANOUT_MAX_FOLLOWERS = 1000
+
+
+def feed_length() -> int:
+    return int(getattr(settings, "FEED_LENGTH", DEFAULT_LENGTH))
+
+
+def fanout_max_followers() -> int:
+    return int(
+        getattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", DEFAULT_FANOUT_MAX_FOLLOWERS),
+    )
+
+
+def is_pulled(user_id: int) -> bool:
+    """Return True if the user's reviews are read on demand, not fanned out."""
+    followers = (
+        ReviewerStats.objects.filter(user_id=user_id)
+        .values_list("follower_count", flat=True)
+        .first()
+    )
+    return (followers or 0) >= fanout_max_followers()
+
+
+# Writing
+
+
+def _insert(entries: list[FeedEntry]) -> None:
+    if not entries:
+        return
+    FeedEntry.objects.bulk_create(entries, ignore_conflicts=True, batch_size=500)
+    enqueue("feed.trim", owner_ids=sorted({entry.owner_id for entry in entries}))
+
+
+def fan_out(review: Review) -> int:
+    """Add ``review`` to the feeds of its author's followers; returns how many."""
+    if is_pulled(review.user_id):
+        return 0
+    owner_ids = Follow.objects.filter(followee_id=review.user_id).values_list(
+        "follower_id",
+        flat=True,
+    )
+    entries = [
+        FeedEntry(owner_id=owner_id, review_id=review.pk, created_at=review.created_at)
+        for owner_id in owner_ids
+    ]
+    _insert(entries)
+    return len(entries)
+
+
+def followed(follower_id: int, followee_id: int) -> None:
+    """Fill a new follower's feed with the followee's recent reviews."""
+    if is_pulled(followee_id):
+        return
+    recent = (
+        Review.objects.filter(user_id=followee_id)
+        .order_by("-created_at", "-pk")
+        .values_list("pk", "created_at")[: feed_length()]
+    )
+    _insert(
+        [
+            FeedEntry(owner_id=follower_id, review_id=pk, created_at=created_at)
+            for pk, created_at in recent
+        ],
+    )
+
+
+def unfollowed(follower_id: int, followee_id: int) -> None:
+    """Remove the followee's reviews from a former follower's feed."""
+    FeedEntry.objects.filter(
+        owner_id=follower_id,
+        review__user_id=followee_id,
+    ).delete()
+
+
+def trim(owner_ids: Iterable[int]) -> int:
+    """Keep only the newest FEED_LENGTH entries of each feed; returns deletions."""
+    length = feed_length()
+    deleted = 0
+    for owner_id in owner_ids:
+        entries = FeedEntry.objects.filter(owner_id=owner_id)
+        boundary = list(entries.values_list("created_at", "pk")[length : length + 1])
+        if not boundary:
+            continue
+        created_at, pk = boundary[0]
+        count, _ = entries.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lte=pk),
+        ).delete()
+        deleted += count
+    if deleted:
+        logger.debug("Trimmed %s feed entries", deleted)
+    return deleted
+
+
+# Reading
+
+
+def recent_reviews(user: CustomUser, limit: int) -> list[Review]:
+    """Return the newest ``limit`` reviews by users ``user`` follows."""
+    entries = (
+        FeedEntry.objects.filter(owner=user)
+        .select_related("review__movie", "review__user")
+        .order_by("-created_at", "-id")[:limit]
+    )
+    reviews = [entry.review for entry in entries]
+
+    pulled = list(
+        Follow.objects.filter(
+            follower=user,
+            followee__reviewer_stats__follower_count__gte=fanout_max_followers(),
+        ).values_list("followee_id", flat=True),
+    )
+    if not pulled:
+        return reviews
+
+    # Fan-out on read for heavily followed authors. Entries fanned out before
+    # an author crossed the limit may repeat some of these.
+    seen = {review.pk for review in reviews}
+    reviews.extend(
+        review
+        for review in Review.objects.filter(user_id__in=pulled)
+        .select_related("movie", "user")
+        .order_by("-created_at", "-pk")[:limit]
+        if review.pk not in seen
+    )
+    reviews.sort(key=lambda review: (review.created_at, review.pk), reverse=True)
+    return reviews[:limit]
@@ -1,6 +1,9 @@
+from typing import Any, cast
+
 from django import forms
 
 from .models import Collection, CollectionItem, Review, Tag
+from .snapshots import tag_snapshot
 
 
 class ReviewForm(forms.ModelForm):
@@ -13,11 +16,21 @@ class ReviewForm(forms.ModelForm):
 
 
 class TagVoteForm(forms.Form):
-    tag = forms.ModelChoiceField(
-        queryset=Tag.objects.all(),
-        empty_label="Select a tag...",
-        widget=forms.Select(attrs={"class": "form-select"}),
-    )
+    # Choices come from the in-memory tag snapshot rather than a query.
+    tag = forms.ChoiceField(widget=forms.Select(attrs={"class": "form-select"}))
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        cast(forms.ChoiceField, self.fields["tag"]).choices = [
+            ("", "Select a tag..."),
+            *((tag.pk, tag.name) for tag in tag_snapshot.all()),
+        ]
+
+    def clean_tag(self) -> Tag:
+        tag = tag_snapshot.get(self.cleaned_data["tag"])
+        if tag is None:
+            raise forms.ValidationError("Select a valid tag.")
+        return tag
 
 
 class CollectionForm(forms.ModelForm):
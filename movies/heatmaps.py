@@ -0,0 +1,57 @@
+"""
+Quality vs. difficulty review histograms.
+
+A histogram is a flat list of HISTOGRAM_SIZE review counts, one per
+(quality, difficulty) pair. Each title stores its own, refreshed with its
+other review aggregates, and director and series stats store the sum of
+their titles' histograms, so no heatmap is ever grouped from the reviews.
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+RATINGS = range(1, 6)
+HISTOGRAM_SIZE = len(RATINGS) ** 2
+
+
+def histogram_index(quality: int, difficulty: int) -> int:
+    return (difficulty - 1) * len(RATINGS) + (quality - 1)
+
+
+def empty_histogram() -> list[int]:
+    return [0] * HISTOGRAM_SIZE
+
+
+def sum_histograms(histograms: Iterable[list[int]]) -> list[int]:
+    """Add up histograms cell by cell; empty (unset) histograms count as zero."""
+    total = empty_histogram()
+    for histogram in histograms:
+        for index, count in enumerate(histogram or ()):
+            total[index] += count
+    return total
+
+
+def heatmap_grid(histogram: list[int]) -> dict[str, Any]:
+    """Lay a histogram out as heatmap rows, difficulty 5 at the top."""
+    counts = histogram or empty_histogram()
+    max_count = max(counts)
+
+    rows = []
+    # Difficulty 5 down to 1
+    for difficulty in reversed(RATINGS):
+        cells = []
+        # Quality 1 to 5
+        for quality in RATINGS:
+            count = counts[histogram_index(quality, difficulty)]
+            intensity = (count / max_count) if max_count > 0 else 0
+            cells.append(
+                {
+                    "quality": quality,
+                    "difficulty": difficulty,
+                    "count": count,
+                    "intensity": intensity,
+                },
+            )
+        rows.append({"difficulty": difficulty, "cells": cells})
+
+    return {"rows": rows, "max_count": max_count}
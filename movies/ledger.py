@@ -0,0 +1,358 @@
+"""
+Append-only ledger for tag and helpful votes.
+
+With VOTE_MODE set to "ledger", casting a vote appends a VoteIntent row
+instead of writing TagVote or ReviewHelpfulVote: one INSERT, with no
+unique constraint checked and no receivers (VoteIntent is not in
+CACHED_QUERYSET_MODELS, so appends do not touch the cache). ``compact``
+(run periodically by the compact_votes command) takes the ledger in
+batches, keeps the newest intent per vote, and applies the outcome with a
+few set-based statements: bulk inserts and deletes on the vote tables and
+one counter update per review.
+
+Until then a voter still sees their own votes: the helpers here read the
+user's pending intents on top of the vote tables. Other users see the vote
+once it is compacted. The ledger has no index on the voter, so these reads
+scan it; compacting often keeps it small.
+"""
+
+import logging
+from collections import Counter
+from collections.abc import Collection, Iterable
+from functools import reduce
+from operator import or_
+from typing import cast
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+
+from caching.tags import invalidate_tags, table_tag
+from movies import counters
+from movies.models import (
+    MysteryTitle,
+    Review,
+    ReviewerStats,
+    ReviewHelpfulVote,
+    StaleNeighbourList,
+    Tag,
+    TagVote,
+    TitleNeighbour,
+    VoteIntent,
+)
+from users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+DIRECT = "direct"
+LEDGER = "ledger"
+
+Kind = VoteIntent.Kind
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "VOTE_MODE", DIRECT) == LEDGER
+
+
+def _pending(kind: int, user: CustomUser, **filters: object) -> dict[int, bool | None]:
+    """Return the user's newest intent per target (or per tag for tag votes)."""
+    key = "tag_id" if kind == Kind.TAG else "target_id"
+    intents = VoteIntent.objects.filter(kind=kind, voter_id=user.pk, **filters)
+    return dict(intents.order_by("pk").values_list(key, "value"))
+
+
+# Reading
+
+
+def voted_tag_ids(movie: MysteryTitle, user: CustomUser) -> set[int]:
+    """Return the tags the user has voted for on a title, pending votes included."""
+    voted = set(
+        TagVote.objects.filter(movie=movie, user=user).values_list("tag_id", flat=True),
+    )
+    if is_enabled():
+        for tag_id, value in _pending(Kind.TAG, user, target_id=movie.pk).items():
+            if value:
+                voted.add(tag_id)
+            else:
+                voted.discard(tag_id)
+    return voted
+
+
+def helpful_vote(review: Review, user: CustomUser) -> bool | None:
+    """Return the user's current helpful vote on a review, or None."""
+    if is_enabled():
+        pending = _pending(Kind.HELPFUL, user, target_id=review.pk)
+        if review.pk in pending:
+            return pending[review.pk]
+    vote = ReviewHelpfulVote.objects.filter(review=review, user=user).first()
+    return None if vote is None else vote.is_helpful
+
+
+def count_own_vote(review: Review, user: CustomUser) -> bool | None:
+    """
+    Return the user's current helpful vote on a review, or None.
+
+    A pending vote is also counted into the review's helpful counts (in
+    memory), so the voter sees totals that match their vote.
+    """
+    vote = ReviewHelpfulVote.objects.filter(review=review, user=user).first()
+    stored = None if vote is None else vote.is_helpful
+    if not is_enabled():
+        return stored
+    pending = _pending(Kind.HELPFUL, user, target_id=review.pk)
+    if review.pk not in pending or pending[review.pk] is stored:
+        return stored
+
+    current = pending[review.pk]
+    for value, change in ((stored, -1), (current, 1)):
+        if value is not None:
+            counter = Review.helpful_counter(value)
+            setattr(review, counter, getattr(review, counter) + change)
+    return current
+
+
+def attach_pending_votes(reviews: Iterable[Review], user: CustomUser) -> None:
+    """Override ``user_vote`` on reviews the user has pending votes for."""
+    if not is_enabled():
+        return
+    by_pk = {review.pk: review for review in reviews}
+    if not by_pk:
+        return
+    pending = _pending(Kind.HELPFUL, user, target_id__in=by_pk)
+    for review_id, value in pending.items():
+        review = by_pk[review_id]
+        review.user_vote = (
+            None
+            if value is None
+            else ReviewHelpfulVote(review=review, user=user, is_helpful=value)
+        )
+
+
+# Writing
+
+
+def _append(kind: int, user: CustomUser, target_id: int, **values: object) -> None:
+    VoteIntent.objects.create(
+        kind=kind,
+        voter_id=user.pk,
+        target_id=target_id,
+        **values,
+    )
+
+
+def toggle_tag_vote(movie: MysteryTitle, tag: Tag, user: CustomUser) -> bool:
+    """Record a toggle of the user's tag vote; returns True if now voted."""
+    voted = tag.pk not in voted_tag_ids(movie, user)
+    _append(Kind.TAG, user, movie.pk, tag_id=tag.pk, value=voted)
+    return voted
+
+
+def set_tag_votes(
+    movie: MysteryTitle,
+    user: CustomUser,
+    add: Collection[int],
+    remove: Collection[int],
+) -> tuple[set[int], set[int]]:
+    """Record several tag votes at once; returns the tags added and removed."""
+    voted = voted_tag_ids(movie, user)
+    added = set(add) - voted
+    removed = set(remove) & voted
+    VoteIntent.objects.bulk_create(
+        [
+            VoteIntent(
+                kind=Kind.TAG,
+                voter_id=user.pk,
+                target_id=movie.pk,
+                tag_id=tag_id,
+                value=tag_id in added,
+            )
+            for tag_id in sorted(added | removed)
+        ],
+    )
+    return added, removed
+
+
+def cast_helpful_vote(review: Review, user: CustomUser, is_helpful: bool) -> str:
+    """
+    Record a helpful vote like ReviewHelpfulVote.objects.cast_vote.
+
+    Returns "removed", "created" or "changed".
+    """
+    current = helpful_vote(review, user)
+    if current is is_helpful:
+        _append(Kind.HELPFUL, user, review.pk, value=None)
+        return "removed"
+    _append(Kind.HELPFUL, user, review.pk, value=is_helpful)
+    return "created" if current is None else "changed"
+
+
+# Compaction
+
+
+def compact(limit: int = 1000) -> int:
+    """
+    Apply up to ``limit`` ledger rows to the vote tables and delete them.
+
+    Returns the number of ledger rows processed.
+    """
+    with transaction.atomic():
+        # Locking the batch keeps a second compactor from applying it twice.
+        batch = list(VoteIntent.objects.select_for_update().order_by("pk")[:limit])
+        if not batch:
+            return 0
+
+        # Only the newest intent per vote matters.
+        latest: dict[tuple[int, int, int, int | None], VoteIntent] = {}
+        for intent in batch:
+            key = (intent.kind, intent.voter_id, intent.target_id, intent.tag_id)
+            latest[key] = intent
+        intents = list(latest.values())
+        voters = set(
+            CustomUser.objects.filter(
+                pk__in={intent.voter_id for intent in intents},
+            ).values_list("pk", flat=True),
+        )
+        live = [intent for intent in intents if intent.voter_id in voters]
+
+        tag_votes = _compact_tag_votes([i for i in live if i.kind == Kind.TAG])
+        helpful_votes = _compact_helpful_votes(
+            [i for i in live if i.kind == Kind.HELPFUL],
+        )
+        # Not a pk range: an intent with a lower pk whose transaction commits
+        # after the batch was read must stay for the next run.
+        VoteIntent.objects.filter(pk__in=[intent.pk for intent in batch]).delete()
+
+    logger.info(
+        "Compacted %s ledger rows: %s tag votes and %s helpful votes changed",
+        len(batch),
+        tag_votes,
+        helpful_votes,
+    )
+    return len(batch)
+
+
+def _compact_tag_votes(intents: list[VoteIntent]) -> int:
+    movies = set(
+        MysteryTitle.objects.filter(
+            pk__in={intent.target_id for intent in intents},
+        ).values_list("pk", flat=True),
+    )
+    tags = set(
+        Tag.objects.filter(
+            pk__in={intent.tag_id for intent in intents},
+        ).values_list("pk", flat=True),
+    )
+    intents = [i for i in intents if i.target_id in movies and i.tag_id in tags]
+    if not intents:
+        return 0
+
+    existing = set(
+        TagVote.objects.filter(
+            movie_id__in={intent.target_id for intent in intents},
+            user_id__in={intent.voter_id for intent in intents},
+        ).values_list("user_id", "movie_id", "tag_id"),
+    )
+    added: list[tuple[int, int, int]] = []
+    removed: list[tuple[int, int, int]] = []
+    for intent in intents:
+        key = (intent.voter_id, intent.target_id, cast(int, intent.tag_id))
+        if intent.value and key not in existing:
+            added.append(key)
+        elif not intent.value and key in existing:
+            removed.append(key)
+
+    if added:
+        TagVote.objects.bulk_create(
+            [
+                TagVote(user_id=user_id, movie_id=movie_id, tag_id=tag_id)
+                for user_id, movie_id, tag_id in added
+            ],
+            ignore_conflicts=True,
+        )
+    if removed:
+        TagVote.objects.filter(
+            reduce(
+                or_,
+                (Q(user_id=u, movie_id=m, tag_id=t) for u, m, t in removed),
+            ),
+        )._raw_delete(TagVote.objects.db)
+    if added or removed:
+        invalidate_tags(table_tag(TagVote._meta.db_table))
+        StaleNeighbourList.objects.mark(
+            TitleNeighbour.Kind.TAGS,
+            {movie_id for _, movie_id, _ in added + removed},
+        )
+    return len(added) + len(removed)
+
+
+def _compact_helpful_votes(intents: list[VoteIntent]) -> int:
+    reviews = set(
+        Review.objects.filter(
+            pk__in={intent.target_id for intent in intents},
+        ).values_list("pk", flat=True),
+    )
+    intents = [intent for intent in intents if intent.target_id in reviews]
+    if not intents:
+        return 0
+
+    existing = {
+        (user_id, review_id): is_helpful
+        for user_id, review_id, is_helpful in ReviewHelpfulVote.objects.filter(
+            review_id__in={intent.target_id for intent in intents},
+            user_id__in={intent.voter_id for intent in intents},
+        ).values_list("user_id", "review_id", "is_helpful")
+    }
+    upserts, removed = [], []
+    deltas: dict[int, Counter[str]] = {}
+    for intent in intents:
+        key = (intent.voter_id, intent.target_id)
+        old, new = existing.get(key), intent.value
+        if old is new:
+            continue
+        review_deltas = deltas.setdefault(intent.target_id, Counter())
+        if old is not None:
+            review_deltas[Review.helpful_counter(old)] -= 1
+        if new is None:
+            removed.append(key)
+        else:
+            review_deltas[Review.helpful_counter(new)] += 1
+            upserts.append(
+                ReviewHelpfulVote(
+                    user_id=intent.voter_id,
+                    review_id=intent.target_id,
+                    is_helpful=new,
+                ),
+            )
+
+    if upserts:
+        ReviewHelpfulVote.objects.bulk_create(
+            upserts,
+            update_conflicts=True,
+            unique_fields=["review", "user"],
+            update_fields=["is_helpful", "updated_at"],
+        )
+    if removed:
+        ReviewHelpfulVote.objects.filter(
+            reduce(or_, (Q(user_id=u, review_id=r) for u, r in removed)),
+        )._raw_delete(ReviewHelpfulVote.objects.db)
+
+    for review_id, review_deltas in deltas.items():
+        if counters.is_sharded():
+            counters.increment(Review, review_id, review_deltas)
+        else:
+            Review.objects.filter(pk=review_id).update(
+                helpful_count=F("helpful_count") + review_deltas["helpful_count"],
+                not_helpful_count=(
+                    F("not_helpful_count") + review_deltas["not_helpful_count"]
+                ),
+            )
+        ReviewerStats.add(
+            {"helpful_votes_received": review_deltas["helpful_count"]},
+            user__review=review_id,
+        )
+    if upserts or removed:
+        invalidate_tags(
+            table_tag(ReviewHelpfulVote._meta.db_table),
+            table_tag(Review._meta.db_table),
+        )
+    return len(upserts) + len(removed)
@@ -0,0 +1,53 @@
+import importlib.util
+import logging
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("ratings", "tags")
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the similar titles shown on the title pages: 'readers who "
+        "liked this also liked' from the review ratings and 'similar mysteries' "
+        "from the tag votes. Incremental unless --full; run periodically, e.g. "
+        "hourly from cron, with a nightly --full build. Needs NumPy (the 'ml' "
+        "dependency group)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute every title instead of only those whose data changed.",
+        )
+        parser.add_argument(
+            "--kind",
+            choices=KINDS,
+            action="append",
+            help="Only build this kind of neighbours (repeatable; default: all).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if importlib.util.find_spec("numpy") is None:
+            raise CommandError(
+                "NumPy is not installed; install the 'ml' dependency group "
+                "(uv sync --group ml).",
+            )
+        # Imported here so the rest of the site never needs NumPy.
+        from movies import collaborative, tag_similarity
+
+        builders = {"ratings": collaborative.build, "tags": tag_similarity.build}
+        for kind in options["kind"] or KINDS:
+            started = time.perf_counter()
+            built = builders[kind](full=options["full"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Rebuilt {kind} neighbours of {built} titles "
+                    f"in {time.perf_counter() - started:.1f}s.",
+                ),
+            )
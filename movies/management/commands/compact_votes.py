@@ -0,0 +1,33 @@
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from movies.ledger import compact
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold the vote ledger (VOTE_MODE=ledger) into the tag and helpful vote "
+        "tables. Run periodically, e.g. every minute from cron."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of ledger rows compacted per batch (default: 1000).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        total = 0
+        while True:
+            compacted = compact(options["batch_size"])
+            total += compacted
+            # Stop at a short batch rather than chase writers forever.
+            if compacted < options["batch_size"]:
+                break
+        self.stdout.write(self.style.SUCCESS(f"Compacted {total} ledger rows."))
@@ -0,0 +1,33 @@
+import logging
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from movies.counters import fold
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move pending sharded counter values (COUNTER_MODE=sharded) into the "
+        "title and review rows. Run periodically, e.g. every minute from cron."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of objects folded per batch (default: 500).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        total = 0
+        while True:
+            folded = fold(options["batch_size"])
+            total += folded
+            # Stop at a short batch rather than chase writers forever.
+            if folded < options["batch_size"]:
+                break
+        self.stdout.write(self.style.SUCCESS(f"Folded counters of {total} objects."))
@@ -0,0 +1,63 @@
+import logging
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from movies.outbox import process_batch
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the side effects queued in the outbox (SIDE_EFFECTS_MODE=outbox), "
+        "in batches, until interrupted."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Maximum number of events claimed at a time (default: 100).",
+        )
+        parser.add_argument(
+            "--lease",
+            type=float,
+            default=60.0,
+            help="Seconds before another worker may reclaim a batch (default: 60).",
+        )
+        parser.add_argument(
+            "--idle-sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the outbox is empty (default: 1).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the outbox is empty instead of waiting for events.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        lease = timedelta(seconds=options["lease"])
+        total = 0
+        logger.info("Outbox worker started")
+        try:
+            while True:
+                # Long-running loop: drop connections the database has closed.
+                close_old_connections()
+                processed = process_batch(options["batch_size"], lease)
+                total += processed
+                if processed:
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["idle_sleep"])
+        except KeyboardInterrupt:
+            logger.info("Outbox worker interrupted")
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} outbox events."))
@@ -0,0 +1,67 @@
+import importlib.util
+import os
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Fit the rating factors behind the predicted ratings and the "
+        "'Recommended for you' page, and replace the factor file the site "
+        "maps (FACTORS_PATH). Retrains from scratch; run periodically, e.g. "
+        "nightly from cron. Needs NumPy (the 'ml' dependency group)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--rank",
+            type=int,
+            default=32,
+            help="Number of latent factors per user and title (default: 32).",
+        )
+        parser.add_argument(
+            "--reg",
+            type=float,
+            default=0.05,
+            help="Regularisation per rating (default: 0.05).",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=10,
+            help="Alternating least squares sweeps (default: 10).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Threads solving the least squares problems (default: CPUs).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if importlib.util.find_spec("numpy") is None:
+            raise CommandError(
+                "NumPy is not installed; install the 'ml' dependency group "
+                "(uv sync --group ml).",
+            )
+        # Imported here so the rest of the site never needs NumPy.
+        from movies import factorization
+
+        started = time.perf_counter()
+        result = factorization.train(
+            rank=options["rank"],
+            reg=options["reg"],
+            iterations=options["iterations"],
+            workers=max(options["workers"], 1),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Trained on {result.reviews} reviews by {result.users} users "
+                f"of {result.titles} titles in "
+                f"{time.perf_counter() - started:.1f}s (training RMSE "
+                f"{result.rmse:.3f}); wrote {settings.FACTORS_PATH}.",
+            ),
+        )
@@ -0,0 +1,148 @@
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connections
+from django.db.models import Count
+from django.template.loader import render_to_string
+
+from movies.models import Director, MysteryTitle, Series
+from movies.views.taxonomy import get_taxonomy_chart
+
+logger = logging.getLogger(__name__)
+
+Task = tuple[str, Callable[[], Any]]
+Result = tuple[str, Exception | None]
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-compute cached fragments and chart data for the most-reviewed titles, "
+        "e.g. after a deploy or after seeding the database."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=100,
+            help="Number of most-reviewed titles to warm (default: 100).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Maximum number of worker threads (default: 4).",
+        )
+        parser.add_argument(
+            "--budget",
+            type=float,
+            default=60.0,
+            help="Stop warming after this many seconds (default: 60).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        deadline = time.monotonic() + options["budget"]
+        tasks = self._build_tasks(options["limit"])
+
+        todo: queue.SimpleQueue[Task] = queue.SimpleQueue()
+        for task in tasks:
+            todo.put(task)
+        results: queue.SimpleQueue[Result] = queue.SimpleQueue()
+        stop = threading.Event()
+        if time.monotonic() < deadline:
+            # Daemon threads: a task still running when the budget is spent
+            # is abandoned, so neither this command nor the process exit
+            # waits for it.
+            for _ in range(min(max(1, options["workers"]), len(tasks))):
+                threading.Thread(
+                    target=self._work,
+                    args=(todo, results, stop),
+                    daemon=True,
+                ).start()
+
+        done = failed = 0
+        while done + failed < len(tasks):
+            try:
+                name, error = results.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if error is None:
+                done += 1
+            else:
+                failed += 1
+                logger.error("Cache warm-up failed for %s", name, exc_info=error)
+        # Workers start nothing new once the budget is spent.
+        stop.set()
+        unfinished = len(tasks) - done - failed
+
+        logger.info(
+            "Cache warm-up finished: %s warmed, %s failed, %s unfinished",
+            done,
+            failed,
+            unfinished,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed {done} cache entries "
+                f"({failed} failed, {unfinished} unfinished).",
+            ),
+        )
+
+    def _build_tasks(self, limit: int) -> list[Task]:
+        """List the cache entries to warm, most valuable first."""
+        movies = list(
+            MysteryTitle.objects.annotate(review_count=Count("reviews"))
+            .order_by("-review_count", "-release_year")
+            .only("pk", "slug", "director_id", "series_id")[:limit],
+        )
+
+        tasks: list[Task] = [
+            (f"heatmap:{movie.slug}", self._heatmap_task(movie)) for movie in movies
+        ]
+
+        director_ids = {m.director_id for m in movies if m.director_id}
+        series_ids = {m.series_id for m in movies if m.series_id}
+        taxonomies: list[Director | Series] = [
+            *Director.objects.filter(pk__in=director_ids),
+            *Series.objects.filter(pk__in=series_ids),
+        ]
+        tasks.extend((f"chart:{obj.slug}", self._chart_task(obj)) for obj in taxonomies)
+        return tasks
+
+    @staticmethod
+    def _heatmap_task(movie: MysteryTitle) -> Callable[[], Any]:
+        return lambda: render_to_string(
+            "movies/includes/heatmap.html",
+            {"movie": movie},
+        )
+
+    @staticmethod
+    def _chart_task(obj: Director | Series) -> Callable[[], Any]:
+        return lambda: get_taxonomy_chart(obj)
+
+    @staticmethod
+    def _work(
+        todo: queue.SimpleQueue[Task],
+        results: queue.SimpleQueue[Result],
+        stop: threading.Event,
+    ) -> None:
+        try:
+            while not stop.is_set():
+                try:
+                    name, func = todo.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    func()
+                except Exception as error:
+                    results.put((name, error))
+                else:
+                    results.put((name, None))
+        finally:
+            # Each worker thread opens its own database connection.
+            connections.close_all()
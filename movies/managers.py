@@ -1,18 +1,34 @@
 import logging
-from typing import TYPE_CHECKING, Self
+from collections.abc import Collection as CollectionABC
+from typing import TYPE_CHECKING, Any, Self, cast
 
+from django.apps import apps
 from django.contrib.auth.models import AnonymousUser
-from django.db import models
-from django.db.models import Q
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.signals import post_delete, post_save
+
+from caching.querysets import CachedQuerySet
+from caching.tags import invalidate_tags, table_tag
 
 # Use TYPE_CHECKING to avoid circular imports if users app imports movies
 if TYPE_CHECKING:
+    from movies.models import Collection, MysteryTitle, Review, ReviewHelpfulVote
     from users.models import CustomUser
 
 logger = logging.getLogger(__name__)
 
 
-class MysteryTitleQuerySet(models.QuerySet):
+def _column(model: type[models.Model], name: str) -> str:
+    """Return the database column of a concrete field ("pk" for the primary key)."""
+    field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+    if not isinstance(field, models.Field) or field.column is None:
+        raise FieldDoesNotExist(f"{model.__name__}.{name} has no column")
+    return field.column
+
+
+class MysteryTitleQuerySet(CachedQuerySet):
     def search(self, query: str | None) -> Self:
         """
         Filters titles by title, description, or director name.
@@ -36,8 +52,12 @@ class MysteryTitleQuerySet(models.QuerySet):
     def fair_play(self) -> Self:
         return self.filter(is_fair_play_candidate=True)
 
+    def review_histograms(self) -> dict[int, list[int]]:
+        """Return the stored review histogram of each title, keyed by pk."""
+        return dict(self.order_by().values_list("pk", "review_histogram"))
+
 
-class CollectionQuerySet(models.QuerySet):
+class CollectionQuerySet(CachedQuerySet):
     def visible_to(self, user: CustomUser | AnonymousUser) -> Self:
         """
         Returns collections visible to the general public.
@@ -51,3 +71,310 @@ class CollectionQuerySet(models.QuerySet):
             return qs.exclude(user=user)
 
         return qs
+
+    def with_movie_flag(self, movie: MysteryTitle) -> Self:
+        """
+        Annotates each collection with `contains_movie`, so membership is
+        resolved by the same query that lists the collections.
+        """
+        return self.annotate(
+            contains_movie=Exists(
+                apps.get_model("movies", "CollectionItem").objects.filter(
+                    collection=OuterRef("pk"),
+                    movie=movie,
+                ),
+            ),
+        )
+
+
+class CollectionItemQuerySet(CachedQuerySet):
+    def append(self, collection: Collection, movie: MysteryTitle) -> bool:
+        """
+        Adds a movie to the end of a collection in a single statement.
+
+        The next order value is computed inside the INSERT and duplicates are
+        rejected by the unique constraint, so there is no read-then-write race.
+        Returns True if a row was inserted, False if the movie was already there.
+        """
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        table = qn(self.model._meta.db_table)
+        collection_col = qn(_column(self.model, "collection"))
+        movie_col = qn(_column(self.model, "movie"))
+        order_col = qn(_column(self.model, "order"))
+        note_col = qn(_column(self.model, "note"))
+
+        sql = (
+            f"INSERT INTO {table} ({collection_col}, {movie_col}, {order_col}, {note_col}) "  # nosec B608
+            f"SELECT %s, %s, COALESCE(MAX({order_col}) + 1, 0), %s "
+            f"FROM {table} WHERE {collection_col} = %s "
+            f"ON CONFLICT DO NOTHING"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [collection.pk, movie.pk, "", collection.pk])
+            inserted = bool(cursor.rowcount == 1)
+
+        logger.debug(
+            "Collection %s append of movie %s inserted=%s",
+            collection.pk,
+            movie.pk,
+            inserted,
+        )
+        return inserted
+
+
+class CounterShardQuerySet(models.QuerySet):
+    def add(
+        self,
+        model: str,
+        object_id: int,
+        shard: int,
+        deltas: dict[str, int],
+    ) -> None:
+        """
+        Add ``deltas`` to the counters of one object in a single upsert.
+
+        Rows are written in name order so concurrent writers to the same
+        shard always lock them in the same order.
+        """
+        rows = [(name, delta) for name, delta in sorted(deltas.items()) if delta]
+        if not rows:
+            return
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        table = qn(self.model._meta.db_table)
+        columns = [
+            qn(_column(self.model, name))
+            for name in ("model", "object_id", "name", "shard", "value")
+        ]
+        value_col = columns[-1]
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "  # nosec B608
+            f"VALUES {', '.join(['(%s, %s, %s, %s, %s)'] * len(rows))} "
+            f"ON CONFLICT ({', '.join(columns[:-1])}) "
+            f"DO UPDATE SET {value_col} = {table}.{value_col} + EXCLUDED.{value_col}"
+        )
+        params = [
+            param
+            for name, delta in rows
+            for param in (model, object_id, name, shard, delta)
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def totals(
+        self,
+        model: str,
+        object_ids: CollectionABC[int],
+    ) -> dict[int, dict[str, int]]:
+        """Return the pending value of each counter, keyed by object id."""
+        result: dict[int, dict[str, int]] = {}
+        rows = (
+            self.filter(model=model, object_id__in=object_ids)
+            .values_list("object_id", "name")
+            .annotate(total=models.Sum("value"))
+            .order_by()
+        )
+        for object_id, name, total in rows:
+            result.setdefault(object_id, {})[name] = total
+        return result
+
+
+class StaleNeighbourListQuerySet(models.QuerySet):
+    def mark(self, kind: int, movie_ids: CollectionABC[int]) -> None:
+        """Flag the neighbours of ``movie_ids`` for the next incremental build."""
+        if movie_ids:
+            self.bulk_create(
+                [self.model(movie_id=pk, kind=kind) for pk in sorted(movie_ids)],
+                ignore_conflicts=True,
+            )
+
+
+class ToggleQuerySet(CachedQuerySet):
+    """
+    Single-statement inserts and deletes for rows identified by a unique key.
+
+    Each write is one ``INSERT ... ON CONFLICT DO NOTHING`` or ``DELETE``
+    whose outcome is read from ``RETURNING`` (or the row count where the
+    database cannot return columns), so concurrent requests are settled by
+    the unique constraint rather than by a read beforehand. The statements
+    bypass save() and delete(), so post_save and post_delete are sent here
+    for the rows actually written.
+    """
+
+    def toggle(self, **values: Any) -> bool:
+        """
+        Delete the row matching ``values``, or insert it if there was none.
+
+        Returns True if the row exists afterwards.
+        """
+        with transaction.atomic(using=self.db):
+            if self.delete_row(**values) is not None:
+                return False
+            # A concurrent request may insert the same row first; either way
+            # the row now exists.
+            self.insert_row(**values)
+            return True
+
+    def insert_row(self, **values: Any) -> models.Model | None:
+        """Insert a row unless it conflicts; return it if it was inserted."""
+        obj: models.Model = self.model(**values)
+        fields = [
+            field
+            for field in self.model._meta.local_concrete_fields
+            if not field.generated and field is not self.model._meta.auto_field
+        ]
+        connection = connections[self.db]
+        params = [
+            field.get_db_prep_save(field.pre_save(obj, add=True), connection)
+            for field in fields
+        ]
+        qn = connection.ops.quote_name
+        sql = (
+            f"INSERT INTO {qn(self.model._meta.db_table)} "  # nosec B608
+            f"({', '.join(qn(_column(self.model, field.name)) for field in fields)}) "
+            f"VALUES ({', '.join(['%s'] * len(fields))}) "
+            f"ON CONFLICT DO NOTHING"
+        )
+        if not self._write(obj, sql, params):
+            return None
+
+        obj._state.adding = False
+        obj._state.db = self.db
+        post_save.send(
+            sender=self.model,
+            instance=obj,
+            created=True,
+            update_fields=None,
+            raw=False,
+            using=self.db,
+        )
+        return obj
+
+    def delete_row(self, **values: Any) -> models.Model | None:
+        """Delete the row matching ``values``; return it if there was one."""
+        obj: models.Model = self.model(**values)
+        fields = [
+            cast("models.Field[Any, Any]", self.model._meta.get_field(name))
+            for name in values
+        ]
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        conditions = " AND ".join(
+            f"{qn(_column(self.model, field.name))} = %s" for field in fields
+        )
+        params = [
+            field.get_db_prep_value(getattr(obj, field.attname), connection)
+            for field in fields
+        ]
+        sql = f"DELETE FROM {qn(self.model._meta.db_table)} WHERE {conditions}"  # nosec B608
+        if not self._write(obj, sql, params):
+            return None
+
+        obj._state.adding = False
+        obj._state.db = self.db
+        post_delete.send(sender=self.model, instance=obj, using=self.db, origin=obj)
+        return obj
+
+    def _write(self, obj: models.Model, sql: str, params: list[Any]) -> bool:
+        """Run a one-row statement; set ``obj.pk`` if the database returns it."""
+        connection = connections[self.db]
+        returning = connection.features.can_return_columns_from_insert
+        if returning:
+            pk_column = connection.ops.quote_name(_column(self.model, "pk"))
+            sql = f"{sql} RETURNING {pk_column}"
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            if not returning:
+                return bool(cursor.rowcount == 1)
+            row = cursor.fetchone()
+        if row is None:
+            return False
+        obj.pk = row[0]
+        return True
+
+
+class TagVoteQuerySet(ToggleQuerySet):
+    def set_votes(
+        self,
+        movie: MysteryTitle,
+        user: CustomUser,
+        add: CollectionABC[int],
+        remove: CollectionABC[int],
+    ) -> tuple[set[int], set[int]]:
+        """
+        Add and remove a user's votes for several tags of a title at once.
+
+        The votes are written with one bulk INSERT and one DELETE in a single
+        transaction, and the cached vote counts are invalidated once rather
+        than per vote. Returns the ids of the tags added and removed.
+        """
+        with transaction.atomic(using=self.db):
+            votes = self.filter(movie=movie, user=user)
+            existing = set(votes.values_list("tag_id", flat=True))
+            added = set(add) - existing
+            removed = set(remove) & existing
+            if removed:
+                # A plain DELETE: the per-vote signals only log and invalidate
+                # the table, which is done once below.
+                votes.filter(tag_id__in=removed)._raw_delete(self.db)
+            if added:
+                self.bulk_create(
+                    [self.model(movie=movie, user=user, tag_id=pk) for pk in added],
+                    ignore_conflicts=True,
+                )
+
+        if added or removed:
+            invalidate_tags(table_tag(self.model._meta.db_table))
+            neighbours = apps.get_model("movies", "TitleNeighbour")
+            apps.get_model("movies", "StaleNeighbourList").objects.mark(
+                neighbours.Kind.TAGS,
+                {movie.pk},
+            )
+            logger.info(
+                "Tag votes of %s on %s: added %s, removed %s",
+                user,
+                movie.slug,
+                sorted(added),
+                sorted(removed),
+            )
+        return added, removed
+
+
+class ReviewHelpfulVoteQuerySet(ToggleQuerySet):
+    def cast_vote(self, review: Review, user: CustomUser, is_helpful: bool) -> str:
+        """
+        Record a user's vote on a review, each step a single statement.
+
+        Repeating the current vote removes it, voting the other way changes
+        it. Returns "removed", "created" or "changed".
+        """
+        with transaction.atomic(using=self.db):
+            # Each step can lose a race with a concurrent vote of the same
+            # user, in which case the next attempt sees its outcome.
+            for _ in range(3):
+                if self.delete_row(review=review, user=user, is_helpful=is_helpful):
+                    return "removed"
+                if self.insert_row(review=review, user=user, is_helpful=is_helpful):
+                    return "created"
+                if self._change_vote(review, user, is_helpful):
+                    return "changed"
+        raise IntegrityError("Could not record the vote; it kept changing")
+
+    def _change_vote(self, review: Review, user: CustomUser, is_helpful: bool) -> bool:
+        """
+        Flip the user's existing vote; return False if there is none.
+
+        The row is locked and saved as a model instance, so the post_save
+        receivers see the real row, and only when its value really changes.
+        """
+        vote = cast(
+            "ReviewHelpfulVote | None",
+            self.select_for_update().filter(review=review, user=user).first(),
+        )
+        if vote is None:
+            return False
+        if vote.is_helpful != is_helpful:
+            vote.is_helpful = is_helpful
+            vote.save(update_fields=["is_helpful", "updated_at"])
+        return True
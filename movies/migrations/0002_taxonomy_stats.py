@@ -0,0 +1,103 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Avg, Case, Count, FloatField, Q, When
+
+
+def backfill_stats(apps, schema_editor):
+    """Create a stats row for every existing director and series."""
+    MysteryTitle = apps.get_model("movies", "MysteryTitle")
+    Review = apps.get_model("movies", "Review")
+
+    for parent_name, stats_name, field in [
+        ("Director", "DirectorStats", "director"),
+        ("Series", "SeriesStats", "series"),
+    ]:
+        Parent = apps.get_model("movies", parent_name)
+        Stats = apps.get_model("movies", stats_name)
+
+        titles = {
+            row[field]: row
+            for row in MysteryTitle.objects.filter(**{f"{field}__isnull": False})
+            .values(field)
+            .annotate(
+                title_count=Count("pk"),
+                avg_quality=Avg("avg_quality", filter=Q(avg_quality__gt=0)),
+                avg_difficulty=Avg("avg_difficulty", filter=Q(avg_difficulty__gt=0)),
+            )
+            .order_by()
+        }
+        reviews = {
+            row[f"movie__{field}"]: row
+            for row in Review.objects.filter(**{f"movie__{field}__isnull": False})
+            .values(f"movie__{field}")
+            .annotate(
+                review_count=Count("pk"),
+                fair_play_pct=Avg(
+                    Case(
+                        When(is_fair_play=True, then=100.0),
+                        default=0.0,
+                        output_field=FloatField(),
+                    ),
+                ),
+            )
+            .order_by()
+        }
+
+        rows = []
+        for pk in Parent.objects.values_list("pk", flat=True):
+            title_row = titles.get(pk, {})
+            review_row = reviews.get(pk, {})
+            rows.append(
+                Stats(
+                    **{f"{field}_id": pk},
+                    title_count=title_row.get("title_count", 0),
+                    avg_quality=title_row.get("avg_quality") or 0.0,
+                    avg_difficulty=title_row.get("avg_difficulty") or 0.0,
+                    review_count=review_row.get("review_count", 0),
+                    fair_play_pct=review_row.get("fair_play_pct") or 0.0,
+                ),
+            )
+        Stats.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirectorStats',
+            fields=[
+                ('title_count', models.PositiveIntegerField(default=0)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('avg_quality', models.FloatField(default=0.0, verbose_name='Quality Score')),
+                ('avg_difficulty', models.FloatField(default=0.0, verbose_name='Difficulty Score')),
+                ('fair_play_pct', models.FloatField(default=0.0, help_text="Percentage of reviews across all titles that voted 'Fair'", verbose_name='Fair Play %')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('director', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='movies.director')),
+            ],
+            options={
+                'verbose_name_plural': 'director stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='SeriesStats',
+            fields=[
+                ('title_count', models.PositiveIntegerField(default=0)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('avg_quality', models.FloatField(default=0.0, verbose_name='Quality Score')),
+                ('avg_difficulty', models.FloatField(default=0.0, verbose_name='Difficulty Score')),
+                ('fair_play_pct', models.FloatField(default=0.0, help_text="Percentage of reviews across all titles that voted 'Fair'", verbose_name='Fair Play %')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('series', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='movies.series')),
+            ],
+            options={
+                'verbose_name_plural': 'series stats',
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
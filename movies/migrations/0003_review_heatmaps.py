@@ -0,0 +1,65 @@
+# Generated by Django 6.0.2 on 2026-10-19 08:17
+
+from collections import defaultdict
+
+import movies.heatmaps
+from django.db import migrations, models
+from django.db.models import Count
+from movies.heatmaps import empty_histogram, histogram_index, sum_histograms
+
+
+def backfill_heatmaps(apps, schema_editor):
+    """Fill in the histograms of existing titles and their directors and series."""
+    MysteryTitle = apps.get_model("movies", "MysteryTitle")
+    Review = apps.get_model("movies", "Review")
+
+    histograms = defaultdict(empty_histogram)
+    for row in Review.objects.values("movie", "quality", "difficulty").annotate(
+        count=Count("pk"),
+    ).order_by():
+        index = histogram_index(row["quality"], row["difficulty"])
+        histograms[row["movie"]][index] = row["count"]
+
+    movies = list(MysteryTitle.objects.only("pk", "director", "series"))
+    for movie in movies:
+        movie.review_histogram = histograms[movie.pk]
+    MysteryTitle.objects.bulk_update(movies, ["review_histogram"], batch_size=500)
+
+    for stats_name, field in [("DirectorStats", "director"), ("SeriesStats", "series")]:
+        Stats = apps.get_model("movies", stats_name)
+        by_parent = defaultdict(list)
+        for movie in movies:
+            parent_id = getattr(movie, f"{field}_id")
+            if parent_id is not None:
+                by_parent[parent_id].append(movie.review_histogram)
+
+        rows = list(Stats.objects.filter(pk__in=by_parent))
+        for row in rows:
+            row.heatmap = sum_histograms(by_parent[row.pk])
+        Stats.objects.bulk_update(rows, ["heatmap"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0002_taxonomy_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='directorstats',
+            name='heatmap',
+            field=models.JSONField(default=movies.heatmaps.empty_histogram, editable=False, help_text="Sum of the titles' review histograms"),
+        ),
+        migrations.AddField(
+            model_name='mysterytitle',
+            name='review_histogram',
+            field=models.JSONField(default=movies.heatmaps.empty_histogram, editable=False, help_text='Review counts per (quality, difficulty) pair'),
+        ),
+        migrations.AddField(
+            model_name='seriesstats',
+            name='heatmap',
+            field=models.JSONField(default=movies.heatmaps.empty_histogram, editable=False, help_text="Sum of the titles' review histograms"),
+        ),
+        migrations.RunPython(backfill_heatmaps, migrations.RunPython.noop),
+    ]
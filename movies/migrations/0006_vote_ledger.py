@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_counter_shards'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoteIntent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Tag vote'), (2, 'Helpful vote')])),
+                ('voter_id', models.BigIntegerField()),
+                ('target_id', models.BigIntegerField()),
+                ('tag_id', models.BigIntegerField(blank=True, null=True)),
+                ('value', models.BooleanField(null=True)),
+            ],
+            options={
+                'ordering': ['pk'],
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_reviewer_stats(apps, schema_editor):
+    """Create a stats row for every existing user."""
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Review = apps.get_model("movies", "Review")
+    ReviewerStats = apps.get_model("movies", "ReviewerStats")
+
+    reviews = {
+        row["user"]: row
+        for row in Review.objects.values("user")
+        .annotate(
+            review_count=Count("pk"),
+            quality_total=Sum("quality", default=0),
+            solved_count=Count("pk", filter=Q(solved=True)),
+            fair_play_count=Count("pk", filter=Q(is_fair_play=True)),
+            helpful_votes_received=Sum("helpful_count", default=0),
+        )
+        .order_by()
+    }
+    rows = []
+    for pk in User.objects.values_list("pk", flat=True):
+        row = reviews.get(pk, {})
+        rows.append(
+            ReviewerStats(
+                user_id=pk,
+                review_count=row.get("review_count", 0),
+                quality_total=row.get("quality_total", 0),
+                solved_count=row.get("solved_count", 0),
+                fair_play_count=row.get("fair_play_count", 0),
+                helpful_votes_received=row.get("helpful_votes_received", 0),
+            ),
+        )
+    ReviewerStats.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0006_vote_ledger'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewerStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='reviewer_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('quality_total', models.PositiveIntegerField(default=0, help_text='Sum of the quality ratings given')),
+                ('solved_count', models.PositiveIntegerField(default=0)),
+                ('fair_play_count', models.PositiveIntegerField(default=0)),
+                ('helpful_votes_received', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'reviewer stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='review_user_recent_idx'),
+        ),
+        migrations.RunPython(backfill_reviewer_stats, migrations.RunPython.noop),
+    ]
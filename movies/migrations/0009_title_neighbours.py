@@ -0,0 +1,40 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0008_activity_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaleNeighbourList',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Rated alike')])),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.mysterytitle')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('movie', 'kind'), name='unique_stale_neighbour_list')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TitleNeighbour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Rated alike')])),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbours', to='movies.mysterytitle')),
+                ('neighbour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.mysterytitle')),
+            ],
+            options={
+                'ordering': ['movie', 'kind', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('movie', 'kind', 'rank'), name='unique_title_neighbour_rank')],
+            },
+        ),
+    ]
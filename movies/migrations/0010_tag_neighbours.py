@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0009_title_neighbours'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='staleneighbourlist',
+            name='kind',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Rated alike'), (2, 'Tagged alike')]),
+        ),
+        migrations.AlterField(
+            model_name='titleneighbour',
+            name='kind',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Rated alike'), (2, 'Tagged alike')]),
+        ),
+    ]
@@ -1,20 +1,36 @@
 from .collection import Collection, CollectionItem
+from .counters import CounterShard
 from .director import Director
+from .feed import FeedEntry, Follow
+from .ledger import VoteIntent
 from .mystery import MysteryTitle
+from .neighbours import StaleNeighbourList, TitleNeighbour
+from .outbox import OutboxEvent
 from .review import Review, ReviewHelpfulVote
 from .series import Series
+from .stats import DirectorStats, ReviewerStats, SeriesStats
 from .tag import Tag, TagVote
 from .watchlist import WatchListEntry
 
 __all__ = [
     "Collection",
     "CollectionItem",
+    "CounterShard",
     "Director",
+    "DirectorStats",
+    "FeedEntry",
+    "Follow",
     "MysteryTitle",
+    "OutboxEvent",
     "Review",
     "ReviewHelpfulVote",
+    "ReviewerStats",
     "Series",
+    "SeriesStats",
+    "StaleNeighbourList",
     "Tag",
     "TagVote",
+    "TitleNeighbour",
+    "VoteIntent",
     "WatchListEntry",
 ]
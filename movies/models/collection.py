@@ -5,7 +5,7 @@ from django.conf import settings
 from django.db import models
 from django.urls import reverse
 
-from movies.managers import CollectionQuerySet
+from movies.managers import CollectionItemQuerySet, CollectionQuerySet
 
 from .mystery import MysteryTitle
 
@@ -56,6 +56,8 @@ class CollectionItem(models.Model):
     order = models.PositiveIntegerField(default=0)
     note = models.TextField(blank=True, help_text="Why is this movie in the list?")
 
+    objects = CollectionItemQuerySet.as_manager()
+
     class Meta:
         ordering = ["order", "id"]
         constraints = [
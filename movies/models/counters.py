@@ -0,0 +1,38 @@
+import logging
+
+from django.db import models
+
+from movies.managers import CounterShardQuerySet
+
+logger = logging.getLogger(__name__)
+
+
+class CounterShard(models.Model):
+    """
+    Pending increments to a denormalised counter of a frequently written row.
+
+    In the "sharded" COUNTER_MODE, writers add to one of COUNTER_SHARDS rows
+    per counter, picked at random, instead of updating the hot row itself.
+    Readers add the pending values to the row's stored ones, and the
+    fold_counters command moves them into the row (see movies.counters).
+    """
+
+    # Label of the counted model, e.g. "movies.review".
+    model = models.CharField(max_length=100)
+    object_id = models.PositiveBigIntegerField()
+    name = models.CharField(max_length=50)
+    shard = models.PositiveSmallIntegerField()
+    value = models.BigIntegerField(default=0)
+
+    objects = CounterShardQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["model", "object_id", "name", "shard"],
+                name="unique_counter_shard",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model} #{self.object_id} {self.name}[{self.shard}]"
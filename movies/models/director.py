@@ -3,6 +3,8 @@ import logging
 from django.db import models
 from django.urls import reverse
 
+from caching.querysets import CachedQuerySet
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,6 +15,8 @@ class Director(models.Model):
         help_text="URL friendly name (e.g. rian-johnson)",
     )
 
+    objects = CachedQuerySet.as_manager()
+
     class Meta:
         ordering = ["name"]
 
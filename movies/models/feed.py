@@ -0,0 +1,83 @@
+import logging
+
+from django.conf import settings
+from django.db import models
+
+from movies.managers import ToggleQuerySet
+
+from .review import Review
+
+logger = logging.getLogger(__name__)
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="following",
+    )
+    followee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="followers",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ToggleQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["follower", "followee"],
+                name="unique_follow",
+            ),
+            models.CheckConstraint(
+                condition=~models.Q(follower=models.F("followee")),
+                name="follow_not_self",
+            ),
+        ]
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.follower} follows {self.followee}"
+
+
+class FeedEntry(models.Model):
+    """
+    A review in the activity feed of one user.
+
+    Written when a followed user posts a review, so reading a feed is a range
+    scan over the owner's entries. ``created_at`` is the review's, copied
+    here so the scan needs no join to order the entries.
+    """
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="feed_entries",
+    )
+    review = models.ForeignKey(
+        Review,
+        on_delete=models.CASCADE,
+        related_name="feed_entries",
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "review"],
+                name="unique_feed_entry",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["owner", "-created_at", "-id"],
+                name="feed_owner_recent_idx",
+            ),
+        ]
+        ordering = ["-created_at", "-id"]
+        verbose_name_plural = "Feed entries"
+
+    def __str__(self) -> str:
+        return f"Review #{self.review_id} in {self.owner}'s feed"
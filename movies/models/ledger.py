@@ -0,0 +1,36 @@
+import logging
+
+from django.db import models
+
+logger = logging.getLogger(__name__)
+
+
+class VoteIntent(models.Model):
+    """
+    A tag or helpful vote as cast, appended to the vote ledger.
+
+    In the "ledger" VOTE_MODE votes are recorded here instead of in TagVote
+    and ReviewHelpfulVote, and the compact_votes command folds them into
+    those tables (see movies.ledger). Each row states the vote's outcome, so
+    the newest row for a vote wins. The table deliberately has no foreign
+    keys or secondary indexes, keeping an append to a single cheap insert.
+    """
+
+    class Kind(models.IntegerChoices):
+        TAG = 1, "Tag vote"
+        HELPFUL = 2, "Helpful vote"
+
+    kind = models.PositiveSmallIntegerField(choices=Kind.choices)
+    voter_id = models.BigIntegerField()
+    # The voted movie (tag votes) or review (helpful votes).
+    target_id = models.BigIntegerField()
+    tag_id = models.BigIntegerField(null=True, blank=True)
+    # Tag votes: whether the tag is voted. Helpful votes: is_helpful, or None
+    # once the vote is withdrawn.
+    value = models.BooleanField(null=True)
+
+    class Meta:
+        ordering = ["pk"]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()} #{self.pk}"
@@ -1,12 +1,21 @@
 import logging
+from collections.abc import Mapping
 from typing import TYPE_CHECKING
 
 from django.db import models
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from movies.heatmaps import (
+    HISTOGRAM_SIZE,
+    RATINGS,
+    empty_histogram,
+    histogram_index,
+)
 from movies.managers import MysteryTitleQuerySet
 
+from .outbox import AtomicSaveModel
+
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
@@ -16,7 +25,7 @@ if TYPE_CHECKING:
     from .watchlist import WatchListEntry
 
 
-class MysteryTitle(models.Model):
+class MysteryTitle(AtomicSaveModel):
     class MediaType(models.TextChoices):
         MOVIE = "MV", _("Movie")
         TV_SHOW = "TV", _("TV Show")
@@ -56,6 +65,9 @@ class MysteryTitle(models.Model):
         tag_votes: models.QuerySet[TagVote]
         watchlist_entries: models.QuerySet[WatchListEntry]
         collection_items: models.QuerySet[CollectionItem]
+        # (director_id, series_id) before the current save, set by a pre_save
+        # receiver so the old director's and series' stats can be refreshed.
+        _previous_taxonomy: tuple[int | None, int | None]
 
     is_fair_play_candidate = models.BooleanField(
         default=True,
@@ -70,6 +82,11 @@ class MysteryTitle(models.Model):
         verbose_name="Fair Play %",
         help_text="Percentage of users who voted 'Fair'",
     )
+    review_histogram = models.JSONField(
+        default=empty_histogram,
+        editable=False,
+        help_text="Review counts per (quality, difficulty) pair",
+    )
 
     objects = MysteryTitleQuerySet.as_manager()
 
@@ -100,11 +117,70 @@ class MysteryTitle(models.Model):
                     output_field=models.FloatField(),
                 ),
             ),
+            # The heatmap cells come from the same query.
+            **{
+                f"cell_{histogram_index(quality, difficulty)}": models.Count(
+                    "pk",
+                    filter=models.Q(quality=quality, difficulty=difficulty),
+                )
+                for difficulty in RATINGS
+                for quality in RATINGS
+            },
         )
         self.avg_quality = stats["avg_quality"] or 0.0
         self.avg_difficulty = stats["avg_difficulty"] or 0.0
         self.fair_play_consensus = stats["fair_play_consensus"] or 0.0
+        self.review_histogram = [stats[f"cell_{i}"] for i in range(HISTOGRAM_SIZE)]
 
         self.save(
-            update_fields=["avg_quality", "avg_difficulty", "fair_play_consensus"],
+            update_fields=[
+                "avg_quality",
+                "avg_difficulty",
+                "fair_play_consensus",
+                "review_histogram",
+            ],
         )
+
+    @staticmethod
+    def review_counter_deltas(
+        quality: int,
+        difficulty: int,
+        is_fair_play: bool,
+        sign: int = 1,
+    ) -> dict[str, int]:
+        """Sharded counter changes for adding (or, with sign -1, removing) a review."""
+        return {
+            f"histogram_{histogram_index(quality, difficulty)}": sign,
+            "fair_play": sign if is_fair_play else 0,
+        }
+
+    def apply_counter_deltas(self, deltas: Mapping[str, int]) -> list[str]:
+        """Add pending review counts (see movies.counters) to the aggregates."""
+        histogram = list(self.review_histogram or empty_histogram())
+        review_count = sum(histogram)
+        # The stored percentage is an exact fraction of the review count.
+        fair_play = round(self.fair_play_consensus * review_count / 100)
+
+        for index in range(HISTOGRAM_SIZE):
+            histogram[index] += deltas.get(f"histogram_{index}", 0)
+        fair_play += deltas.get("fair_play", 0)
+        review_count = sum(histogram)
+
+        cells = [
+            (quality, difficulty, histogram[histogram_index(quality, difficulty)])
+            for difficulty in RATINGS
+            for quality in RATINGS
+        ]
+        if review_count:
+            self.avg_quality = sum(q * count for q, _, count in cells) / review_count
+            self.avg_difficulty = sum(d * count for _, d, count in cells) / review_count
+            self.fair_play_consensus = fair_play * 100.0 / review_count
+        else:
+            self.avg_quality = self.avg_difficulty = self.fair_play_consensus = 0.0
+        self.review_histogram = histogram
+        return [
+            "avg_quality",
+            "avg_difficulty",
+            "fair_play_consensus",
+            "review_histogram",
+        ]
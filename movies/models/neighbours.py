@@ -0,0 +1,87 @@
+import logging
+
+from django.db import models
+
+from movies.managers import StaleNeighbourListQuerySet
+
+from .mystery import MysteryTitle
+
+logger = logging.getLogger(__name__)
+
+
+class TitleNeighbour(models.Model):
+    """
+    One of a title's precomputed most similar titles.
+
+    Rows are written by the offline recommendation jobs and read in rank
+    order, so a title's neighbours are one range scan of the unique index.
+    """
+
+    class Kind(models.IntegerChoices):
+        RATINGS = 1, "Rated alike"
+        TAGS = 2, "Tagged alike"
+
+    movie = models.ForeignKey(
+        MysteryTitle,
+        on_delete=models.CASCADE,
+        related_name="neighbours",
+    )
+    kind = models.PositiveSmallIntegerField(choices=Kind.choices)
+    rank = models.PositiveSmallIntegerField()
+    neighbour = models.ForeignKey(
+        MysteryTitle,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["movie", "kind", "rank"],
+                name="unique_title_neighbour_rank",
+            ),
+        ]
+        ordering = ["movie", "kind", "rank"]
+
+    def __str__(self) -> str:
+        return f"{self.neighbour} is #{self.rank} for {self.movie}"
+
+    @classmethod
+    def titles_for(
+        cls,
+        movie: MysteryTitle,
+        kind: int,
+        limit: int = 6,
+    ) -> list[MysteryTitle]:
+        """Return the ``limit`` titles most similar to ``movie``, best first."""
+        rows = (
+            cls.objects.filter(movie=movie, kind=kind)
+            .select_related("neighbour")
+            .order_by("rank")[:limit]
+        )
+        return [row.neighbour for row in rows]
+
+
+class StaleNeighbourList(models.Model):
+    """A title whose neighbours of ``kind`` must be recomputed."""
+
+    movie = models.ForeignKey(
+        MysteryTitle,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    kind = models.PositiveSmallIntegerField(choices=TitleNeighbour.Kind.choices)
+
+    objects = StaleNeighbourListQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["movie", "kind"],
+                name="unique_stale_neighbour_list",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Stale neighbours of {self.movie} ({self.get_kind_display()})"
@@ -0,0 +1,56 @@
+import logging
+from typing import Any
+
+from django.db import models, router, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxEvent(models.Model):
+    """
+    A side effect of a write, recorded in the same transaction as the write.
+
+    Rows are claimed and run by the run_worker command (see movies.outbox)
+    and deleted once their handler succeeds.
+    """
+
+    kind = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Failed events are retried with a backoff from this time on.
+    available_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # Lease of the worker processing the row; expired leases can be reclaimed.
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["pk"]
+        indexes = [
+            models.Index(fields=["available_at"], name="outbox_available_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} #{self.pk}"
+
+
+class AtomicSaveModel(models.Model):
+    """
+    Saves in one transaction with the post_save receivers they trigger.
+
+    Receivers in movies.signals enqueue side effects (movies.outbox); in
+    outbox mode the event row must commit together with the write, or a
+    crash between the two under autocommit loses the side effect. Deletes
+    need no such wrapper: Django already runs them and their post_delete
+    receivers in a transaction.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
@@ -1,14 +1,30 @@
 import logging
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, NamedTuple
 
 from django.conf import settings
 from django.db import models
 
+from movies.managers import ReviewHelpfulVoteQuerySet
+
 from .mystery import MysteryTitle
+from .outbox import AtomicSaveModel
 
 logger = logging.getLogger(__name__)
 
 
-class Review(models.Model):
+class ReviewRatings(NamedTuple):
+    """The parts of a review that its title's and author's counters count."""
+
+    movie_id: int
+    user_id: int
+    quality: int
+    difficulty: int
+    is_fair_play: bool
+    solved: bool
+
+
+class Review(AtomicSaveModel):
     movie = models.ForeignKey(
         MysteryTitle,
         on_delete=models.CASCADE,
@@ -44,6 +60,13 @@ class Review(models.Model):
         verbose_name="Not Helpful Votes",
     )
 
+    if TYPE_CHECKING:
+        # The ratings before the current save, set by a pre_save receiver
+        # so the counters can subtract them.
+        _previous_ratings: ReviewRatings | None
+        # The viewing user's vote, attached by the review list and detail views.
+        user_vote: ReviewHelpfulVote | None
+
     class Meta:
         ordering = ["-created_at"]
         constraints = [
@@ -52,6 +75,13 @@ class Review(models.Model):
                 name="unique_review_per_user",
             ),
         ]
+        indexes = [
+            # A user's reviews, newest first (profile pages).
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="review_user_recent_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.user}'s review of {self.movie}"
@@ -66,6 +96,28 @@ class Review(models.Model):
         self.not_helpful_count = stats["not_helpful"] or 0
         self.save(update_fields=["helpful_count", "not_helpful_count"])
 
+    @property
+    def ratings(self) -> ReviewRatings:
+        return ReviewRatings(
+            self.movie_id,
+            self.user_id,
+            self.quality,
+            self.difficulty,
+            self.is_fair_play,
+            self.solved,
+        )
+
+    @staticmethod
+    def helpful_counter(is_helpful: bool) -> str:
+        """Name of the sharded counter (see movies.counters) a vote adds to."""
+        return "helpful_count" if is_helpful else "not_helpful_count"
+
+    def apply_counter_deltas(self, deltas: Mapping[str, int]) -> list[str]:
+        """Add pending helpful votes (see movies.counters) to the counts."""
+        self.helpful_count += deltas.get("helpful_count", 0)
+        self.not_helpful_count += deltas.get("not_helpful_count", 0)
+        return ["helpful_count", "not_helpful_count"]
+
     @property
     def helpfulness_score(self) -> float:
         """Calculate a helpfulness percentage (0-100)."""
@@ -75,7 +127,7 @@ class Review(models.Model):
         return (self.helpful_count / total) * 100
 
 
-class ReviewHelpfulVote(models.Model):
+class ReviewHelpfulVote(AtomicSaveModel):
     """
     Tracks whether a user found a review helpful or not.
     Each user can vote once per review.
@@ -96,6 +148,8 @@ class ReviewHelpfulVote(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ReviewHelpfulVoteQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
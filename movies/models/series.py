@@ -4,6 +4,8 @@ from typing import TYPE_CHECKING
 from django.db import models
 from django.urls import reverse
 
+from caching.querysets import CachedQuerySet
+
 from .mystery import MysteryTitle
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,8 @@ class Series(models.Model):
         help_text="URL friendly name (e.g. benoit-blanc)",
     )
 
+    objects = CachedQuerySet.as_manager()
+
     if TYPE_CHECKING:
         movies: models.QuerySet[MysteryTitle]
 
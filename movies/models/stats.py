@@ -0,0 +1,222 @@
+import logging
+from collections.abc import Mapping
+from typing import Any, ClassVar
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Avg, Count, F, Q, Sum
+from django.utils import timezone
+
+from caching.querysets import CachedQuerySet
+from movies.heatmaps import empty_histogram, sum_histograms
+
+from .director import Director
+from .feed import Follow
+from .mystery import MysteryTitle
+from .review import Review
+from .series import Series
+
+logger = logging.getLogger(__name__)
+
+
+class TaxonomyStats(models.Model):
+    """
+    Aggregates over the titles of a director or series.
+
+    Rows are refreshed by the movies.signals receivers whenever one of the
+    titles (and so its review aggregates) changes, so list and detail pages
+    can read them instead of aggregating on every request.
+    """
+
+    title_count = models.PositiveIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    avg_quality = models.FloatField(default=0.0, verbose_name="Quality Score")
+    avg_difficulty = models.FloatField(default=0.0, verbose_name="Difficulty Score")
+    fair_play_pct = models.FloatField(
+        default=0.0,
+        verbose_name="Fair Play %",
+        help_text="Percentage of reviews across all titles that voted 'Fair'",
+    )
+    heatmap = models.JSONField(
+        default=empty_histogram,
+        editable=False,
+        help_text="Sum of the titles' review histograms",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Name of the MysteryTitle foreign key the rows aggregate over.
+    movie_field: ClassVar[str]
+
+    objects = CachedQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def compute(cls, pk: int) -> dict[str, Any]:
+        """
+        Aggregate the titles of the director or series ``pk``.
+
+        Review totals come from the titles' stored review histograms and
+        fair play consensus, so no review rows are read.
+        """
+        movies = MysteryTitle.objects.filter(**{f"{cls.movie_field}_id": pk})
+        titles = movies.aggregate(
+            title_count=Count("pk"),
+            # Titles without any rating yet are left out of the averages.
+            avg_quality=Avg("avg_quality", filter=Q(avg_quality__gt=0)),
+            avg_difficulty=Avg("avg_difficulty", filter=Q(avg_difficulty__gt=0)),
+        )
+        histograms = []
+        review_count = fair_play = 0
+        for histogram, consensus in movies.values_list(
+            "review_histogram",
+            "fair_play_consensus",
+        ):
+            count = sum(histogram or ())
+            histograms.append(histogram)
+            review_count += count
+            fair_play += round(consensus * count / 100)
+        return {
+            "title_count": titles["title_count"],
+            "avg_quality": titles["avg_quality"] or 0.0,
+            "avg_difficulty": titles["avg_difficulty"] or 0.0,
+            "review_count": review_count,
+            "fair_play_pct": fair_play * 100.0 / review_count if review_count else 0.0,
+            "heatmap": sum_histograms(histograms),
+        }
+
+    @classmethod
+    def refresh(cls, pk: int) -> None:
+        """Recompute and store the stats row of the director or series ``pk``."""
+        lookup: dict[str, Any] = {f"{cls.movie_field}_id": pk}
+        cls.objects.update_or_create(defaults=cls.compute(pk), **lookup)
+        logger.debug("Refreshed %s for %s", cls.__name__, pk)
+
+
+class DirectorStats(TaxonomyStats):
+    director = models.OneToOneField(
+        Director,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+
+    movie_field = "director"
+
+    class Meta:
+        verbose_name_plural = "director stats"
+
+    def __str__(self) -> str:
+        return f"Stats for {self.director}"
+
+
+class SeriesStats(TaxonomyStats):
+    series = models.OneToOneField(
+        Series,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+
+    movie_field = "series"
+
+    class Meta:
+        verbose_name_plural = "series stats"
+
+    def __str__(self) -> str:
+        return f"Stats for {self.series}"
+
+
+class ReviewerStats(models.Model):
+    """
+    Totals over a user's reviews and followers, shown on their profile.
+
+    Rows are kept current incrementally: the movies.signals receivers add
+    each review's, helpful vote's and follow's change with a single UPDATE of
+    F() expressions, so the profile never aggregates the reviews. Rows are
+    created with the user; ``refresh`` recomputes one from scratch.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="reviewer_stats",
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    quality_total = models.PositiveIntegerField(
+        default=0,
+        help_text="Sum of the quality ratings given",
+    )
+    solved_count = models.PositiveIntegerField(default=0)
+    fair_play_count = models.PositiveIntegerField(default=0)
+    helpful_votes_received = models.PositiveIntegerField(default=0)
+    follower_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CachedQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = "reviewer stats"
+
+    def __str__(self) -> str:
+        return f"Reviewer stats for {self.user}"
+
+    def _rate(self, count: int) -> float:
+        return count * 100.0 / self.review_count if self.review_count else 0.0
+
+    @property
+    def avg_quality(self) -> float:
+        if not self.review_count:
+            return 0.0
+        return self.quality_total / self.review_count
+
+    @property
+    def solve_rate(self) -> float:
+        return self._rate(self.solved_count)
+
+    @property
+    def fair_play_rate(self) -> float:
+        return self._rate(self.fair_play_count)
+
+    @staticmethod
+    def review_deltas(
+        quality: int,
+        solved: bool,
+        is_fair_play: bool,
+        sign: int = 1,
+    ) -> dict[str, int]:
+        """Changes for adding (or, with sign -1, removing) one review."""
+        return {
+            "review_count": sign,
+            "quality_total": sign * quality,
+            "solved_count": sign if solved else 0,
+            "fair_play_count": sign if is_fair_play else 0,
+        }
+
+    @classmethod
+    def add(cls, deltas: Mapping[str, int], **lookup: Any) -> None:
+        """Add ``deltas`` to the rows matching ``lookup`` in one UPDATE."""
+        changes = {name: F(name) + delta for name, delta in deltas.items() if delta}
+        if changes:
+            cls.objects.filter(**lookup).update(**changes, updated_at=timezone.now())
+
+    @classmethod
+    def compute(cls, user_id: int) -> dict[str, Any]:
+        """Aggregate the reviews of user ``user_id``."""
+        stats = Review.objects.filter(user_id=user_id).aggregate(
+            review_count=Count("pk"),
+            quality_total=Sum("quality", default=0),
+            solved_count=Count("pk", filter=Q(solved=True)),
+            fair_play_count=Count("pk", filter=Q(is_fair_play=True)),
+            helpful_votes_received=Sum("helpful_count", default=0),
+        )
+        stats["follower_count"] = Follow.objects.filter(followee_id=user_id).count()
+        return dict(stats)
+
+    @classmethod
+    def refresh(cls, user_id: int) -> None:
+        """Recompute and store the stats row of user ``user_id``."""
+        cls.objects.update_or_create(defaults=cls.compute(user_id), user_id=user_id)
+        logger.debug("Refreshed ReviewerStats for %s", user_id)
@@ -1,9 +1,14 @@
 import logging
+from typing import TYPE_CHECKING
 
 from django.conf import settings
 from django.db import models
 
+from caching.querysets import CachedQuerySet
+from movies.managers import TagVoteQuerySet
+
 from .mystery import MysteryTitle
+from .outbox import AtomicSaveModel
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +18,12 @@ class Tag(models.Model):
     slug = models.SlugField(unique=True)
     description = models.CharField(max_length=255, blank=True)
 
+    objects = CachedQuerySet.as_manager()
+
+    if TYPE_CHECKING:
+        # Set by MysteryDetailView for the tags shown on a title.
+        vote_count: int
+
     class Meta:
         ordering = ["name"]
 
@@ -20,7 +31,7 @@ class Tag(models.Model):
         return self.name
 
 
-class TagVote(models.Model):
+class TagVote(AtomicSaveModel):
     movie = models.ForeignKey(
         MysteryTitle,
         on_delete=models.CASCADE,
@@ -29,6 +40,8 @@ class TagVote(models.Model):
     tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="votes")
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
+    objects = TagVoteQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
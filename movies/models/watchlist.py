@@ -3,12 +3,15 @@ import logging
 from django.conf import settings
 from django.db import models
 
+from movies.managers import ToggleQuerySet
+
 from .mystery import MysteryTitle
+from .outbox import AtomicSaveModel
 
 logger = logging.getLogger(__name__)
 
 
-class WatchListEntry(models.Model):
+class WatchListEntry(AtomicSaveModel):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -21,6 +24,8 @@ class WatchListEntry(models.Model):
     )
     added_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ToggleQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -0,0 +1,129 @@
+"""
+Transactional outbox for the side effects of model signals.
+
+Receivers in movies.signals describe their work as an event (a kind plus a
+JSON payload of ids) and pass it to ``enqueue``. With the default
+SIDE_EFFECTS_MODE of "inline" the event's handler runs right away, inside
+the request. With "outbox" the event is stored as an OutboxEvent row in the
+transaction of the write that caused it, and the run_worker command runs
+the handlers later, so a request no longer waits for aggregates to be
+recomputed. The models whose receivers enqueue events save atomically
+(movies.models.outbox.AtomicSaveModel), as Django already deletes, so a
+write never commits without its events.
+
+Workers claim batches by leasing rows (``locked_by``/``locked_until``),
+which works on every backend; where the database supports it the claim
+also uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers never
+contend for the same rows. Identical events in a batch are handled once.
+"""
+
+import json
+import logging
+import uuid
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from movies.models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+INLINE = "inline"
+OUTBOX = "outbox"
+
+# Events failing this many times are left in the table for inspection.
+MAX_ATTEMPTS = 5
+# Retry delays grow as 2 ** attempts seconds, up to this many seconds.
+MAX_BACKOFF = 300
+
+Handler = Callable[[dict[str, Any]], None]
+
+_handlers: dict[str, Handler] = {}
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    """Register the function that performs events of ``kind``."""
+
+    def register(func: Handler) -> Handler:
+        _handlers[kind] = func
+        return func
+
+    return register
+
+
+def enqueue(kind: str, **payload: Any) -> None:
+    """Run, or record for a worker to run, the side effect ``kind``."""
+    if kind not in _handlers:
+        raise ValueError(f"No handler registered for outbox events of kind {kind!r}")
+    if getattr(settings, "SIDE_EFFECTS_MODE", INLINE) == OUTBOX:
+        OutboxEvent.objects.create(kind=kind, payload=payload)
+    else:
+        _handlers[kind](payload)
+
+
+def claim_batch(limit: int, lease: timedelta) -> list[OutboxEvent]:
+    """Lease up to ``limit`` pending events to this worker and return them."""
+    now = timezone.now()
+    claimable = Q(available_at__lte=now, attempts__lt=MAX_ATTEMPTS) & (
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    )
+    worker = uuid.uuid4().hex
+
+    with transaction.atomic():
+        pending = OutboxEvent.objects.filter(claimable).order_by("pk")
+        if connection.features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True)
+        ids = list(pending.values_list("pk", flat=True)[:limit])
+        # The condition is checked again by the UPDATE, so of two workers
+        # that read the same ids (no SKIP LOCKED) only the first claims them.
+        OutboxEvent.objects.filter(claimable, pk__in=ids).update(
+            locked_by=worker,
+            locked_until=now + lease,
+        )
+    return list(OutboxEvent.objects.filter(locked_by=worker))
+
+
+def process_batch(limit: int = 100, lease: timedelta = timedelta(minutes=1)) -> int:
+    """
+    Run the handlers of up to ``limit`` pending events.
+
+    Returns the number of events claimed. Events whose handler succeeds are
+    deleted; failed ones are released to be retried after a backoff.
+    """
+    events = claim_batch(limit, lease)
+
+    groups: dict[tuple[str, str], list[OutboxEvent]] = {}
+    for event in events:
+        key = (event.kind, json.dumps(event.payload, sort_keys=True))
+        groups.setdefault(key, []).append(event)
+
+    for (kind, _), group in groups.items():
+        ids = [event.pk for event in group]
+        try:
+            with transaction.atomic():
+                _handlers[kind](group[0].payload)
+                OutboxEvent.objects.filter(pk__in=ids).delete()
+        except Exception as exc:
+            logger.exception("Outbox event %s failed", group[0])
+            _release_failed(ids, exc)
+
+    if events:
+        logger.debug("Processed %s outbox events", len(events))
+    return len(events)
+
+
+def _release_failed(ids: list[int], exc: Exception) -> None:
+    for event in OutboxEvent.objects.filter(pk__in=ids):
+        delay = min(2 ** (event.attempts + 1), MAX_BACKOFF)
+        OutboxEvent.objects.filter(pk=event.pk).update(
+            attempts=F("attempts") + 1,
+            last_error=repr(exc),
+            available_at=timezone.now() + timedelta(seconds=delay),
+            locked_by="",
+            locked_until=None,
+        )
@@ -0,0 +1,132 @@
+"""
+Predicted ratings for the signed-in user, from the factors of train_factors.
+
+A prediction is the dot product of the user's and the title's factor rows
+plus their biases, read from the memory-mapped factor file
+(movies.factor_store). The file is opened once per process and reopened
+only when the trainer has replaced it, so a request does no more than a
+few array lookups and, for recommendations, one matrix-vector product over
+every title.
+
+NumPy is optional (the "ml" dependency group, which the Docker image
+installs): without it there are no predictions and a warning is logged
+whenever a new factor file appears; before the first training run there are
+simply none.
+"""
+
+import logging
+import threading
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+
+if TYPE_CHECKING:
+    from movies.factor_store import Factors
+
+logger = logging.getLogger(__name__)
+
+MIN_RATING = 1.0
+MAX_RATING = 5.0
+
+_lock = threading.Lock()
+_loaded: tuple[tuple[int, int] | None, Factors | None] = (None, None)
+
+
+def _factors() -> Factors | None:
+    """Return the current factors, reopening the file if it was replaced."""
+    global _loaded
+    try:
+        stat = settings.FACTORS_PATH.stat()
+    except FileNotFoundError:
+        return None
+    version = (stat.st_ino, stat.st_mtime_ns)
+    if _loaded[0] == version:
+        return _loaded[1]
+    with _lock:
+        if _loaded[0] != version:
+            try:
+                # Imported here so the site runs without NumPy.
+                from movies import factor_store
+            except ImportError:
+                logger.warning(
+                    "NumPy is not installed (the 'ml' dependency group); ignoring %s",
+                    settings.FACTORS_PATH,
+                )
+                factors = None
+            else:
+                try:
+                    factors = factor_store.load(settings.FACTORS_PATH)
+                except ValueError:
+                    logger.exception("Ignoring %s", settings.FACTORS_PATH)
+                    factors = None
+            _loaded = (version, factors)
+        return _loaded[1]
+
+
+def _rows(ids: Any, wanted: list[int]) -> tuple[Any, Any]:
+    """Return the rows of ``wanted`` in the sorted ``ids`` and which were found."""
+    rows = ids.searchsorted(wanted).clip(0, max(len(ids) - 1, 0))
+    found = ids[rows] == wanted if len(ids) else rows < 0
+    return rows, found
+
+
+def _user_row(factors: Factors, user_id: int) -> int | None:
+    rows, found = _rows(factors.arrays["user_ids"], [user_id])
+    return int(rows[0]) if found[0] else None
+
+
+def predict(user_id: int, movie_ids: list[int]) -> dict[int, float]:
+    """
+    Predict the user's rating of each title, keyed by movie id.
+
+    Only users and titles that had reviews when the model was trained get a
+    prediction: a title's baseline alone says nothing personal.
+    """
+    factors = _factors()
+    if factors is None or not movie_ids:
+        return {}
+    user = _user_row(factors, user_id)
+    if user is None:
+        return {}
+    arrays = factors.arrays
+    rows, found = _rows(arrays["movie_ids"], movie_ids)
+    rows = rows[found]
+    scores = (
+        factors.global_mean
+        + arrays["user_bias"][user]
+        + arrays["movie_bias"][rows]
+        + arrays["movie_factors"][rows] @ arrays["user_factors"][user]
+    ).clip(MIN_RATING, MAX_RATING)
+    found_ids = arrays["movie_ids"][rows]
+    return {
+        int(movie_id): round(float(score), 1)
+        for movie_id, score in zip(found_ids, scores, strict=True)
+    }
+
+
+def recommend(user_id: int, limit: int, exclude: set[int]) -> list[int]:
+    """
+    Return the ids of the ``limit`` titles with the highest predicted rating.
+
+    Titles in ``exclude`` (typically the ones the user reviewed) are skipped.
+    Users the model has not seen get the best titles by baseline.
+    """
+    factors = _factors()
+    if factors is None or limit <= 0:
+        return []
+    arrays = factors.arrays
+    movie_ids = arrays["movie_ids"]
+    scores = arrays["movie_bias"].astype("float64")
+    user = _user_row(factors, user_id)
+    if user is not None:
+        scores += arrays["movie_factors"] @ arrays["user_factors"][user]
+    if exclude:
+        rows, found = _rows(movie_ids, sorted(exclude))
+        scores[rows[found]] = -float("inf")
+
+    count = min(limit, int((scores > -float("inf")).sum()))
+    if count == 0:
+        return []
+    best = (-scores).argpartition(count - 1)[:count]
+    best = best[(-scores[best]).argsort(kind="stable")]
+    return [int(movie_id) for movie_id in movie_ids[best]]
@@ -1,40 +1,333 @@
 import logging
+from collections import Counter
 from typing import Any
 
-from django.core.cache import cache
-from django.core.cache.utils import make_template_fragment_key
-from django.db.models.signals import post_delete, post_save
+from django.db import models
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from caching.tags import (
+    director_tag,
+    invalidate_tags,
+    movie_tag,
+    series_tag,
+    user_tag,
+)
+from movies import counters, feed
 from movies.models import (
     Director,
+    DirectorStats,
+    Follow,
     MysteryTitle,
     Review,
+    ReviewerStats,
     ReviewHelpfulVote,
     Series,
+    SeriesStats,
+    StaleNeighbourList,
     Tag,
     TagVote,
+    TitleNeighbour,
     WatchListEntry,
 )
+from movies.models.review import ReviewRatings
+from movies.outbox import enqueue, handler
+from movies.snapshots import director_snapshot, series_snapshot, tag_snapshot
+from users.models import CustomUser
 
 logger = logging.getLogger(__name__)
 
+# Review columns maintained by update_helpful_stats, which leave the movie's
+# aggregates unchanged.
+HELPFUL_FIELDS = frozenset({"helpful_count", "not_helpful_count"})
+
+
+def _describe(model: type[models.Model], pk: int, field: str = "") -> str:
+    """Name a row for a log message, even if it has been deleted since."""
+    obj = model._default_manager.filter(pk=pk).first()
+    if obj is None:
+        return f"{model.__name__} #{pk}"
+    return str(getattr(obj, field) if field else obj)
+
 
 @receiver(post_save, sender=Review)
 @receiver(post_delete, sender=Review)
-def update_movie_stats(sender: type[Review], instance: Review, **kwargs: Any) -> None:
+def update_movie_stats(
+    sender: type[Review],
+    instance: Review,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+) -> None:
+    """Queue the refresh of the aggregates and caches built from the reviews."""
+    if update_fields is not None and update_fields <= HELPFUL_FIELDS:
+        return
+    enqueue("review.changed", movie_id=instance.movie_id, user_id=instance.user_id)
+
+
+@handler("review.changed")
+def refresh_review_aggregates(payload: dict[str, Any]) -> None:
     """
-    Update aggregate statistics and invalidate heatmap cache.
+    Update aggregate statistics and invalidate caches built from the reviews.
     """
-    # 1. Update DB Aggregates
-    instance.movie.update_stats()
+    # 1. Update DB Aggregates (with sharded counters, count_review_ratings
+    # already has and the title's row is left alone).
+    movie = MysteryTitle.objects.filter(pk=payload["movie_id"]).first()
+    if movie is not None and not counters.is_sharded():
+        movie.update_stats()
+
+    # 2. Invalidate everything cached for this movie (e.g. the heatmap fragment)
+    # and for the reviewer.
+    invalidate_tags(movie_tag(payload["movie_id"]), user_tag(payload["user_id"]))
+
+    logger.info("Invalidated review caches for movie: %s", payload["movie_id"])
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_ratings(
+    sender: type[Review],
+    instance: Review,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+) -> None:
+    """Remember a review's ratings before it is saved, for the counters."""
+    instance._previous_ratings = None
+    if instance.pk is None:
+        return
+    if update_fields is not None and update_fields <= HELPFUL_FIELDS:
+        return
+    row = (
+        Review.objects.filter(pk=instance.pk)
+        .values_list(*ReviewRatings._fields)
+        .first()
+    )
+    instance._previous_ratings = ReviewRatings(*row) if row else None
+
+
+def _rating_changes(
+    instance: Review,
+    update_fields: frozenset[str] | None,
+    signal: object,
+) -> list[tuple[ReviewRatings, int]]:
+    """Ratings a review save or delete removed (-1) and added (+1)."""
+    if update_fields is not None and update_fields <= HELPFUL_FIELDS:
+        return []
+    if signal is post_delete:
+        return [(instance.ratings, -1)]
+    changes = [(instance.ratings, 1)]
+    if previous := getattr(instance, "_previous_ratings", None):
+        changes.append((previous, -1))
+    return changes
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def count_review_ratings(
+    sender: type[Review],
+    instance: Review,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+) -> None:
+    """Add a review's change to its title's sharded counters."""
+    if not counters.is_sharded():
+        return
+    deltas: dict[int, Counter[str]] = {}
+    for ratings, sign in _rating_changes(instance, update_fields, kwargs["signal"]):
+        deltas.setdefault(ratings.movie_id, Counter()).update(
+            MysteryTitle.review_counter_deltas(
+                ratings.quality,
+                ratings.difficulty,
+                ratings.is_fair_play,
+                sign,
+            ),
+        )
+    for movie_id, movie_deltas in deltas.items():
+        counters.increment(MysteryTitle, movie_id, movie_deltas)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def count_reviewer_stats(
+    sender: type[Review],
+    instance: Review,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+) -> None:
+    """Add a review's change to its author's stats row."""
+    deltas: dict[int, Counter[str]] = {}
+    for ratings, sign in _rating_changes(instance, update_fields, kwargs["signal"]):
+        deltas.setdefault(ratings.user_id, Counter()).update(
+            ReviewerStats.review_deltas(
+                ratings.quality,
+                ratings.solved,
+                ratings.is_fair_play,
+                sign,
+            ),
+        )
+    for user_id, user_deltas in deltas.items():
+        ReviewerStats.add(user_deltas, user_id=user_id)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def flag_stale_neighbours(
+    sender: type[Review],
+    instance: Review,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+) -> None:
+    """Flag titles whose ratings changed for the next neighbour build."""
+    changes = _rating_changes(instance, update_fields, kwargs["signal"])
+    rated = {(ratings.movie_id, ratings.quality) for ratings, _ in changes}
+    if len(changes) == 2 and len(rated) == 1:
+        # Edited without changing the rating.
+        return
+    StaleNeighbourList.objects.mark(
+        TitleNeighbour.Kind.RATINGS,
+        {movie_id for movie_id, _ in rated},
+    )
+
+
+@receiver(pre_save, sender=MysteryTitle)
+def remember_movie_taxonomy(
+    sender: type[MysteryTitle],
+    instance: MysteryTitle,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+) -> None:
+    """Remember the director and series a title had before it is saved."""
+    instance._previous_taxonomy = (None, None)
+    if instance.pk is None:
+        return
+    if update_fields is not None and not {"director", "series"} & update_fields:
+        # Only the stats changed (e.g. update_stats); nothing was reassigned.
+        return
+    instance._previous_taxonomy = (
+        MysteryTitle.objects.filter(pk=instance.pk)
+        .values_list("director_id", "series_id")
+        .first()
+    ) or (None, None)
+
+
+@receiver(post_save, sender=MysteryTitle)
+@receiver(post_delete, sender=MysteryTitle)
+def refresh_taxonomy_stats(
+    sender: type[MysteryTitle],
+    instance: MysteryTitle,
+    **kwargs: Any,
+) -> None:
+    """Queue the refresh of the title's director and series stats (old and new)."""
+    previous_director, previous_series = getattr(
+        instance,
+        "_previous_taxonomy",
+        (None, None),
+    )
+    director_ids = {instance.director_id, previous_director} - {None}
+    series_ids = {instance.series_id, previous_series} - {None}
+    if director_ids or series_ids:
+        enqueue(
+            "taxonomy.refresh",
+            director_ids=sorted(director_ids),
+            series_ids=sorted(series_ids),
+        )
+
+
+@handler("taxonomy.refresh")
+def refresh_stats_rows(payload: dict[str, Any]) -> None:
+    """Recompute the stats rows of the given directors and series."""
+    for director_id in payload["director_ids"]:
+        DirectorStats.refresh(director_id)
+    for series_id in payload["series_ids"]:
+        SeriesStats.refresh(series_id)
+    # The charts read their averages from these rows. In outbox mode the
+    # title's own save invalidated them before the refresh, so a chart built
+    # in between would otherwise keep the old averages under the new tag.
+    invalidate_tags(
+        *map(director_tag, payload["director_ids"]),
+        *map(series_tag, payload["series_ids"]),
+    )
+
+
+@receiver(post_save, sender=Director)
+def create_director_stats(
+    sender: type[Director],
+    instance: Director,
+    created: bool,
+    **kwargs: Any,
+) -> None:
+    """Give every new director an (empty) stats row for the list page."""
+    if created:
+        DirectorStats.objects.get_or_create(director=instance)
+
+
+@receiver(post_save, sender=Series)
+def create_series_stats(
+    sender: type[Series],
+    instance: Series,
+    created: bool,
+    **kwargs: Any,
+) -> None:
+    """Give every new series an (empty) stats row for the list page."""
+    if created:
+        SeriesStats.objects.get_or_create(series=instance)
+
+
+@receiver(post_save, sender=CustomUser)
+def create_reviewer_stats(
+    sender: type[CustomUser],
+    instance: CustomUser,
+    created: bool,
+    **kwargs: Any,
+) -> None:
+    """Give every new user an (empty) stats row for their profile."""
+    if created:
+        ReviewerStats.objects.get_or_create(user=instance)
+
 
-    # 2. Invalidate Heatmap Cache
-    # Key must match the arguments used in the template: 'heatmap' and [movie.pk]
-    key = make_template_fragment_key("heatmap", [instance.movie.pk])
-    cache.delete(key)
+@receiver(post_save, sender=MysteryTitle)
+@receiver(post_delete, sender=MysteryTitle)
+def invalidate_movie_caches(
+    sender: type[MysteryTitle],
+    instance: MysteryTitle,
+    **kwargs: Any,
+) -> None:
+    """Invalidate caches that depend on a movie's own fields."""
+    tags = [movie_tag(instance.pk)]
+    if instance.director_id:
+        tags.append(director_tag(instance.director_id))
+    if instance.series_id:
+        tags.append(series_tag(instance.series_id))
+    invalidate_tags(*tags)
 
-    logger.info("Invalidated heatmap cache for movie: %s", instance.movie.slug)
+
+@receiver(post_save, sender=Director)
+@receiver(post_delete, sender=Director)
+def invalidate_director_caches(
+    sender: type[Director],
+    instance: Director,
+    **kwargs: Any,
+) -> None:
+    """Invalidate caches that show a director's details."""
+    invalidate_tags(director_tag(instance.pk))
+    director_snapshot.invalidate()
+
+
+@receiver(post_save, sender=Series)
+@receiver(post_delete, sender=Series)
+def invalidate_series_caches(
+    sender: type[Series],
+    instance: Series,
+    **kwargs: Any,
+) -> None:
+    """Invalidate caches that show a series' details."""
+    invalidate_tags(series_tag(instance.pk))
+    series_snapshot.invalidate()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_snapshot(sender: type[Tag], instance: Tag, **kwargs: Any) -> None:
+    """Reload the in-memory list of tags after one changes."""
+    tag_snapshot.invalidate()
 
 
 @receiver(post_save, sender=MysteryTitle)
@@ -58,8 +351,20 @@ def log_review_creation(
 ) -> None:
     """Log a message whenever a new review is created."""
     if created:
-        # Uses the Review's __str__ method: "{user}'s review of {movie}"
-        logger.info("Review created: %s for %s", instance.user, instance.movie.slug)
+        enqueue(
+            "review.created",
+            user_id=instance.user_id,
+            movie_id=instance.movie_id,
+        )
+
+
+@handler("review.created")
+def log_created_review(payload: dict[str, Any]) -> None:
+    logger.info(
+        "Review created: %s for %s",
+        _describe(CustomUser, payload["user_id"]),
+        _describe(MysteryTitle, payload["movie_id"], "slug"),
+    )
 
 
 @receiver(post_save, sender=ReviewHelpfulVote)
@@ -72,16 +377,24 @@ def update_review_helpful_stats_on_save(
     """
     Update review helpful statistics when a vote is created or updated.
     """
-    instance.review.update_helpful_stats()
-
-    if created:
-        vote_type = "helpful" if instance.is_helpful else "not helpful"
-        logger.info(
-            "Helpful vote created: %s voted %s on review by %s",
-            instance.user,
-            vote_type,
-            instance.review.user,
-        )
+    # Votes only ever change by flipping to the other side.
+    received = 1 if instance.is_helpful else 0 if created else -1
+    ReviewerStats.add(
+        {"helpful_votes_received": received},
+        user__review=instance.review_id,
+    )
+    if counters.is_sharded():
+        deltas = {Review.helpful_counter(instance.is_helpful): 1}
+        if not created:
+            deltas[Review.helpful_counter(not instance.is_helpful)] = -1
+        counters.increment(Review, instance.review_id, deltas)
+    enqueue(
+        "review.helpful_vote",
+        review_id=instance.review_id,
+        voter_id=instance.user_id,
+        action="created" if created else "changed",
+        is_helpful=instance.is_helpful,
+    )
 
 
 @receiver(post_delete, sender=ReviewHelpfulVote)
@@ -93,13 +406,53 @@ def update_review_helpful_stats_on_delete(
     """
     Update review helpful statistics when a vote is deleted.
     """
-    instance.review.update_helpful_stats()
+    if instance.is_helpful:
+        ReviewerStats.add(
+            {"helpful_votes_received": -1},
+            user__review=instance.review_id,
+        )
+    if counters.is_sharded():
+        counters.increment(
+            Review,
+            instance.review_id,
+            {Review.helpful_counter(instance.is_helpful): -1},
+        )
+    enqueue(
+        "review.helpful_vote",
+        review_id=instance.review_id,
+        voter_id=instance.user_id,
+        action="removed",
+        is_helpful=instance.is_helpful,
+    )
 
-    logger.info(
-        "Helpful vote removed: %s removed vote from review by %s",
-        instance.user,
-        instance.review.user,
+
+@handler("review.helpful_vote")
+def recount_helpful_votes(payload: dict[str, Any]) -> None:
+    """Recount a review's helpful votes and log the vote."""
+    review = (
+        Review.objects.select_related("user").filter(pk=payload["review_id"]).first()
     )
+    if review is None:
+        # Removed along with the review itself.
+        return
+    if not counters.is_sharded():
+        review.update_helpful_stats()
+
+    voter = _describe(CustomUser, payload["voter_id"])
+    if payload["action"] == "created":
+        vote_type = "helpful" if payload["is_helpful"] else "not helpful"
+        logger.info(
+            "Helpful vote created: %s voted %s on review by %s",
+            voter,
+            vote_type,
+            review.user,
+        )
+    elif payload["action"] == "removed":
+        logger.info(
+            "Helpful vote removed: %s removed vote from review by %s",
+            voter,
+            review.user,
+        )
 
 
 @receiver(post_save, sender=Director)
@@ -147,11 +500,12 @@ def log_tag_vote_creation(
 ) -> None:
     """Log a message whenever a new tag vote is created."""
     if created:
-        logger.info(
-            "Tag vote created: %s voted for %s on %s",
-            instance.user,
-            instance.tag.slug,
-            instance.movie.slug,
+        enqueue(
+            "tag_vote.logged",
+            action="created",
+            user_id=instance.user_id,
+            tag_id=instance.tag_id,
+            movie_id=instance.movie_id,
         )
 
 
@@ -162,11 +516,34 @@ def log_tag_vote_deletion(
     **kwargs: Any,
 ) -> None:
     """Log a message whenever a tag vote is deleted."""
+    enqueue(
+        "tag_vote.logged",
+        action="removed",
+        user_id=instance.user_id,
+        tag_id=instance.tag_id,
+        movie_id=instance.movie_id,
+    )
+
+
+@receiver(post_save, sender=TagVote)
+@receiver(post_delete, sender=TagVote)
+def flag_stale_tag_neighbours(
+    sender: type[TagVote],
+    instance: TagVote,
+    **kwargs: Any,
+) -> None:
+    """Flag a title whose tag votes changed for the next neighbour build."""
+    StaleNeighbourList.objects.mark(TitleNeighbour.Kind.TAGS, {instance.movie_id})
+
+
+@handler("tag_vote.logged")
+def log_tag_vote(payload: dict[str, Any]) -> None:
     logger.info(
-        "Tag vote removed: %s voted for %s on %s",
-        instance.user,
-        instance.tag.slug,
-        instance.movie.slug,
+        "Tag vote %s: %s voted for %s on %s",
+        payload["action"],
+        _describe(CustomUser, payload["user_id"]),
+        _describe(Tag, payload["tag_id"], "slug"),
+        _describe(MysteryTitle, payload["movie_id"], "slug"),
     )
 
 
@@ -179,10 +556,11 @@ def log_watchlist_entry_creation(
 ) -> None:
     """Log a message whenever a new watchlist entry is created."""
     if created:
-        logger.info(
-            "Watchlist entry created: %s added %s to watchlist",
-            instance.user,
-            instance.movie.slug,
+        enqueue(
+            "watchlist.logged",
+            action="added",
+            user_id=instance.user_id,
+            movie_id=instance.movie_id,
         )
 
 
@@ -193,8 +571,72 @@ def log_watchlist_entry_deletion(
     **kwargs: Any,
 ) -> None:
     """Log a message whenever a watchlist entry is deleted."""
-    logger.info(
-        "Watchlist entry removed: %s removed %s from watchlist",
-        instance.user,
-        instance.movie.slug,
+    enqueue(
+        "watchlist.logged",
+        action="removed",
+        user_id=instance.user_id,
+        movie_id=instance.movie_id,
     )
+
+
+@handler("watchlist.logged")
+def log_watchlist_change(payload: dict[str, Any]) -> None:
+    user = _describe(CustomUser, payload["user_id"])
+    movie = _describe(MysteryTitle, payload["movie_id"], "slug")
+    if payload["action"] == "added":
+        logger.info("Watchlist entry created: %s added %s to watchlist", user, movie)
+    else:
+        logger.info(
+            "Watchlist entry removed: %s removed %s from watchlist",
+            user,
+            movie,
+        )
+
+
+@receiver(post_save, sender=Review)
+def fan_out_review(
+    sender: type[Review],
+    instance: Review,
+    created: bool,
+    **kwargs: Any,
+) -> None:
+    """Queue adding a new review to the feeds of its author's followers."""
+    if created:
+        enqueue("feed.fan_out", review_id=instance.pk)
+
+
+@handler("feed.fan_out")
+def fan_out_to_feeds(payload: dict[str, Any]) -> None:
+    review = Review.objects.filter(pk=payload["review_id"]).first()
+    if review is not None:
+        feed.fan_out(review)
+
+
+@handler("feed.trim")
+def trim_feeds(payload: dict[str, Any]) -> None:
+    feed.trim(payload["owner_ids"])
+
+
+@receiver(post_save, sender=Follow)
+def follow_added(
+    sender: type[Follow],
+    instance: Follow,
+    created: bool,
+    **kwargs: Any,
+) -> None:
+    """Count the new follower and fill their feed with the followee's reviews."""
+    if not created:
+        return
+    ReviewerStats.add({"follower_count": 1}, user_id=instance.followee_id)
+    feed.followed(instance.follower_id, instance.followee_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_removed(
+    sender: type[Follow],
+    instance: Follow,
+    **kwargs: Any,
+) -> None:
+    """Uncount the follower and drop the followee's reviews from their feed."""
+    ReviewerStats.add({"follower_count": -1}, user_id=instance.followee_id)
+    feed.unfollowed(instance.follower_id, instance.followee_id)
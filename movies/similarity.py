@@ -0,0 +1,147 @@
+"""
+Storing the output of the offline "similar titles" jobs.
+
+Each job (movies.collaborative for ratings, movies.tag_similarity for tag
+votes) computes rows of a title x title similarity matrix; ``rebuild`` keeps
+the top SIMILAR_TITLES of each row as TitleNeighbour rows of the job's kind.
+
+Builds are incremental by default. Writes that change a title's data flag it
+in StaleNeighbourList, and only those titles' rows are computed. Because the
+similarity is symmetric, the same rows also hold every other title's score
+against them, which is merged into the other titles' stored lists. Changes
+that move shared weights (a reviewer's mean rating, a tag's document
+frequency) shift other pairs slightly; a periodic ``full`` build recomputes
+everything.
+
+Imports NumPy, so only the build_similar_titles command imports this module.
+"""
+
+import logging
+from collections.abc import Callable
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from numpy.typing import NDArray
+
+from movies.models import StaleNeighbourList, TitleNeighbour
+from movies.vectors import top_k
+
+logger = logging.getLogger(__name__)
+
+Neighbours = list[tuple[int, float]]
+# Given the ids of the titles to compute (None for all), returns the ids of
+# every title with data, the indexes of the computed ones among them, and
+# their similarity rows.
+Compute = Callable[
+    [set[int] | None],
+    tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.float64]],
+]
+
+
+def similar_titles() -> int:
+    return int(getattr(settings, "SIMILAR_TITLES", 10))
+
+
+def rebuild(kind: int, compute: Compute, full: bool = False) -> int:
+    """
+    Recompute the neighbours of ``kind``; returns the number of titles rewritten.
+    """
+    stale = list(
+        StaleNeighbourList.objects.filter(kind=kind).values_list("pk", "movie_id"),
+    )
+    if not full and not stale:
+        return 0
+
+    movie_ids, rows, similarity = compute(
+        None if full else {movie_id for _, movie_id in stale},
+    )
+    best, scores = top_k(similarity, similar_titles())
+    lists: dict[int, Neighbours] = {
+        int(movie_ids[row]): [
+            (int(movie_ids[col]), float(score))
+            for col, score in zip(best[i], scores[i], strict=True)
+            if col >= 0
+        ]
+        for i, row in enumerate(rows)
+    }
+    if not full:
+        # Titles left without data have no neighbours any more.
+        for _, movie_id in stale:
+            lists.setdefault(movie_id, [])
+        lists.update(_merge_rows(kind, movie_ids, rows, similarity, set(lists)))
+
+    with transaction.atomic():
+        existing = TitleNeighbour.objects.filter(kind=kind)
+        if not full:
+            existing = existing.filter(movie_id__in=lists)
+        existing.delete()
+        TitleNeighbour.objects.bulk_create(
+            [
+                TitleNeighbour(
+                    movie_id=movie_id,
+                    kind=kind,
+                    rank=rank,
+                    neighbour_id=neighbour_id,
+                    score=score,
+                )
+                for movie_id, neighbours in lists.items()
+                for rank, (neighbour_id, score) in enumerate(neighbours, 1)
+            ],
+            batch_size=1000,
+        )
+        StaleNeighbourList.objects.filter(pk__in=[pk for pk, _ in stale]).delete()
+
+    logger.info(
+        "Rebuilt the %s neighbours of %s titles",
+        TitleNeighbour.Kind(kind).label,
+        len(lists),
+    )
+    return len(lists)
+
+
+def _merge_rows(
+    kind: int,
+    movie_ids: NDArray[np.int64],
+    rows: NDArray[np.int64],
+    similarity: NDArray[np.float64],
+    recomputed: set[int],
+) -> dict[int, Neighbours]:
+    """Update the stored lists of other titles with the recomputed rows."""
+    fresh: dict[int, dict[int, float]] = {}
+    for i, col in zip(*np.nonzero(similarity > 0), strict=True):
+        movie_id = int(movie_ids[col])
+        if movie_id not in recomputed:
+            fresh.setdefault(movie_id, {})[int(movie_ids[rows[i]])] = float(
+                similarity[i, col],
+            )
+
+    # Lists that mention a recomputed title may have to drop it.
+    listing = TitleNeighbour.objects.filter(
+        kind=kind,
+        neighbour_id__in=recomputed,
+    ).values_list("movie_id", flat=True)
+    stored: dict[int, Neighbours] = {}
+    for movie_id, neighbour_id, score in (
+        TitleNeighbour.objects.filter(kind=kind)
+        .exclude(movie_id__in=recomputed)
+        .filter(movie_id__in=set(fresh) | set(listing))
+        .order_by("movie_id", "rank")
+        .values_list("movie_id", "neighbour_id", "score")
+    ):
+        stored.setdefault(movie_id, []).append((neighbour_id, score))
+
+    merged: dict[int, Neighbours] = {}
+    for movie_id in set(fresh) | set(stored):
+        current = stored.get(movie_id, [])
+        candidates = {
+            neighbour_id: score
+            for neighbour_id, score in current
+            if neighbour_id not in recomputed
+        }
+        candidates.update(fresh.get(movie_id, {}))
+        ranked = sorted(candidates.items(), key=lambda item: -item[1])
+        ranked = ranked[: similar_titles()]
+        if ranked != current:
+            merged[movie_id] = ranked
+    return merged
@@ -0,0 +1,25 @@
+"""
+In-memory snapshots of the small lookup tables.
+
+Tags, directors and series are tiny and rarely edited, so forms and views
+resolve them from these snapshots instead of querying on every request. The
+receivers in movies.signals invalidate them whenever a row changes.
+"""
+
+from collections.abc import Iterable
+
+from caching.snapshots import ModelSnapshot
+from movies.models import Director, MysteryTitle, Series, Tag
+
+tag_snapshot = ModelSnapshot(Tag)
+director_snapshot = ModelSnapshot(Director)
+series_snapshot = ModelSnapshot(Series)
+
+
+def attach_taxonomy(movies: Iterable[MysteryTitle]) -> None:
+    """Fill in each title's director and series from the snapshots."""
+    for movie in movies:
+        if movie.director_id and (director := director_snapshot.get(movie.director_id)):
+            movie.director = director
+        if movie.series_id and (series := series_snapshot.get(movie.series_id)):
+            movie.series = series
@@ -1,25 +1,25 @@
 document.addEventListener("DOMContentLoaded", function () {
-  const plotDataScript = document.getElementById("plot-data");
-  const avgDiffScript = document.getElementById("avg-difficulty");
-  const avgQualScript = document.getElementById("avg-quality");
+  const ctx = document.getElementById("taxonomyChart");
+  if (!ctx || !ctx.dataset.chartUrl) return;
 
-  if (!plotDataScript || !avgDiffScript || !avgQualScript) return;
+  // The chart data is served as cacheable JSON; the browser revalidates it
+  // with the ETag once its max-age has passed.
+  fetch(ctx.dataset.chartUrl, { headers: { Accept: "application/json" } })
+    .then((response) => {
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      return response.json();
+    })
+    .then((data) => drawChart(ctx, data))
+    .catch((e) => console.error("Error loading chart data:", e));
+});
 
-  let plotData, avgDiff, avgQual;
-  try {
-    plotData = JSON.parse(plotDataScript.textContent);
-    avgDiff = JSON.parse(avgDiffScript.textContent);
-    avgQual = JSON.parse(avgQualScript.textContent);
-  } catch (e) {
-    console.error("Error parsing chart data from DOM:", e);
-    return;
-  }
+function drawChart(ctx, data) {
+  const plotData = data.plot_data;
+  const avgDiff = data.avg_difficulty;
+  const avgQual = data.avg_quality;
 
   if (plotData.length === 0) return;
 
-  const ctx = document.getElementById("taxonomyChart");
-  if (!ctx) return;
-
   // Custom plugin to draw average lines
   const averageLinesPlugin = {
     id: "averageLines",
@@ -72,8 +72,11 @@ document.addEventListener("DOMContentLoaded", function () {
           backgroundColor: "rgba(54, 162, 235, 0.6)",
           borderColor: "rgba(54, 162, 235, 1)",
           borderWidth: 1,
-          pointRadius: 6,
-          pointHoverRadius: 8,
+          // Binned points grow with the number of titles they stand for.
+          pointRadius: (context) =>
+            6 + Math.min(Math.sqrt(context.raw.count || 1) - 1, 8),
+          pointHoverRadius: (context) =>
+            8 + Math.min(Math.sqrt(context.raw.count || 1) - 1, 8),
         },
       ],
     },
@@ -131,4 +134,4 @@ document.addEventListener("DOMContentLoaded", function () {
     },
     plugins: [averageLinesPlugin],
   });
-});
+}
@@ -0,0 +1,65 @@
+"""
+Content-based "similar mysteries" from the community's tag votes.
+
+Each title is described by its vote count per tag ("locked room",
+"unreliable narrator", ...). ``build`` turns the counts into L2-normalised
+TF-IDF vectors (movies.vectors.tfidf), so that the cosine similarity of two
+titles is a dot product, and stores each title's top neighbours through
+movies.similarity, incrementally for the titles whose votes changed unless
+``full`` is set. The tag list is small and curated, so the title x tag
+matrix is kept dense.
+
+Imports NumPy, so only the build_similar_titles command imports this module.
+"""
+
+import logging
+
+import numpy as np
+from django.db.models import Count
+from numpy.typing import NDArray
+
+from movies import similarity
+from movies.models import TagVote, TitleNeighbour
+from movies.vectors import tfidf
+
+logger = logging.getLogger(__name__)
+
+KIND = TitleNeighbour.Kind.TAGS
+
+
+def load_tag_counts() -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+    """Return the ids of the tagged titles and their title x tag vote counts."""
+    rows = (
+        TagVote.objects.order_by()
+        .values_list("movie_id", "tag_id")
+        .annotate(votes=Count("pk"))
+        .iterator(chunk_size=10_000)
+    )
+    data = np.fromiter(
+        rows,
+        dtype=[("movie", np.int64), ("tag", np.int64), ("votes", np.float64)],
+    )
+    movie_ids, movies = np.unique(data["movie"], return_inverse=True)
+    tag_ids, tags = np.unique(data["tag"], return_inverse=True)
+    counts = np.zeros((len(movie_ids), len(tag_ids)))
+    counts[movies, tags] = data["votes"]
+    return movie_ids, counts
+
+
+def _similarities(
+    stale: set[int] | None,
+) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.float64]]:
+    movie_ids, counts = load_tag_counts()
+    vectors = tfidf(counts)
+    if stale is None:
+        rows = np.arange(len(movie_ids))
+    else:
+        rows = np.flatnonzero(np.isin(movie_ids, list(stale)))
+    scores = vectors[rows] @ vectors.T
+    scores[np.arange(len(rows)), rows] = 0.0
+    return movie_ids, rows, scores
+
+
+def build(full: bool = False) -> int:
+    """Recompute the tag-based neighbours; returns the titles rewritten."""
+    return similarity.rebuild(KIND, _similarities, full)
@@ -1,36 +1,83 @@
+from collections.abc import Iterable
 from typing import Any
 
 from django import template
-from django.db.models import Count
+from django.template.defaultfilters import floatformat
+from django.template.loader import get_template
+from django.utils.html import format_html
+from django.utils.safestring import SafeString, mark_safe
 
+from caching.tags import director_tag, get_or_set_many, movie_tag
+from movies.heatmaps import heatmap_grid
 from movies.models import MysteryTitle
 
 register = template.Library()
 
+# Cards are invalidated through their movie and director cache tags.
+CARD_CACHE_TIMEOUT = 60 * 60 * 24
+# Marks where a card takes the viewer's predicted rating.
+PREDICTION_SLOT = "<!-- prediction -->"
+
 
 @register.simple_tag
-def get_review_heatmap(movie: MysteryTitle) -> dict[str, Any]:
-    data = movie.reviews.values("quality", "difficulty").annotate(count=Count("id"))
-    counts = {(d["quality"], d["difficulty"]): d["count"] for d in data}
-
-    max_count = max(counts.values()) if counts else 0
-
-    rows = []
-    # Difficulty 5 down to 1
-    for difficulty in range(5, 0, -1):
-        cells = []
-        # Quality 1 to 5
-        for quality in range(1, 6):
-            count = counts.get((quality, difficulty), 0)
-            intensity = (count / max_count) if max_count > 0 else 0
-            cells.append(
+def render_movie_cards(
+    movies: Iterable[MysteryTitle],
+    predicted_ratings: dict[int, float] | None = None,
+) -> SafeString:
+    """
+    Render the card of each title, reusing cached HTML where possible.
+
+    A card is keyed by its movie's and director's cache tags, so it is
+    re-rendered only after one of them changes. Cached cards are fetched in
+    one batch and only the misses are rendered, with their mini heatmaps
+    read in one query. Cards are shared by every user; the viewer's
+    ``predicted_ratings`` (by movie id) are filled into each card's
+    PREDICTION_SLOT afterwards.
+    """
+    movies_by_key = {f"movie-card:{movie.pk}": movie for movie in movies}
+    entries = {
+        key: [movie_tag(movie.pk)]
+        + ([director_tag(movie.director_id)] if movie.director_id else [])
+        for key, movie in movies_by_key.items()
+    }
+
+    def render_cards(keys: list[str]) -> dict[str, str]:
+        card = get_template("movies/includes/movie_card.html")
+        heatmaps = get_review_heatmaps([movies_by_key[key].pk for key in keys])
+        return {
+            key: card.render(
                 {
-                    "quality": quality,
-                    "difficulty": difficulty,
-                    "count": count,
-                    "intensity": intensity,
+                    "movie": movies_by_key[key],
+                    "heatmap": heatmaps.get(movies_by_key[key].pk),
                 },
             )
-        rows.append({"difficulty": difficulty, "cells": cells})
+            for key in keys
+        }
+
+    cards = get_or_set_many(entries, render_cards, CARD_CACHE_TIMEOUT)
+    predicted_ratings = predicted_ratings or {}
+    html = []
+    for key, movie in movies_by_key.items():
+        prediction = ""
+        if movie.pk in predicted_ratings:
+            prediction = format_html(
+                '<div class="small text-primary mt-2">'
+                "You'd probably rate this {}</div>",
+                floatformat(predicted_ratings[movie.pk], 1),
+            )
+        html.append(cards[key].replace(PREDICTION_SLOT, prediction, 1))
+    # Each card was rendered by the (autoescaping) template engine.
+    return mark_safe("".join(html))  # nosec B308 B703
 
-    return {"rows": rows, "max_count": max_count}
+
+@register.simple_tag
+def get_review_heatmap(movie: MysteryTitle) -> dict[str, Any]:
+    """Return the heatmap rows of a title's stored review histogram."""
+    return heatmap_grid(movie.review_histogram)
+
+
+@register.simple_tag
+def get_review_heatmaps(movie_ids: Iterable[int]) -> dict[int, dict[str, Any]]:
+    """Return the heatmap rows of many titles, keyed by pk, from one query."""
+    histograms = MysteryTitle.objects.filter(pk__in=list(movie_ids)).review_histograms()
+    return {pk: heatmap_grid(histogram) for pk, histogram in histograms.items()}
@@ -0,0 +1,129 @@
+import importlib.util
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from config.tests.factories import MovieFactory, ReviewFactory, UserFactory
+from movies.models import MysteryTitle, StaleNeighbourList, TitleNeighbour
+from users.models import CustomUser
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy (the 'ml' dependency group) is not installed")
+class VectorTests(TestCase):
+    def test_cooccurrence_matches_dense_product(self) -> None:
+        """Test that the pairwise sums equal X^T X, in full and for some rows."""
+        import numpy as np
+
+        from movies import vectors
+
+        rng = np.random.default_rng(0)
+        cells = np.unique(rng.integers(0, 30 * 12, 150))
+        users, items = cells // 12, cells % 12
+        values = rng.integers(1, 6, len(cells)).astype(np.float64)
+        dense = np.zeros((30, 12))
+        dense[users, items] = values
+
+        dot, count = vectors.cooccurrence(users, items, values, 12)
+        np.testing.assert_allclose(dot, dense.T @ dense)
+        rated = (dense > 0).astype(np.float64)
+        np.testing.assert_allclose(count, rated.T @ rated)
+
+        rows = np.array([2, 5])
+        dot, _ = vectors.cooccurrence(users, items, values, 12, rows)
+        np.testing.assert_allclose(dot, (dense.T @ dense)[rows])
+
+    def test_similarities_do_not_depend_on_the_block_size(self) -> None:
+        """Test that computing a few rows at a time gives the same matrix."""
+        import numpy as np
+
+        from movies import vectors
+
+        rng = np.random.default_rng(1)
+        cells = np.unique(rng.integers(0, 30 * 12, 150))
+        users, items = cells // 12, cells % 12
+        ratings = rng.integers(1, 6, len(cells)).astype(np.float64)
+
+        whole = vectors.item_similarities(users, items, ratings, 30, 12)
+        with patch.object(vectors, "MAX_CELLS", 12 * 5):
+            blocked = vectors.item_similarities(users, items, ratings, 30, 12)
+        np.testing.assert_allclose(blocked, whole)
+
+    def test_top_k_drops_non_positive_scores(self) -> None:
+        """Test that neighbours are sorted and unrelated columns are left out."""
+        import numpy as np
+
+        from movies import vectors
+
+        best, scores = vectors.top_k(np.array([[0.1, 0.0, 0.5, -0.2]]), 3)
+        self.assertEqual(best.tolist(), [[2, 0, -1]])
+        self.assertEqual(scores[0, :2].tolist(), [0.5, 0.1])
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy (the 'ml' dependency group) is not installed")
+class BuildSimilarTitlesTests(TestCase):
+    def setUp(self) -> None:
+        self.movies = [MovieFactory.create() for _ in range(4)]
+        self.users = [UserFactory.create()[0] for _ in range(4)]
+        # Everyone who likes 0 likes 1 and dislikes 2, and vice versa.
+        for user, (q0, q1, q2) in zip(
+            self.users,
+            [(5, 5, 1), (5, 4, 1), (1, 1, 5), (1, 2, 4)],
+            strict=True,
+        ):
+            self.rate(user, 0, q0)
+            self.rate(user, 1, q1)
+            self.rate(user, 2, q2)
+
+    def rate(self, user: CustomUser, movie: int, quality: int) -> None:
+        ReviewFactory.create(user=user, movie=self.movies[movie], quality=quality)
+
+    def neighbours(self, movie: int) -> list[MysteryTitle]:
+        return TitleNeighbour.titles_for(
+            self.movies[movie],
+            TitleNeighbour.Kind.RATINGS,
+        )
+
+    def test_full_build_stores_neighbours(self) -> None:
+        """Test that titles rated alike become each other's neighbours."""
+        out = StringIO()
+        call_command("build_similar_titles", "--full", stdout=out)
+
+        self.assertEqual(self.neighbours(0), [self.movies[1]])
+        self.assertEqual(self.neighbours(1), [self.movies[0]])
+        self.assertEqual(self.neighbours(2), [])
+        self.assertFalse(StaleNeighbourList.objects.exists())
+        self.assertIn("Rebuilt ratings neighbours of 3 titles", out.getvalue())
+
+    def test_incremental_build_updates_other_lists(self) -> None:
+        """Test that a new title is merged into the lists it now belongs to."""
+        from movies import collaborative
+
+        collaborative.build(full=True)
+        for user, quality in zip(self.users, [5, 5, 1, 1], strict=True):
+            self.rate(user, 3, quality)
+        self.assertEqual(
+            list(StaleNeighbourList.objects.values_list("movie_id", flat=True)),
+            [self.movies[3].pk],
+        )
+
+        collaborative.build()
+
+        self.assertEqual(set(self.neighbours(3)), {self.movies[0], self.movies[1]})
+        self.assertIn(self.movies[3], self.neighbours(0))
+        self.assertFalse(StaleNeighbourList.objects.exists())
+        # Nothing is stale any more, so the next build has no work.
+        self.assertEqual(collaborative.build(), 0)
+
+    def test_detail_page_shows_neighbours(self) -> None:
+        """Test that the title page lists the stored neighbours."""
+        call_command("build_similar_titles", "--full", stdout=StringIO())
+
+        response = self.client.get(self.movies[0].get_absolute_url())
+
+        self.assertContains(response, "Readers who liked this also liked")
+        self.assertEqual(response.context["rated_alike"], [self.movies[1]])
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 
@@ -7,6 +8,7 @@ from movies.models import Collection, CollectionItem
 
 class CollectionTests(TestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.user, self.upass = UserFactory.create()
         self.uname = self.user.get_username()
         self.movie = MovieFactory.create()
@@ -193,3 +195,48 @@ class CollectionTests(TestCase):
         self.assertEqual(response.status_code, 403)
         item.refresh_from_db()
         self.assertNotEqual(item.note, "Hacked note")
+
+    def test_add_item_view_appends_in_order(self) -> None:
+        """Test that adding movies places each one after the current last item."""
+        second_movie = MovieFactory.create()
+        self.client.login(username=self.uname, password=self.upass)
+
+        for movie in (self.movie, second_movie):
+            response = self.client.post(
+                reverse(
+                    "movies:collection_add_item",
+                    kwargs={"pk": self.collection.pk, "movie_slug": movie.slug},
+                ),
+            )
+            self.assertRedirects(response, movie.get_absolute_url())
+
+        orders = list(
+            self.collection.items.order_by("order").values_list("movie_id", "order"),
+        )
+        self.assertEqual(orders, [(self.movie.pk, 0), (second_movie.pk, 1)])
+
+    def test_add_item_view_rejects_duplicate(self) -> None:
+        """Test that adding the same movie twice leaves a single item."""
+        self.client.login(username=self.uname, password=self.upass)
+        url = reverse(
+            "movies:collection_add_item",
+            kwargs={"pk": self.collection.pk, "movie_slug": self.movie.slug},
+        )
+
+        self.client.post(url)
+        response = self.client.post(url, follow=True)
+
+        self.assertEqual(self.collection.items.count(), 1)
+        self.assertContains(response, "is already in My Favorites")
+
+    def test_detail_dropdown_flags_existing_membership(self) -> None:
+        """Test that the detail page marks collections already holding the movie."""
+        CollectionItem.objects.create(collection=self.collection, movie=self.movie)
+        other = CollectionFactory.create(name="Watch Later", user=self.user)
+        self.client.login(username=self.uname, password=self.upass)
+
+        response = self.client.get(self.movie.get_absolute_url())
+
+        flags = {c.pk: c.contains_movie for c in response.context["user_collections"]}
+        self.assertEqual(flags, {self.collection.pk: True, other.pk: False})
+        self.assertContains(response, "Already in this collection")
@@ -0,0 +1,73 @@
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+
+from caching import stampede
+from config.tests.factories import MovieFactory, ReviewFactory, UserFactory
+
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "warm-caches-tests",
+    },
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class WarmCachesCommandTests(TransactionTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        stampede.reset_stats()
+        user, _ = UserFactory.create()
+        self.popular = MovieFactory.create(title="Popular")
+        ReviewFactory.create(user=user, movie=self.popular)
+        self.quiet = MovieFactory.create(title="Quiet")
+
+    def test_warms_heatmaps_and_charts(self) -> None:
+        """Test that heatmaps and taxonomy charts are computed ahead of requests."""
+        out = StringIO()
+        call_command("warm_caches", "--workers", "2", stdout=out)
+
+        # Two heatmaps plus a director and a series chart for each title.
+        self.assertIn("Warmed 6 cache entries", out.getvalue())
+        self.assertEqual(stampede.stats()["miss"], 6)
+
+        # A page view now finds its heatmap already cached.
+        self.client.get(self.popular.get_absolute_url())
+        self.assertEqual(stampede.stats()["hit"], 1)
+
+    def test_limit_picks_most_reviewed_titles(self) -> None:
+        """Test that --limit keeps only the most-reviewed titles."""
+        out = StringIO()
+        call_command("warm_caches", "--limit", "1", stdout=out)
+
+        # The popular title's heatmap plus its director and series charts.
+        self.assertIn("Warmed 3 cache entries", out.getvalue())
+
+    def test_budget_stops_scheduling(self) -> None:
+        """Test that nothing new is waited on once the time budget is spent."""
+        out = StringIO()
+        call_command("warm_caches", "--budget", "0", stdout=out)
+
+        self.assertIn("Warmed 0 cache entries", out.getvalue())
+
+    def test_budget_abandons_running_tasks(self) -> None:
+        """Test that a task still running when the budget is spent is not awaited."""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        tasks = [("stuck", release.wait)]
+        out = StringIO()
+        started = time.monotonic()
+        with mock.patch(
+            "movies.management.commands.warm_caches.Command._build_tasks",
+            return_value=tasks,
+        ):
+            call_command("warm_caches", "--budget", "0.2", stdout=out)
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertIn("Warmed 0 cache entries (0 failed, 1 unfinished)", out.getvalue())
@@ -0,0 +1,136 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from config.tests.factories import MovieFactory, ReviewFactory, UserFactory
+from movies import counters
+from movies.models import CounterShard, MysteryTitle, Review, ReviewHelpfulVote
+
+
+@override_settings(COUNTER_MODE="sharded", COUNTER_SHARDS=4)
+class ShardedReviewStatsTests(TestCase):
+    def setUp(self) -> None:
+        self.movie = MovieFactory.create()
+        self.users = [UserFactory.create()[0] for _ in range(3)]
+
+    def expected_stats(self) -> tuple[float, float, float, list[int]]:
+        """Recompute the title's aggregates from its reviews, as direct mode does."""
+        movie = MysteryTitle.objects.get(pk=self.movie.pk)
+        movie.update_stats()
+        return (
+            movie.avg_quality,
+            movie.avg_difficulty,
+            movie.fair_play_consensus,
+            movie.review_histogram,
+        )
+
+    def stats(self, movie: MysteryTitle) -> tuple[float, float, float, list[int]]:
+        return (
+            movie.avg_quality,
+            movie.avg_difficulty,
+            movie.fair_play_consensus,
+            movie.review_histogram,
+        )
+
+    def test_reviews_are_counted_on_shards(self) -> None:
+        """Test that reviews leave the title's row alone until folded."""
+        ReviewFactory.create(user=self.users[0], movie=self.movie, quality=5)
+        ReviewFactory.create(
+            user=self.users[1],
+            movie=self.movie,
+            quality=2,
+            difficulty=1,
+            is_fair_play=False,
+        )
+
+        stored = MysteryTitle.objects.get(pk=self.movie.pk)
+        self.assertEqual(stored.avg_quality, 0.0)
+        self.assertTrue(
+            CounterShard.objects.filter(model="movies.mysterytitle").exists(),
+        )
+
+        counters.with_pending([stored])
+        self.assertEqual(self.stats(stored), self.expected_stats())
+
+    def test_fold_applies_edits_and_deletions(self) -> None:
+        """Test that folding leaves the same aggregates as a full recompute."""
+        reviews = [
+            ReviewFactory.create(user=user, movie=self.movie, quality=quality)
+            for user, quality in zip(self.users, [5, 3, 1], strict=True)
+        ]
+        reviews[0].quality = 2
+        reviews[0].is_fair_play = False
+        reviews[0].save()
+        reviews[1].delete()
+
+        self.assertEqual(counters.fold(), 1)
+
+        self.assertFalse(CounterShard.objects.exists())
+        stored = MysteryTitle.objects.get(pk=self.movie.pk)
+        self.assertEqual(self.stats(stored), self.expected_stats())
+        self.assertEqual(sum(stored.review_histogram), 2)
+
+    def test_detail_page_includes_pending_counts(self) -> None:
+        """Test that the detail page shows totals that have not been folded yet."""
+        ReviewFactory.create(user=self.users[0], movie=self.movie, quality=5)
+
+        response = self.client.get(self.movie.get_absolute_url())
+
+        self.assertEqual(response.context["movie"].avg_quality, 5.0)
+
+
+@override_settings(COUNTER_MODE="sharded", COUNTER_SHARDS=4)
+class ShardedHelpfulCountTests(TestCase):
+    def setUp(self) -> None:
+        author, _ = UserFactory.create()
+        self.review = ReviewFactory.create(user=author, movie=MovieFactory.create())
+        self.voters = [UserFactory.create()[0] for _ in range(3)]
+
+    def test_votes_are_spread_over_shards(self) -> None:
+        """Test that votes go to shard rows and read back as exact totals."""
+        shards = iter([0, 1, 2, 2])
+        with mock.patch("movies.counters.random.randrange", lambda n: next(shards)):
+            for voter in self.voters:
+                ReviewHelpfulVote.objects.cast_vote(self.review, voter, True)
+            # Changing a vote moves it between the two counters.
+            ReviewHelpfulVote.objects.cast_vote(self.review, self.voters[0], False)
+
+        rows = CounterShard.objects.filter(model="movies.review")
+        self.assertEqual(set(rows.values_list("shard", flat=True)), {0, 1, 2})
+        self.assertEqual(Review.objects.get(pk=self.review.pk).helpful_count, 0)
+
+        review = Review.objects.get(pk=self.review.pk)
+        counters.with_pending([review])
+        self.assertEqual((review.helpful_count, review.not_helpful_count), (2, 1))
+
+    def test_fold_command(self) -> None:
+        """Test that fold_counters moves the pending votes into the review."""
+        for voter in self.voters:
+            ReviewHelpfulVote.objects.cast_vote(self.review, voter, True)
+        ReviewHelpfulVote.objects.cast_vote(self.review, self.voters[0], True)
+
+        out = StringIO()
+        call_command("fold_counters", stdout=out)
+
+        review = Review.objects.get(pk=self.review.pk)
+        self.assertEqual((review.helpful_count, review.not_helpful_count), (2, 0))
+        self.assertFalse(CounterShard.objects.exists())
+        # The review's own rating was pending on its title.
+        self.assertEqual(MysteryTitle.objects.get(pk=review.movie_id).avg_quality, 4.0)
+        self.assertIn("Folded counters of 2 objects", out.getvalue())
+
+    def test_direct_mode_reads_stored_counts(self) -> None:
+        """Test that pending values are ignored outside the sharded mode."""
+        CounterShard.objects.add(
+            "movies.review",
+            self.review.pk,
+            0,
+            {"helpful_count": 3},
+        )
+
+        with self.settings(COUNTER_MODE="direct"):
+            review = Review.objects.get(pk=self.review.pk)
+            counters.with_pending([review])
+        self.assertEqual(review.helpful_count, 0)
@@ -1,8 +1,21 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
 from django.db.utils import IntegrityError
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from config.tests.factories import DirectorFactory, MovieFactory
+from config.tests.factories import (
+    DirectorFactory,
+    MovieFactory,
+    ReviewFactory,
+    UserFactory,
+)
+from movies import outbox
+from movies.heatmaps import histogram_index
+from movies.models import DirectorStats, Review
 
 
 class DirectorModelTests(TestCase):
@@ -50,6 +63,7 @@ class DirectorModelTests(TestCase):
 
 class DirectorViewTests(TestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.director1 = DirectorFactory.create(
             name="Rian Johnson",
             slug="rian-johnson",
@@ -98,7 +112,7 @@ class DirectorViewTests(TestCase):
         self.assertContains(response, "Knives Out")
 
     def test_director_detail_page_context_plot_data(self) -> None:
-        """Test that the director detail page context contains the plot data and averages."""
+        """Test that the detail page links to the chart data and shows its averages."""
         # Create a movie with stats associated with director1
         _ = MovieFactory.create(
             title="Knives Out",
@@ -111,18 +125,293 @@ class DirectorViewTests(TestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, 200)
-        self.assertIn("plot_data", response.context)
-        self.assertIn("avg_difficulty", response.context)
-        self.assertIn("avg_quality", response.context)
+        self.assertNotIn("plot_data", response.context)
+        self.assertTrue(response.context["has_chart"])
+        chart_url = reverse(
+            "movies:director_chart",
+            kwargs={"slug": self.director1.slug},
+        )
+        self.assertEqual(response.context["chart_url"], chart_url)
+        self.assertContains(response, f'data-chart-url="{chart_url}"')
 
-        # plot_data should be a list
-        plot_data = response.context["plot_data"]
+        # Check averages
+        self.assertEqual(response.context["avg_difficulty"], 3.0)
+        self.assertEqual(response.context["avg_quality"], 4.5)
+
+        # The plot points are served by the chart endpoint
+        data = self.client.get(chart_url).json()
+        plot_data = data["plot_data"]
         self.assertIsInstance(plot_data, list)
         self.assertEqual(len(plot_data), 1)
         self.assertEqual(plot_data[0]["title"], "Knives Out")
         self.assertEqual(plot_data[0]["x"], 3.0)
         self.assertEqual(plot_data[0]["y"], 4.5)
+        self.assertFalse(data["binned"])
+        self.assertEqual(data["avg_difficulty"], 3.0)
+        self.assertEqual(data["avg_quality"], 4.5)
 
-        # Check averages
-        self.assertEqual(response.context["avg_difficulty"], 3.0)
-        self.assertEqual(response.context["avg_quality"], 4.5)
+    def test_director_detail_without_rated_movies_has_no_chart(self) -> None:
+        """Test that the chart is replaced by a notice when nothing is rated."""
+        _ = MovieFactory.create(
+            director=self.director1,
+            avg_quality=0.0,
+            avg_difficulty=0.0,
+        )
+        url = reverse("movies:director_detail", kwargs={"slug": self.director1.slug})
+        response = self.client.get(url)
+        self.assertFalse(response.context["has_chart"])
+        self.assertContains(response, "Not enough rated movies")
+
+
+class DirectorChartDataTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.director = DirectorFactory.create(name="Rian Johnson")
+        self.url = reverse("movies:director_chart", kwargs={"slug": self.director.slug})
+
+    def test_unknown_director_returns_404(self) -> None:
+        """Test that the chart endpoint 404s for an unknown slug."""
+        url = reverse("movies:director_chart", kwargs={"slug": "nobody"})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_response_is_cacheable(self) -> None:
+        """Test that the chart JSON carries an ETag and a public max-age."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=", response["Cache-Control"])
+
+    def test_matching_etag_returns_not_modified(self) -> None:
+        """Test that revalidating an unchanged chart returns 304 without a body."""
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_etag_changes_when_a_movie_changes(self) -> None:
+        """Test that saving one of the director's movies changes the ETag."""
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            _ = MovieFactory.create(
+                director=self.director,
+                avg_quality=4.0,
+                avg_difficulty=2.0,
+            )
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()["plot_data"]), 1)
+
+    def test_stale_chart_keeps_its_own_etag(self) -> None:
+        """Test that a stale chart served mid-recompute is not cached as fresh."""
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            _ = MovieFactory.create(
+                director=self.director,
+                avg_quality=4.0,
+                avg_difficulty=2.0,
+            )
+        # Another worker holds the recompute lock, so the old chart is served.
+        cache.add(f"taxonomy-chart:director:{self.director.pk}:lock", 1)
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["plot_data"], [])
+        self.assertEqual(response["ETag"], etag)
+        self.assertIn("max-age=0", response["Cache-Control"])
+
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(SIDE_EFFECTS_MODE="outbox")
+    def test_chart_follows_the_stats_refresh(self) -> None:
+        """Test that a chart built before the stats refresh is not served after it."""
+        with self.captureOnCommitCallbacks(execute=True):
+            MovieFactory.create(
+                director=self.director,
+                avg_quality=4.0,
+                avg_difficulty=2.0,
+            )
+        # The worker has not refreshed the averages yet.
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["avg_quality"], 0.0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            outbox.process_batch()
+
+        response = self.client.get(
+            self.url,
+            headers={"if-none-match": response["ETag"]},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["avg_quality"], 4.0)
+
+    def test_large_charts_are_binned(self) -> None:
+        """Test that charts over the point limit are merged into grid cells."""
+        for quality in (4.1, 4.2, 4.3):
+            _ = MovieFactory.create(
+                director=self.director,
+                avg_quality=quality,
+                avg_difficulty=2.1,
+            )
+        lone = MovieFactory.create(
+            director=self.director,
+            avg_quality=1.2,
+            avg_difficulty=4.8,
+        )
+
+        with mock.patch("movies.views.taxonomy.CHART_MAX_POINTS", 2):
+            data = self.client.get(self.url).json()
+
+        self.assertTrue(data["binned"])
+        self.assertEqual(data["total"], 4)
+        self.assertEqual(len(data["plot_data"]), 2)
+        cluster, single = data["plot_data"]
+        self.assertEqual(cluster["count"], 3)
+        self.assertEqual(cluster["title"], "3 titles")
+        self.assertIsNone(cluster["url"])
+        self.assertEqual(cluster["x"], 2.1)
+        self.assertEqual(cluster["y"], 4.2)
+        self.assertEqual(single["count"], 1)
+        self.assertEqual(single["title"], lone.title)
+        self.assertEqual(single["url"], lone.get_absolute_url())
+
+
+class DirectorStatsTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.director = DirectorFactory.create(name="Rian Johnson")
+        self.other = DirectorFactory.create(name="Kenneth Branagh")
+
+    def test_new_director_gets_empty_stats(self) -> None:
+        """Test that every director has a stats row from the start."""
+        self.assertEqual(self.director.stats.title_count, 0)
+        self.assertEqual(self.director.stats.avg_quality, 0.0)
+
+    def test_stats_follow_reviews(self) -> None:
+        """Test that reviewing a title updates its director's stats."""
+        movie = MovieFactory.create(director=self.director)
+        user, _ = UserFactory.create()
+        ReviewFactory.create(
+            user=user,
+            movie=movie,
+            quality=4,
+            difficulty=2,
+            is_fair_play=True,
+        )
+
+        stats = DirectorStats.objects.get(pk=self.director.pk)
+        self.assertEqual(stats.title_count, 1)
+        self.assertEqual(stats.review_count, 1)
+        self.assertEqual(stats.avg_quality, 4.0)
+        self.assertEqual(stats.avg_difficulty, 2.0)
+        self.assertEqual(stats.fair_play_pct, 100.0)
+
+    def test_reassigned_title_updates_both_directors(self) -> None:
+        """Test that moving a title to another director updates both rows."""
+        movie = MovieFactory.create(director=self.director, avg_quality=4.0)
+        movie.director = self.other
+        movie.save()
+
+        self.assertEqual(DirectorStats.objects.get(pk=self.director.pk).title_count, 0)
+        self.assertEqual(DirectorStats.objects.get(pk=self.other.pk).title_count, 1)
+
+    def test_heatmap_sums_title_histograms(self) -> None:
+        """Test that the director heatmap adds up the reviews of every title."""
+        first = MovieFactory.create(director=self.director)
+        second = MovieFactory.create(director=self.director)
+        for movie, quality, difficulty in [
+            (first, 4, 2),
+            (second, 4, 2),
+            (second, 1, 5),
+        ]:
+            user, _ = UserFactory.create()
+            ReviewFactory.create(
+                user=user,
+                movie=movie,
+                quality=quality,
+                difficulty=difficulty,
+            )
+
+        heatmap = DirectorStats.objects.get(pk=self.director.pk).heatmap
+        self.assertEqual(heatmap[histogram_index(4, 2)], 2)
+        self.assertEqual(heatmap[histogram_index(1, 5)], 1)
+        self.assertEqual(sum(heatmap), 3)
+
+    def test_heatmap_follows_review_edits_and_reassignment(self) -> None:
+        """Test that edited reviews and moved titles keep the heatmaps in step."""
+        movie = MovieFactory.create(director=self.director)
+        user, _ = UserFactory.create()
+        review = ReviewFactory.create(user=user, movie=movie, quality=3, difficulty=3)
+
+        review.quality = 5
+        review.save()
+        heatmap = DirectorStats.objects.get(pk=self.director.pk).heatmap
+        self.assertEqual(heatmap[histogram_index(3, 3)], 0)
+        self.assertEqual(heatmap[histogram_index(5, 3)], 1)
+
+        movie.refresh_from_db()
+        movie.director = self.other
+        movie.save()
+        self.assertEqual(sum(DirectorStats.objects.get(pk=self.director.pk).heatmap), 0)
+        self.assertEqual(sum(DirectorStats.objects.get(pk=self.other.pk).heatmap), 1)
+
+        review.delete()
+        self.assertEqual(sum(DirectorStats.objects.get(pk=self.other.pk).heatmap), 0)
+
+    def test_detail_page_renders_heatmap_without_reading_reviews(self) -> None:
+        """Test that the detail page heatmap comes from the stats row."""
+        movie = MovieFactory.create(director=self.director)
+        user, _ = UserFactory.create()
+        ReviewFactory.create(user=user, movie=movie, quality=4, difficulty=2)
+
+        url = reverse("movies:director_detail", kwargs={"slug": self.director.slug})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertContains(response, "Review Heatmap (All Titles)")
+        self.assertEqual(response.context["heatmap"]["max_count"], 1)
+        review_table = connection.ops.quote_name(Review._meta.db_table)
+        self.assertFalse(
+            any(review_table in q["sql"] for q in queries.captured_queries),
+        )
+
+    def test_refresh_does_not_read_reviews(self) -> None:
+        """Test that review totals are summed from the titles' stored counters."""
+        first = MovieFactory.create(director=self.director)
+        second = MovieFactory.create(director=self.director)
+        for movie, is_fair_play in [(first, True), (second, True), (second, False)]:
+            user, _ = UserFactory.create()
+            ReviewFactory.create(user=user, movie=movie, is_fair_play=is_fair_play)
+
+        with CaptureQueriesContext(connection) as queries:
+            DirectorStats.refresh(self.director.pk)
+
+        stats = DirectorStats.objects.get(pk=self.director.pk)
+        self.assertEqual(stats.review_count, 3)
+        self.assertAlmostEqual(stats.fair_play_pct, 200 / 3)
+        review_table = connection.ops.quote_name(Review._meta.db_table)
+        self.assertFalse(
+            any(review_table in q["sql"] for q in queries.captured_queries),
+        )
+
+    def test_list_sorted_by_quality(self) -> None:
+        """Test that the list page can be sorted by mean quality."""
+        MovieFactory.create(director=self.director, avg_quality=3.0)
+        MovieFactory.create(director=self.other, avg_quality=4.5)
+
+        response = self.client.get(reverse("movies:director_list"), {"sort": "quality"})
+        self.assertEqual(
+            list(response.context["directors"]),
+            [self.other, self.director],
+        )
+
+    def test_unknown_sort_falls_back_to_name(self) -> None:
+        """Test that an unknown sort parameter sorts by name."""
+        response = self.client.get(reverse("movies:director_list"), {"sort": "bogus"})
+        self.assertEqual(response.context["sort"], "name")
+        self.assertEqual(
+            list(response.context["directors"]),
+            [self.other, self.director],
+        )
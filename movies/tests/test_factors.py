@@ -0,0 +1,163 @@
+import importlib.util
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+import movies
+from config.tests.factories import MovieFactory, ReviewFactory, UserFactory
+from movies import predictions
+from movies.models import MysteryTitle
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy (the 'ml' dependency group) is not installed")
+class FactorizationTests(TestCase):
+    def test_als_fits_low_rank_ratings(self) -> None:
+        """Test that the factors explain most of what the biases leave over."""
+        import numpy as np
+
+        from movies import vectors
+
+        rng = np.random.default_rng(0)
+        dense = 3 + rng.normal(0, 1, (40, 2)) @ rng.normal(0, 1, (2, 15))
+        cells = np.sort(rng.choice(40 * 15, 400, replace=False))
+        users, items = cells // 15, cells % 15
+
+        def rmse(iterations: int) -> float:
+            model = vectors.factorize(
+                users,
+                items,
+                dense[users, items],
+                40,
+                15,
+                rank=2,
+                reg=0.01,
+                iterations=iterations,
+                workers=2,
+            )
+            errors = model.predict(users, items) - dense[users, items]
+            return float(np.sqrt(np.mean(errors**2)))
+
+        self.assertLess(rmse(20), 0.1 * rmse(0))
+
+    def test_store_round_trips(self) -> None:
+        """Test that saved arrays are mapped back with their dtypes and shapes."""
+        import numpy as np
+
+        from movies import factor_store
+
+        arrays: dict[str, np.ndarray] = {
+            "ids": np.array([3, 7, 9], dtype=np.int64),
+            "factors": np.arange(6, dtype=np.float32).reshape(3, 2),
+            "empty": np.zeros((0, 2), dtype=np.float32),
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "factors.bin"
+            factor_store.save(path, 3.5, arrays)
+            loaded = factor_store.load(path)
+            self.assertEqual(loaded.global_mean, 3.5)
+            for name, array in arrays.items():
+                np.testing.assert_array_equal(loaded.arrays[name], array)
+                self.assertEqual(loaded.arrays[name].dtype, array.dtype)
+
+            path.write_bytes(b"not factors")
+            with self.assertRaises(ValueError):
+                factor_store.load(path)
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy (the 'ml' dependency group) is not installed")
+class PredictionTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(
+            override_settings(FACTORS_PATH=Path(directory) / "factors.bin"),
+        )
+        # Two tastes: readers of one group's titles dislike the other's.
+        self.liked = [MovieFactory.create() for _ in range(3)]
+        self.disliked = [MovieFactory.create() for _ in range(3)]
+        for _ in range(6):
+            user, _ = UserFactory.create()
+            for movie in self.liked:
+                ReviewFactory.create(user=user, movie=movie, quality=5)
+            for movie in self.disliked:
+                ReviewFactory.create(user=user, movie=movie, quality=1)
+        self.reader, password = UserFactory.create()
+        self.client.login(username=self.reader.get_username(), password=password)
+        for movie, quality in [(self.liked[0], 5), (self.disliked[0], 1)]:
+            ReviewFactory.create(user=self.reader, movie=movie, quality=quality)
+
+    def train(self) -> None:
+        call_command(
+            "train_factors",
+            "--rank",
+            "2",
+            "--workers",
+            "1",
+            stdout=StringIO(),
+        )
+
+    def test_no_predictions_before_training(self) -> None:
+        """Test that the pages work without a factor file."""
+        self.assertEqual(predictions.predict(self.reader.pk, [self.liked[1].pk]), {})
+        response = self.client.get(reverse("movies:recommended"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["movies"], [])
+
+    def test_missing_numpy_is_logged(self) -> None:
+        """Test that a factor file that cannot be read without NumPy is reported."""
+        self.train()
+        with (
+            patch.dict(sys.modules, {"movies.factor_store": None}),
+            patch.dict(vars(movies)),
+            self.assertLogs("movies.predictions", "WARNING") as logs,
+        ):
+            vars(movies).pop("factor_store", None)
+            predicted = predictions.predict(self.reader.pk, [self.liked[1].pk])
+        self.assertEqual(predicted, {})
+        self.assertIn("NumPy is not installed", logs.output[0])
+
+    def test_predictions_follow_taste(self) -> None:
+        """Test that titles liked by similar readers are predicted higher."""
+        self.train()
+        predicted = predictions.predict(
+            self.reader.pk,
+            [self.liked[1].pk, self.disliked[1].pk],
+        )
+        self.assertGreater(predicted[self.liked[1].pk], 4)
+        self.assertLess(predicted[self.disliked[1].pk], 2)
+
+    def test_recommendations_skip_reviewed_titles(self) -> None:
+        """Test that the recommended page ranks unreviewed titles by prediction."""
+        self.train()
+        response = self.client.get(reverse("movies:recommended"))
+        movies: list[MysteryTitle] = response.context["movies"]
+        self.assertEqual(len(movies), 4)
+        self.assertEqual(set(movies[:2]), set(self.liked[1:]))
+        self.assertNotIn(self.liked[0], movies)
+        self.assertContains(response, "You'd probably rate this", count=4)
+
+    def test_pages_show_predicted_rating(self) -> None:
+        """Test the prediction on the title page and on the shared cached cards."""
+        self.train()
+        response = self.client.get(self.liked[1].get_absolute_url())
+        self.assertGreater(response.context["predicted_rating"], 4)
+        self.assertContains(response, "You'd probably rate this")
+
+        response = self.client.get(reverse("movies:list"))
+        self.assertGreater(response.context["predicted_ratings"][self.liked[1].pk], 4)
+        self.assertContains(response, "You'd probably rate this")
+
+        # The cached cards carry no prediction for other visitors.
+        self.client.logout()
+        response = self.client.get(reverse("movies:list"))
+        self.assertNotContains(response, "probably rate")
@@ -0,0 +1,107 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from config.tests.factories import MovieFactory, ReviewFactory, UserFactory
+from movies import feed
+from movies.models import FeedEntry, Follow, Review, ReviewerStats
+from users.models import CustomUser
+
+
+class FeedTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.reader, password = UserFactory.create()
+        self.client.login(username=self.reader.get_username(), password=password)
+        self.author, _ = UserFactory.create()
+
+    def review(self, user: CustomUser | None = None) -> Review:
+        return ReviewFactory.create(
+            user=user or self.author,
+            movie=MovieFactory.create(),
+        )
+
+    def follow(self) -> None:
+        self.client.post(
+            reverse("follow_toggle", kwargs={"username": self.author.username}),
+        )
+
+    def test_follow_toggles_and_counts_followers(self) -> None:
+        """Test that the follow button follows, then unfollows, the user."""
+        self.follow()
+        self.assertTrue(
+            Follow.objects.filter(follower=self.reader, followee=self.author).exists(),
+        )
+        stats = ReviewerStats.objects.get(user=self.author)
+        self.assertEqual(stats.follower_count, 1)
+
+        self.follow()
+        self.assertFalse(Follow.objects.exists())
+        stats = ReviewerStats.objects.get(user=self.author)
+        self.assertEqual(stats.follower_count, 0)
+
+    def test_cannot_follow_self(self) -> None:
+        """Test that following yourself is ignored."""
+        self.client.post(
+            reverse("follow_toggle", kwargs={"username": self.reader.username}),
+        )
+        self.assertFalse(Follow.objects.exists())
+
+    def test_new_review_is_fanned_out(self) -> None:
+        """Test that a followed user's review is written into the feed."""
+        self.follow()
+        review = self.review()
+        self.review(UserFactory.create()[0])  # not followed
+
+        entries = FeedEntry.objects.filter(owner=self.reader)
+        self.assertEqual(list(entries.values_list("review_id", flat=True)), [review.pk])
+
+        response = self.client.get(reverse("movies:feed"))
+        self.assertEqual(response.context["reviews"], [review])
+        self.assertContains(response, review.movie.title)
+
+    def test_follow_backfills_and_unfollow_clears_feed(self) -> None:
+        """Test that following copies recent reviews and unfollowing drops them."""
+        reviews = [self.review() for _ in range(2)]
+
+        self.follow()
+        self.assertEqual(
+            set(FeedEntry.objects.values_list("review_id", flat=True)),
+            {review.pk for review in reviews},
+        )
+        self.follow()
+        self.assertFalse(FeedEntry.objects.exists())
+
+    @override_settings(FEED_LENGTH=3)
+    def test_feed_is_trimmed_to_length(self) -> None:
+        """Test that only the newest FEED_LENGTH entries are kept."""
+        self.follow()
+        reviews = [self.review() for _ in range(5)]
+
+        kept = FeedEntry.objects.filter(owner=self.reader)
+        self.assertEqual(
+            set(kept.values_list("review_id", flat=True)),
+            {review.pk for review in reviews[-3:]},
+        )
+
+    @override_settings(FEED_FANOUT_MAX_FOLLOWERS=2)
+    def test_heavily_followed_author_is_read_on_demand(self) -> None:
+        """Test that reviews of popular authors are merged in at read time."""
+        self.follow()
+        Follow.objects.create(follower=UserFactory.create()[0], followee=self.author)
+        pulled = self.review()
+        other, _ = UserFactory.create()
+        Follow.objects.create(follower=self.reader, followee=other)
+        pushed = self.review(other)
+
+        self.assertEqual(
+            list(FeedEntry.objects.values_list("review_id", flat=True)),
+            [pushed.pk],
+        )
+        self.assertEqual(feed.recent_reviews(self.reader, 10), [pushed, pulled])
+
+    def test_feed_requires_login(self) -> None:
+        """Test that anonymous users are sent to log in."""
+        self.client.logout()
+        response = self.client.get(reverse("movies:feed"))
+        self.assertEqual(response.status_code, 302)
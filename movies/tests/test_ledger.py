@@ -0,0 +1,179 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from config.tests.factories import (
+    MovieFactory,
+    ReviewFactory,
+    TagFactory,
+    UserFactory,
+)
+from movies import ledger
+from movies.models import (
+    Review,
+    ReviewerStats,
+    ReviewHelpfulVote,
+    TagVote,
+    VoteIntent,
+)
+
+
+@override_settings(VOTE_MODE="ledger")
+class TagVoteLedgerTests(TestCase):
+    def setUp(self) -> None:
+        self.user, password = UserFactory.create()
+        self.client.login(username=self.user.get_username(), password=password)
+        self.movie = MovieFactory.create()
+        self.tags = [TagFactory.create() for _ in range(2)]
+
+    def vote(self, tag_id: int) -> None:
+        self.client.post(
+            reverse("movies:vote_tag", kwargs={"slug": self.movie.slug}),
+            {"tag_id": tag_id},
+        )
+
+    def test_votes_are_appended_and_visible_to_the_voter(self) -> None:
+        """Test that votes go to the ledger but the voter sees them at once."""
+        self.vote(self.tags[0].pk)
+
+        self.assertFalse(TagVote.objects.exists())
+        self.assertEqual(VoteIntent.objects.count(), 1)
+        response = self.client.get(self.movie.get_absolute_url())
+        self.assertEqual(response.context["user_voted_tag_ids"], {self.tags[0].pk})
+
+    def test_append_is_one_insert(self) -> None:
+        """Test that casting a ledger vote runs a single query."""
+        with self.assertNumQueries(1):
+            ledger._append(
+                VoteIntent.Kind.TAG,
+                self.user,
+                self.movie.pk,
+                tag_id=self.tags[0].pk,
+                value=True,
+            )
+
+    def test_compaction_deletes_only_its_batch(self) -> None:
+        """Test that an intent committed while compacting is not deleted."""
+        self.vote(self.tags[0].pk)
+        self.vote(self.tags[1].pk)
+        gap = VoteIntent.objects.order_by("pk").values_list("pk", flat=True)[0]
+        VoteIntent.objects.filter(pk=gap).delete()
+        compact_tag_votes = ledger._compact_tag_votes
+
+        def commit_late(intents: list[VoteIntent]) -> int:
+            # A lower pk than the batch's, committed after the batch was read.
+            VoteIntent.objects.create(
+                pk=gap,
+                kind=VoteIntent.Kind.TAG,
+                voter_id=self.user.pk,
+                target_id=self.movie.pk,
+                tag_id=self.tags[0].pk,
+                value=True,
+            )
+            return compact_tag_votes(intents)
+
+        with mock.patch.object(ledger, "_compact_tag_votes", commit_late):
+            self.assertEqual(ledger.compact(), 1)
+
+        self.assertEqual(list(VoteIntent.objects.values_list("pk", flat=True)), [gap])
+
+    def test_compaction_applies_the_latest_intent(self) -> None:
+        """Test that toggling back and forth compacts to the final state."""
+        TagVote.objects.create(movie=self.movie, tag=self.tags[1], user=self.user)
+        for tag_id in [self.tags[0].pk, self.tags[0].pk, self.tags[0].pk]:
+            self.vote(tag_id)
+        self.vote(self.tags[1].pk)
+
+        self.assertEqual(ledger.compact(), 4)
+
+        self.assertEqual(
+            list(TagVote.objects.values_list("tag_id", flat=True)),
+            [self.tags[0].pk],
+        )
+        self.assertFalse(VoteIntent.objects.exists())
+
+    def test_bulk_votes_use_the_ledger(self) -> None:
+        """Test that the bulk endpoint appends intents and reports pending votes."""
+        response = self.client.post(
+            reverse("movies:bulk_vote_tags", kwargs={"slug": self.movie.slug}),
+            data={"add": [tag.pk for tag in self.tags]},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.json()["added"], sorted(tag.pk for tag in self.tags))
+        self.assertEqual(VoteIntent.objects.count(), 2)
+        ledger.compact()
+        self.assertEqual(TagVote.objects.count(), 2)
+
+
+@override_settings(VOTE_MODE="ledger")
+class HelpfulVoteLedgerTests(TestCase):
+    def setUp(self) -> None:
+        author, _ = UserFactory.create()
+        self.review = ReviewFactory.create(user=author, movie=MovieFactory.create())
+        self.voters = [UserFactory.create()[0] for _ in range(3)]
+
+    def test_cast_follows_pending_votes(self) -> None:
+        """Test that repeated votes see the voter's earlier, uncompacted ones."""
+        voter = self.voters[0]
+        self.assertEqual(ledger.cast_helpful_vote(self.review, voter, True), "created")
+        self.assertEqual(ledger.cast_helpful_vote(self.review, voter, False), "changed")
+        self.assertEqual(ledger.cast_helpful_vote(self.review, voter, False), "removed")
+        self.assertIsNone(ledger.helpful_vote(self.review, voter))
+        self.assertFalse(ReviewHelpfulVote.objects.exists())
+
+    def test_compaction_updates_votes_and_counts(self) -> None:
+        """Test that compaction upserts votes and adjusts the review's counts."""
+        ReviewHelpfulVote.objects.create(
+            review=self.review,
+            user=self.voters[0],
+            is_helpful=True,
+        )
+        ReviewHelpfulVote.objects.create(
+            review=self.review,
+            user=self.voters[1],
+            is_helpful=True,
+        )
+        ledger.cast_helpful_vote(self.review, self.voters[0], False)  # changed
+        ledger.cast_helpful_vote(self.review, self.voters[1], True)  # removed
+        ledger.cast_helpful_vote(self.review, self.voters[2], True)  # created
+
+        out = StringIO()
+        call_command("compact_votes", stdout=out)
+
+        votes = dict(
+            ReviewHelpfulVote.objects.values_list("user_id", "is_helpful"),
+        )
+        self.assertEqual(votes, {self.voters[0].pk: False, self.voters[2].pk: True})
+        review = Review.objects.get(pk=self.review.pk)
+        self.assertEqual((review.helpful_count, review.not_helpful_count), (1, 1))
+        stats = ReviewerStats.objects.get(user_id=review.user_id)
+        self.assertEqual(stats.helpful_votes_received, 1)
+        self.assertIn("Compacted 3 ledger rows", out.getvalue())
+
+    def test_voter_sees_own_pending_count(self) -> None:
+        """Test that the JSON response counts the voter's pending vote."""
+        voter, password = UserFactory.create()
+        self.client.login(username=voter.get_username(), password=password)
+
+        response = self.client.post(
+            reverse("movies:review_helpful_vote", kwargs={"pk": self.review.pk}),
+            {"is_helpful": "true"},
+            headers={"X-Requested-With": "XMLHttpRequest"},
+        )
+
+        data = response.json()
+        self.assertEqual((data["helpful_count"], data["user_vote"]), (1, True))
+        self.assertEqual(Review.objects.get(pk=self.review.pk).helpful_count, 0)
+
+    def test_intents_for_deleted_reviews_are_dropped(self) -> None:
+        """Test that compaction skips votes whose review no longer exists."""
+        ledger.cast_helpful_vote(self.review, self.voters[0], True)
+        self.review.delete()
+
+        self.assertEqual(ledger.compact(), 1)
+        self.assertFalse(VoteIntent.objects.exists())
+        self.assertFalse(ReviewHelpfulVote.objects.exists())
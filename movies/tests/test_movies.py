@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.db.utils import IntegrityError
 from django.test import TestCase
 from django.urls import reverse
@@ -10,6 +11,7 @@ from config.tests.factories import (
     UserFactory,
 )
 from movies.models import MysteryTitle, Review
+from movies.templatetags.movie_extras import get_review_heatmaps
 
 
 class MysteryTitleModelTests(TestCase):
@@ -83,6 +85,7 @@ class MysteryTitleModelTests(TestCase):
 
 class MysteryViewTests(TestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.director1 = DirectorFactory.create(
             name="Rian Johnson",
         )
@@ -237,6 +240,76 @@ class MysteryViewTests(TestCase):
         self.assertEqual(response_p2.context["search_query"], "Noir")
 
 
+class MovieCardCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.director = DirectorFactory.create(name="Rian Johnson")
+        self.movie = MovieFactory.create(title="Glass Onion", director=self.director)
+
+    def test_cards_are_rendered_once(self) -> None:
+        """Test that a cached card is not re-rendered on the next page view."""
+        self.client.get(reverse("home"))
+
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, "Glass Onion")
+        self.assertTemplateNotUsed(response, "movies/includes/movie_card.html")
+
+    def test_movie_change_rerenders_card(self) -> None:
+        """Test that editing a title replaces its cached card."""
+        self.client.get(reverse("home"))
+        self.movie.title = "Glass Onion: A Knives Out Mystery"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.movie.save()
+
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, "Glass Onion: A Knives Out Mystery")
+
+    def test_director_change_rerenders_card(self) -> None:
+        """Test that renaming a director replaces the cards that show them."""
+        self.client.get(reverse("home"))
+        self.director.name = "R. Johnson"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.director.save()
+
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, "R. Johnson")
+
+
+class ReviewHeatmapBatchTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.movies = [MovieFactory.create() for _ in range(3)]
+        for movie, quality, difficulty in [
+            (self.movies[0], 4, 2),
+            (self.movies[1], 4, 2),
+            (self.movies[1], 1, 5),
+        ]:
+            user, _ = UserFactory.create()
+            ReviewFactory.create(
+                user=user,
+                movie=movie,
+                quality=quality,
+                difficulty=difficulty,
+            )
+
+    def test_heatmaps_are_read_in_one_query(self) -> None:
+        """Test that the heatmaps of many titles come from a single query."""
+        with self.assertNumQueries(1):
+            heatmaps = get_review_heatmaps([movie.pk for movie in self.movies])
+
+        self.assertEqual(set(heatmaps), {movie.pk for movie in self.movies})
+        self.assertEqual(heatmaps[self.movies[0].pk]["max_count"], 1)
+        self.assertEqual(heatmaps[self.movies[2].pk]["max_count"], 0)
+        # Difficulty 5 is the first row, quality 1 the first cell.
+        self.assertEqual(heatmaps[self.movies[1].pk]["rows"][0]["cells"][0]["count"], 1)
+
+    def test_home_page_cards_show_mini_heatmaps(self) -> None:
+        """Test that the cards of reviewed titles carry a mini heatmap."""
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, "heatmap-mini-cell", count=2 * 25)
+        self.assertContains(response, 'href="/static/movies/css/heatmap')
+
+
 class MysteryTitleStatsTests(TestCase):
     def setUp(self) -> None:
         self.user1, _ = UserFactory.create()
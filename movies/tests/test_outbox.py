@@ -0,0 +1,131 @@
+from datetime import timedelta
+from io import StringIO
+from typing import Any
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from config.tests.factories import MovieFactory, ReviewFactory, UserFactory
+from movies import outbox
+from movies.models import MysteryTitle, OutboxEvent, Review
+
+
+class OutboxTestCase(TestCase):
+    def setUp(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+        handlers = mock.patch.dict(outbox._handlers)
+        handlers.start()
+        self.addCleanup(handlers.stop)
+        outbox.handler("test.record")(self.calls.append)
+
+
+class InlineModeTests(OutboxTestCase):
+    def test_enqueue_runs_handler_immediately(self) -> None:
+        """Test that inline mode runs the handler and stores nothing."""
+        outbox.enqueue("test.record", pk=1)
+
+        self.assertEqual(self.calls, [{"pk": 1}])
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_unknown_kind_is_rejected(self) -> None:
+        """Test that enqueueing an event without a handler fails loudly."""
+        with self.assertRaises(ValueError):
+            outbox.enqueue("test.unknown")
+
+
+@override_settings(SIDE_EFFECTS_MODE="outbox")
+class OutboxModeTests(OutboxTestCase):
+    def test_enqueue_stores_event(self) -> None:
+        """Test that outbox mode records the event instead of running it."""
+        outbox.enqueue("test.record", pk=1)
+
+        self.assertEqual(self.calls, [])
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.kind, "test.record")
+        self.assertEqual(event.payload, {"pk": 1})
+
+    def test_batch_runs_and_deletes_events(self) -> None:
+        """Test that processed events are run once and removed."""
+        outbox.enqueue("test.record", pk=1)
+        outbox.enqueue("test.record", pk=2)
+
+        self.assertEqual(outbox.process_batch(), 2)
+        self.assertEqual(self.calls, [{"pk": 1}, {"pk": 2}])
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_identical_events_are_coalesced(self) -> None:
+        """Test that duplicate events in one batch run the handler once."""
+        for _ in range(3):
+            outbox.enqueue("test.record", pk=1)
+
+        self.assertEqual(outbox.process_batch(), 3)
+        self.assertEqual(self.calls, [{"pk": 1}])
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_leased_events_are_not_claimed_twice(self) -> None:
+        """Test that a second worker skips events leased by the first."""
+        outbox.enqueue("test.record", pk=1)
+
+        self.assertEqual(len(outbox.claim_batch(10, timedelta(minutes=1))), 1)
+        self.assertEqual(outbox.claim_batch(10, timedelta(minutes=1)), [])
+
+    def test_expired_lease_is_reclaimed(self) -> None:
+        """Test that events of a worker that died are picked up again."""
+        outbox.enqueue("test.record", pk=1)
+        outbox.claim_batch(10, timedelta(minutes=1))
+        OutboxEvent.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(len(outbox.claim_batch(10, timedelta(minutes=1))), 1)
+
+    def test_failed_event_is_retried_later(self) -> None:
+        """Test that a failing handler releases its event with a backoff."""
+
+        @outbox.handler("test.fail")
+        def fail(payload: dict[str, Any]) -> None:
+            raise RuntimeError("boom")
+
+        outbox.enqueue("test.fail")
+        with self.assertLogs("movies.outbox", level="ERROR"):
+            outbox.process_batch()
+
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.attempts, 1)
+        self.assertIn("boom", event.last_error)
+        self.assertEqual(event.locked_by, "")
+        self.assertGreater(event.available_at, timezone.now())
+        # Not claimable again until the backoff has passed.
+        self.assertEqual(outbox.process_batch(), 0)
+
+    def test_review_side_effects_wait_for_worker(self) -> None:
+        """Test that a review's stats are only updated once the worker runs."""
+        user, _ = UserFactory.create()
+        movie = MovieFactory.create()
+        ReviewFactory.create(user=user, movie=movie, quality=4, difficulty=2)
+
+        self.assertEqual(MysteryTitle.objects.get(pk=movie.pk).avg_quality, 0.0)
+        self.assertTrue(OutboxEvent.objects.filter(kind="review.changed").exists())
+
+        out = StringIO()
+        call_command("run_worker", "--once", stdout=out)
+
+        self.assertEqual(MysteryTitle.objects.get(pk=movie.pk).avg_quality, 4.0)
+        self.assertFalse(OutboxEvent.objects.exists())
+        self.assertIn("Processed", out.getvalue())
+
+    def test_review_is_not_saved_without_its_events(self) -> None:
+        """Test that a failure to record the events rolls the review back."""
+        user, _ = UserFactory.create()
+        movie = MovieFactory.create()
+        with (
+            mock.patch.object(
+                OutboxEvent.objects,
+                "create",
+                side_effect=RuntimeError("crashed"),
+            ),
+            self.assertRaises(RuntimeError),
+        ):
+            ReviewFactory.create(user=user, movie=movie, quality=4, difficulty=2)
+
+        self.assertFalse(Review.objects.exists())
@@ -1,9 +1,10 @@
 from django.core.cache import cache
-from django.core.cache.utils import make_template_fragment_key
+from django.db.models.signals import post_save
 from django.db.utils import IntegrityError
 from django.test import TestCase, override_settings
 from django.urls import reverse
 
+from caching import stampede
 from config.tests.factories import MovieFactory, ReviewFactory, UserFactory
 from movies.models import Review, ReviewHelpfulVote
 
@@ -163,9 +164,9 @@ class ReviewCacheTests(TestCase):
     def setUp(self) -> None:
         self.user, self.upass = UserFactory.create()
         self.uname = self.user.get_username()
+        self.other_user, _ = UserFactory.create()
         self.movie = MovieFactory.create()
-        # Reconstruct the key used in the template: {% cache 900 heatmap movie.pk %}
-        self.cache_key = make_template_fragment_key("heatmap", [self.movie.pk])
+        stampede.reset_stats()
 
     def tearDown(self) -> None:  # noqa
         # Clear cache after every test to ensure isolation
@@ -173,31 +174,47 @@ class ReviewCacheTests(TestCase):
 
     def test_heatmap_cache_invalidation_on_create(self) -> None:
         """Test that creating a review invalidates the heatmap cache."""
-        # 1. Simulate the cache being populated (as if the template just rendered)
-        cache.set(self.cache_key, "<div>Cached Heatmap HTML</div>")
+        ReviewFactory.create(user=self.other_user, movie=self.movie)
 
-        # Verify it exists
-        self.assertIsNotNone(cache.get(self.cache_key))
+        # 1. Populate the cache by rendering the page
+        response = self.client.get(self.movie.get_absolute_url())
+        self.assertContains(response, "(1 review)")
 
         # 2. Create a review (triggers the post_save signal)
-        _ = ReviewFactory.create(user=self.user, movie=self.movie)
+        with self.captureOnCommitCallbacks(execute=True):
+            ReviewFactory.create(user=self.user, movie=self.movie)
 
-        # 3. Verify the cache key is now gone
-        self.assertIsNone(cache.get(self.cache_key))
+        # 3. Verify the fragment is rebuilt with the new review
+        response = self.client.get(self.movie.get_absolute_url())
+        self.assertContains(response, "(2 reviews)")
+        self.assertEqual(stampede.stats().get("stale_refresh"), 1)
 
     def test_heatmap_cache_invalidation_on_delete(self) -> None:
         """Test that deleting a review invalidates the heatmap cache."""
+        ReviewFactory.create(user=self.other_user, movie=self.movie)
         review = ReviewFactory.create(user=self.user, movie=self.movie)
 
         # 1. Populate cache
-        cache.set(self.cache_key, "<div>Cached Heatmap HTML</div>")
-        self.assertIsNotNone(cache.get(self.cache_key))
+        response = self.client.get(self.movie.get_absolute_url())
+        self.assertContains(response, "(2 reviews)")
 
         # 2. Delete the review (triggers the post_delete signal)
-        review.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            review.delete()
+
+        # 3. Verify the fragment is rebuilt without the review
+        response = self.client.get(self.movie.get_absolute_url())
+        self.assertContains(response, "(1 review)")
+
+    def test_heatmap_fragment_is_rendered_from_cache(self) -> None:
+        """Test that the heatmap fragment is reused between page views."""
+        ReviewFactory.create(user=self.user, movie=self.movie)
 
-        # 3. Verify the cache key is now gone
-        self.assertIsNone(cache.get(self.cache_key))
+        self.client.get(self.movie.get_absolute_url())
+        self.client.get(self.movie.get_absolute_url())
+
+        self.assertEqual(stampede.stats().get("miss"), 1)
+        self.assertEqual(stampede.stats().get("hit"), 1)
 
 
 class ReviewHelpfulVoteModelTests(TestCase):
@@ -364,6 +381,67 @@ class ReviewHelpfulStatsTests(TestCase):
         self.assertEqual(self.review.not_helpful_count, 1)
 
 
+class CastVoteTests(TestCase):
+    def setUp(self) -> None:
+        reviewer, _ = UserFactory.create()
+        self.voter, _ = UserFactory.create()
+        self.review = ReviewFactory.create(user=reviewer, movie=MovieFactory.create())
+
+    def _cast(self, is_helpful: bool) -> str:
+        return ReviewHelpfulVote.objects.cast_vote(self.review, self.voter, is_helpful)
+
+    def test_vote_is_created_changed_and_removed(self) -> None:
+        """Test that repeated votes cycle through create, change and remove."""
+        self.assertEqual(self._cast(True), "created")
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.helpful_count, 1)
+
+        self.assertEqual(self._cast(False), "changed")
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.helpful_count, 0)
+        self.assertEqual(self.review.not_helpful_count, 1)
+
+        self.assertEqual(self._cast(False), "removed")
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.not_helpful_count, 0)
+        self.assertFalse(ReviewHelpfulVote.objects.exists())
+
+    def test_changed_vote_updates_timestamp(self) -> None:
+        """Test that changing a vote bumps updated_at but keeps created_at."""
+        self._cast(True)
+        vote = ReviewHelpfulVote.objects.get()
+
+        self._cast(False)
+        changed = ReviewHelpfulVote.objects.get()
+        self.assertEqual(changed.pk, vote.pk)
+        self.assertEqual(changed.created_at, vote.created_at)
+        self.assertGreaterEqual(changed.updated_at, vote.updated_at)
+        self.assertFalse(changed.is_helpful)
+
+    def test_change_sends_the_saved_row(self) -> None:
+        """Test that post_save gets the stored vote, and only for a real flip."""
+        self._cast(True)
+        vote = ReviewHelpfulVote.objects.get()
+        saved: list[ReviewHelpfulVote] = []
+
+        def receiver(instance: ReviewHelpfulVote, **kwargs: object) -> None:
+            saved.append(instance)
+
+        post_save.connect(receiver, sender=ReviewHelpfulVote)
+        self.addCleanup(post_save.disconnect, receiver, sender=ReviewHelpfulVote)
+
+        # Already helpful, as after a concurrent request: nothing to change.
+        votes = ReviewHelpfulVote.objects.all()
+        self.assertTrue(votes._change_vote(self.review, self.voter, True))
+        self.assertEqual(saved, [])
+
+        self._cast(False)
+        self.assertEqual([instance.pk for instance in saved], [vote.pk])
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.helpful_count, 0)
+        self.assertEqual(self.review.not_helpful_count, 1)
+
+
 class ReviewHelpfulVoteViewTests(TestCase):
     """Unit tests for the review helpful voting views."""
 
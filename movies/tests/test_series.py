@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.db.utils import IntegrityError
 from django.test import TestCase
 from django.urls import reverse
@@ -47,6 +48,7 @@ class SeriesModelTests(TestCase):
 
 class SeriesViewTests(TestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.series1 = SeriesFactory.create(name="Benoit Blanc")
         self.series2 = SeriesFactory.create(name="Sherlock Holmes")
 
@@ -68,6 +70,23 @@ class SeriesViewTests(TestCase):
         self.assertIn(self.series1, response.context["series_list"])
         self.assertIn(self.series2, response.context["series_list"])
 
+    def test_series_list_is_paginated(self) -> None:
+        """Test that the series list is split into pages."""
+        for index in range(25):
+            SeriesFactory.create(name=f"Series {index:02}")
+
+        response = self.client.get(reverse("movies:series_list"))
+        self.assertTrue(response.context["is_paginated"])
+        self.assertEqual(len(response.context["series_list"]), 24)
+
+    def test_series_list_sorted_by_title_count(self) -> None:
+        """Test that the series list can be sorted by number of titles."""
+        MovieFactory.create(series=self.series2)
+
+        response = self.client.get(reverse("movies:series_list"), {"sort": "titles"})
+        self.assertEqual(response.context["series_list"][0], self.series2)
+        self.assertContains(response, "Fair Play")
+
     def test_series_detail_page_status_code(self) -> None:
         """Test that a valid series detail page returns a 200 OK status code."""
         url = reverse("movies:series_detail", kwargs={"slug": self.series1.slug})
@@ -137,8 +156,10 @@ class SeriesViewTests(TestCase):
         self.assertEqual(response.context["avg_difficulty"], 4.0)
         self.assertContains(response, "4.0")
 
-        # Verify plot data is generated
-        self.assertIn("plot_data", response.context)
+        # Verify plot data is generated by the chart endpoint
+        chart_url = reverse("movies:series_chart", kwargs={"slug": self.series1.slug})
+        self.assertEqual(response.context["chart_url"], chart_url)
+        plot_data = self.client.get(chart_url).json()["plot_data"]
         # We expect 4 movies in the plot data (all except "Wake Up Dead Man" which has 0,0)
         # However, the filter is (diff > 0 OR qual > 0).
         # Wake Up Dead Man (0,0) is excluded.
@@ -146,4 +167,4 @@ class SeriesViewTests(TestCase):
         # Movie B (0.0, 5.0) is included.
         # Glass Onion (4.0, 3.0) is included.
         # Knives Out (5.0, 4.0) is included.
-        self.assertEqual(len(response.context["plot_data"]), 4)
+        self.assertEqual(len(plot_data), 4)
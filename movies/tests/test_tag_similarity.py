@@ -0,0 +1,96 @@
+import importlib.util
+import unittest
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from config.tests.factories import MovieFactory, TagFactory, UserFactory
+from movies.models import (
+    MysteryTitle,
+    StaleNeighbourList,
+    Tag,
+    TagVote,
+    TitleNeighbour,
+)
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+TAGS = TitleNeighbour.Kind.TAGS
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy (the 'ml' dependency group) is not installed")
+class TfidfTests(TestCase):
+    def test_rows_are_unit_vectors_and_common_tags_weigh_less(self) -> None:
+        """Test that a tag every title carries counts less than a rare one."""
+        import numpy as np
+
+        from movies.vectors import tfidf
+
+        counts = np.array([[3.0, 3.0], [1.0, 0.0], [1.0, 0.0], [0.0, 0.0]])
+        weights = tfidf(counts)
+
+        np.testing.assert_allclose(np.linalg.norm(weights[:3], axis=1), 1.0)
+        self.assertEqual(weights[3].tolist(), [0.0, 0.0])
+        self.assertGreater(weights[0, 1], weights[0, 0])
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy (the 'ml' dependency group) is not installed")
+class TagSimilarityTests(TestCase):
+    def setUp(self) -> None:
+        self.users = [UserFactory.create()[0] for _ in range(2)]
+        self.movies = [MovieFactory.create() for _ in range(3)]
+        self.locked_room, self.narrator, self.heist = (
+            TagFactory.create() for _ in range(3)
+        )
+        self.vote(0, self.locked_room, self.narrator)
+        self.vote(1, self.locked_room, self.narrator)
+        self.vote(2, self.heist)
+
+    def vote(self, movie: int, *tags: Tag) -> None:
+        for user in self.users:
+            for tag in tags:
+                TagVote.objects.create(user=user, movie=self.movies[movie], tag=tag)
+
+    def neighbours(self, movie: int) -> list[MysteryTitle]:
+        return TitleNeighbour.titles_for(self.movies[movie], TAGS)
+
+    def test_titles_with_the_same_tags_are_similar(self) -> None:
+        """Test that a full build pairs titles by their tag vectors."""
+        call_command("build_similar_titles", "--full", "--kind=tags", stdout=StringIO())
+
+        self.assertEqual(self.neighbours(0), [self.movies[1]])
+        self.assertEqual(self.neighbours(2), [])
+        self.assertFalse(StaleNeighbourList.objects.filter(kind=TAGS).exists())
+
+    def test_vote_changes_refresh_only_affected_titles(self) -> None:
+        """Test that new votes flag their title and an incremental build uses them."""
+        from movies import tag_similarity
+
+        tag_similarity.build(full=True)
+        TagVote.objects.set_votes(
+            self.movies[2],
+            self.users[0],
+            add=[self.locked_room.pk, self.narrator.pk],
+            remove=[],
+        )
+        stale = StaleNeighbourList.objects.filter(kind=TAGS)
+        self.assertEqual(
+            list(stale.values_list("movie_id", flat=True)),
+            [self.movies[2].pk],
+        )
+
+        self.assertEqual(tag_similarity.build(), 3)
+
+        self.assertEqual(set(self.neighbours(2)), {self.movies[0], self.movies[1]})
+        self.assertIn(self.movies[2], self.neighbours(0))
+        self.assertFalse(stale.exists())
+
+    def test_detail_page_shows_similar_mysteries(self) -> None:
+        """Test that the title page lists the tag-based neighbours."""
+        call_command("build_similar_titles", "--full", "--kind=tags", stdout=StringIO())
+
+        response = self.client.get(self.movies[0].get_absolute_url())
+
+        self.assertContains(response, "Similar mysteries")
+        self.assertEqual(response.context["tagged_alike"], [self.movies[1]])
@@ -1,10 +1,18 @@
+import json
+from typing import TYPE_CHECKING
+
+from django.core.cache import cache
 from django.db.utils import IntegrityError
 from django.test import TestCase
 from django.urls import reverse
 
 from config.tests.factories import MovieFactory, TagFactory, UserFactory
+from movies.forms import TagVoteForm
 from movies.models import TagVote
 
+if TYPE_CHECKING:
+    from django.test.client import _MonkeyPatchedWSGIResponse as TestResponse
+
 
 class TagModelTests(TestCase):
     def setUp(self) -> None:
@@ -72,3 +80,123 @@ class TagVoteTests(TestCase):
                 tag=self.tag,
                 user=self.user,
             )
+
+
+class TagSnapshotTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user, self.upass = UserFactory.create()
+        self.movie = MovieFactory.create(title="Snapshot Movie")
+        self.tag = TagFactory.create(name="Twist")
+        self.url = reverse("movies:vote_tag", kwargs={"slug": self.movie.slug})
+
+    def test_form_choices_follow_tag_changes(self) -> None:
+        """Test that the tag form lists new tags without a restart."""
+        TagVoteForm()
+        with self.captureOnCommitCallbacks(execute=True):
+            new_tag = TagFactory.create(name="Alibi")
+
+        choices = dict(TagVoteForm().fields["tag"].choices)  # type: ignore[attr-defined]
+        self.assertEqual(choices[new_tag.pk], "Alibi")
+
+    def test_form_resolves_tag_without_query(self) -> None:
+        """Test that a submitted tag is validated against the snapshot."""
+        TagVoteForm()
+        with self.assertNumQueries(0):
+            form = TagVoteForm({"tag": self.tag.pk})
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["tag"], self.tag)
+        self.assertFalse(TagVoteForm({"tag": 9999}).is_valid())
+
+    def test_vote_for_unknown_tag_returns_404(self) -> None:
+        """Test that voting with an unknown tag id is a 404."""
+        self.client.login(username=self.user.get_username(), password=self.upass)
+        response = self.client.post(self.url, {"tag_id": 9999})
+        self.assertEqual(response.status_code, 404)
+
+
+class BulkTagVoteTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user, password = UserFactory.create()
+        self.client.login(username=self.user.get_username(), password=password)
+        self.movie = MovieFactory.create()
+        self.tags = [TagFactory.create() for _ in range(4)]
+        self.url = reverse("movies:bulk_vote_tags", kwargs={"slug": self.movie.slug})
+
+    def _post(self, body: object) -> TestResponse:
+        return self.client.post(
+            self.url,
+            data=json.dumps(body),
+            content_type="application/json",
+        )
+
+    def test_adds_and_removes_votes_in_one_request(self) -> None:
+        """Test that several votes are added and removed at once."""
+        TagVote.objects.create(movie=self.movie, tag=self.tags[0], user=self.user)
+        add = [self.tags[1].pk, self.tags[2].pk]
+
+        response = self._post({"add": add, "remove": [self.tags[0].pk]})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["added"], sorted(add))
+        self.assertEqual(data["removed"], [self.tags[0].pk])
+        self.assertEqual(
+            set(
+                TagVote.objects.filter(user=self.user).values_list("tag_id", flat=True),
+            ),
+            set(add),
+        )
+        self.assertEqual(
+            {tag["id"]: (tag["vote_count"], tag["voted"]) for tag in data["tags"]},
+            dict.fromkeys(add, (1, True)),
+        )
+
+    def test_existing_and_missing_votes_are_left_alone(self) -> None:
+        """Test that adding a voted tag or removing an unvoted one is a no-op."""
+        TagVote.objects.create(movie=self.movie, tag=self.tags[0], user=self.user)
+
+        data = self._post(
+            {"add": [self.tags[0].pk], "remove": [self.tags[1].pk]},
+        ).json()
+
+        self.assertEqual(data["added"], [])
+        self.assertEqual(data["removed"], [])
+        self.assertEqual(TagVote.objects.count(), 1)
+
+    def test_detail_page_counts_follow_bulk_votes(self) -> None:
+        """Test that the cached tag counts are invalidated by a bulk update."""
+        detail_url = self.movie.get_absolute_url()
+        self.assertEqual(self.client.get(detail_url).context["tags_with_counts"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._post({"add": [self.tags[0].pk]})
+
+        counts = self.client.get(detail_url).context["tags_with_counts"]
+        self.assertEqual(
+            [(tag.pk, tag.vote_count) for tag in counts],
+            [(self.tags[0].pk, 1)],
+        )
+
+    def test_invalid_requests_are_rejected(self) -> None:
+        """Test that malformed bodies and unknown tags return 400."""
+        for body in [
+            ["not", "an", "object"],
+            {"add": "1"},
+            {"add": ["1"]},
+            {"add": [999999]},
+            {"add": [self.tags[0].pk], "remove": [self.tags[0].pk]},
+        ]:
+            with self.subTest(body=body):
+                self.assertEqual(self._post(body).status_code, 400)
+        response = self.client.post(self.url, data="{", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(TagVote.objects.exists())
+
+    def test_login_required(self) -> None:
+        """Test that anonymous users are redirected to log in."""
+        self.client.logout()
+        response = self._post({"add": [self.tags[0].pk]})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(TagVote.objects.exists())
@@ -1,4 +1,7 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from config.tests.factories import MovieFactory, UserFactory
@@ -80,3 +83,100 @@ class WatchlistSignalTests(TestCase):
                 any(expected_msg in record.getMessage() for record in cm.records),
                 f"Expected log message '{expected_msg}' not found in {cm.output}",
             )
+
+
+class WatchListToggleQueryTests(TestCase):
+    def setUp(self) -> None:
+        self.user, _ = UserFactory.create()
+        self.movie = MovieFactory.create()
+
+    def _table_statements(self, queries: CaptureQueriesContext) -> list[str]:
+        table = connection.ops.quote_name(WatchListEntry._meta.db_table)
+        return [
+            query["sql"].split()[0].upper()
+            for query in queries.captured_queries
+            if table in query["sql"]
+        ]
+
+    def test_toggle_adds_without_reading_first(self) -> None:
+        """Test that adding is a DELETE miss and an INSERT, with no SELECT."""
+        with CaptureQueriesContext(connection) as queries:
+            added = WatchListEntry.objects.toggle(user=self.user, movie=self.movie)
+
+        self.assertTrue(added)
+        self.assertEqual(self._table_statements(queries), ["DELETE", "INSERT"])
+        entry = WatchListEntry.objects.get(user=self.user, movie=self.movie)
+        self.assertIsNotNone(entry.added_at)
+
+    def test_toggle_removes_in_one_statement(self) -> None:
+        """Test that removing an entry is a single DELETE."""
+        WatchListEntry.objects.create(user=self.user, movie=self.movie)
+
+        with CaptureQueriesContext(connection) as queries:
+            added = WatchListEntry.objects.toggle(user=self.user, movie=self.movie)
+
+        self.assertFalse(added)
+        self.assertEqual(self._table_statements(queries), ["DELETE"])
+        self.assertFalse(WatchListEntry.objects.exists())
+
+    def test_insert_conflict_is_ignored(self) -> None:
+        """Test that inserting an existing entry leaves the one row in place."""
+        WatchListEntry.objects.create(user=self.user, movie=self.movie)
+
+        self.assertIsNone(
+            WatchListEntry.objects.insert_row(user=self.user, movie=self.movie),
+        )
+        self.assertEqual(WatchListEntry.objects.count(), 1)
+
+    def test_signals_are_sent_for_written_rows(self) -> None:
+        """Test that the receivers still see added and removed entries."""
+        with self.assertLogs("movies.signals", level="INFO") as cm:
+            WatchListEntry.objects.toggle(user=self.user, movie=self.movie)
+            WatchListEntry.objects.toggle(user=self.user, movie=self.movie)
+
+        self.assertEqual(
+            cm.output,
+            [
+                f"INFO:movies.signals:Watchlist entry created: {self.user} added "
+                f"{self.movie.slug} to watchlist",
+                f"INFO:movies.signals:Watchlist entry removed: {self.user} removed "
+                f"{self.movie.slug} from watchlist",
+            ],
+        )
+
+
+@override_settings(RATE_LIMITS={"watchlist_toggle": {"user": "2/m", "ip": None}})
+class WatchListRateLimitTests(TestCase):
+    def setUp(self) -> None:
+        # Drained buckets would outlive the test in the local cache tier.
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user, password = UserFactory.create()
+        self.client.login(username=self.user.get_username(), password=password)
+        self.movie = MovieFactory.create()
+        self.url = reverse("movies:watchlist_toggle", kwargs={"slug": self.movie.slug})
+
+    def test_too_many_toggles_are_refused(self) -> None:
+        """Test that requests over the limit get a 429 without touching the watchlist."""
+        for _ in range(2):
+            self.client.post(self.url)
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+        self.assertTemplateUsed(response, "429.html")
+        self.assertFalse(WatchListEntry.objects.exists())
+
+    def test_ajax_requests_get_json(self) -> None:
+        """Test that script clients are told when to retry in JSON."""
+        for _ in range(2):
+            self.client.post(self.url)
+
+        response = self.client.post(
+            self.url,
+            headers={"X-Requested-With": "XMLHttpRequest"},
+        )
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()["retry_after"], int(response["Retry-After"]))
@@ -1,6 +1,7 @@
 from django.urls import path
 
 from .views import (
+    BulkTagVoteView,
     CollectionAddItemView,
     CollectionCreateView,
     CollectionDeleteView,
@@ -9,13 +10,17 @@ from .views import (
     CollectionListView,
     CollectionRemoveItemView,
     CollectionUpdateView,
+    DirectorChartDataView,
     DirectorDetailView,
     DirectorListView,
+    FeedView,
     MysteryDetailView,
     MysteryListView,
+    RecommendedView,
     ReviewCreateView,
     ReviewHelpfulVoteView,
     ReviewListView,
+    SeriesChartDataView,
     SeriesDetailView,
     SeriesListView,
     TagVoteView,
@@ -70,9 +75,23 @@ urlpatterns = [
         DirectorDetailView.as_view(),
         name="director_detail",
     ),
+    path(
+        "directors/<slug:slug>/chart.json",
+        DirectorChartDataView.as_view(),
+        name="director_chart",
+    ),
     # Series
     path("series/", SeriesListView.as_view(), name="series_list"),
     path("series/<slug:slug>/", SeriesDetailView.as_view(), name="series_detail"),
+    path(
+        "series/<slug:slug>/chart.json",
+        SeriesChartDataView.as_view(),
+        name="series_chart",
+    ),
+    # Feed
+    path("feed/", FeedView.as_view(), name="feed"),
+    # Recommendations
+    path("recommended/", RecommendedView.as_view(), name="recommended"),
     # Watchlist
     path("watchlist/", WatchListView.as_view(), name="watchlist"),
     path(
@@ -90,6 +109,11 @@ urlpatterns = [
     ),
     # Tags
     path("<slug:slug>/vote-tag/", TagVoteView.as_view(), name="vote_tag"),
+    path(
+        "<slug:slug>/vote-tags/",
+        BulkTagVoteView.as_view(),
+        name="bulk_vote_tags",
+    ),
     # Movies
     path("<slug:slug>/", MysteryDetailView.as_view(), name="detail"),
     path("", MysteryListView.as_view(), name="list"),
@@ -0,0 +1,334 @@
+"""
+Vectorised building blocks for the offline recommendation jobs.
+
+Everything here works on NumPy arrays only, with no database access, so it
+can be benchmarked on synthetic data (scripts/benchmark_recommendations.py).
+NumPy is an optional dependency, installed with the "ml" dependency group;
+the site itself never imports this module, only the management commands
+that build recommendations do.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Upper bound on the (left, right) pairs materialised at once by
+# ``cooccurrence``; each pair costs about 40 bytes of temporaries.
+MAX_PAIRS = 1 << 22
+
+# Upper bound on the (row, item) cells of the dense ``cooccurrence`` results
+# held at once by ``item_similarities``: 32 MB per array.
+MAX_CELLS = 1 << 22
+
+
+def group_bounds(
+    keys: NDArray[np.int64],
+) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """Return the start and size of each run of equal values in sorted ``keys``."""
+    if not len(keys):
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    sizes = np.diff(np.r_[starts, len(keys)])
+    return starts, sizes
+
+
+def cooccurrence(
+    users: NDArray[np.int64],
+    items: NDArray[np.int64],
+    values: NDArray[np.float64],
+    n_items: int,
+    rows: NDArray[np.int64] | None = None,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Compute rows of X^T X for the sparse user x item matrix X.
+
+    X holds ``values[i]`` at (``users[i]``, ``items[i]``); entries must be
+    sorted by user. Returns ``(dot, count)``, both of shape
+    (len(rows), n_items): the dot products of the selected item columns
+    with every column, and the number of users that rated both. ``rows``
+    defaults to every item.
+
+    Each user contributes the pairs of their own entries, so the work is the
+    sum of the squared user degrees rather than users x items^2, and the
+    pairs are generated and added up (``bincount``) in bounded chunks.
+    """
+    if rows is None:
+        rows = np.arange(n_items)
+    row_of_item = np.full(n_items, -1, dtype=np.int64)
+    row_of_item[rows] = np.arange(len(rows))
+
+    starts, sizes = group_bounds(users)
+    group = np.repeat(np.arange(len(starts)), sizes)
+    left = np.flatnonzero(row_of_item[items] >= 0)
+    left_start = starts[group[left]]
+    left_size = sizes[group[left]]
+
+    cells = len(rows) * n_items
+    dot = np.zeros(cells)
+    count = np.zeros(cells)
+    ends = np.cumsum(left_size)
+    lo = 0
+    while lo < len(left):
+        # Take left entries until the chunk holds MAX_PAIRS pairs (at least one).
+        budget = (ends[lo - 1] if lo else 0) + MAX_PAIRS
+        hi = max(int(np.searchsorted(ends, budget, side="right")), lo + 1)
+        size = left_size[lo:hi]
+        pair_left = np.repeat(left[lo:hi], size)
+        offset = np.arange(len(pair_left)) - np.repeat(np.cumsum(size) - size, size)
+        pair_right = np.repeat(left_start[lo:hi], size) + offset
+        cell = row_of_item[items[pair_left]] * n_items + items[pair_right]
+        dot += np.bincount(
+            cell,
+            weights=values[pair_left] * values[pair_right],
+            minlength=cells,
+        )
+        count += np.bincount(cell, minlength=cells)
+        lo = hi
+    return dot.reshape(len(rows), n_items), count.reshape(len(rows), n_items)
+
+
+def center_by_group(
+    groups: NDArray[np.int64],
+    values: NDArray[np.float64],
+    n_groups: int,
+) -> NDArray[np.float64]:
+    """Subtract from each value the mean of the values in its group."""
+    totals = np.bincount(groups, weights=values, minlength=n_groups)
+    counts = np.bincount(groups, minlength=n_groups)
+    means = totals / np.maximum(counts, 1)
+    return values - means[groups]
+
+
+def top_k(
+    scores: NDArray[np.float64],
+    k: int,
+) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+    """
+    Return the columns and values of the ``k`` highest scores of each row.
+
+    Rows are sorted best first. Non-positive scores are not neighbours: their
+    columns are returned as -1.
+    """
+    k = min(k, scores.shape[1])
+    if k == 0:
+        empty = np.zeros((scores.shape[0], 0))
+        return empty.astype(np.int64), empty
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    best_scores = np.take_along_axis(scores, best, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    best = np.take_along_axis(best, order, axis=1)
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    best[best_scores <= 0] = -1
+    return best, best_scores
+
+
+def item_similarities(
+    users: NDArray[np.int64],
+    items: NDArray[np.int64],
+    ratings: NDArray[np.float64],
+    n_users: int,
+    n_items: int,
+    rows: NDArray[np.int64] | None = None,
+    shrinkage: float = 10.0,
+) -> NDArray[np.float64]:
+    """
+    Adjusted cosine similarity of the ``rows`` items to every item.
+
+    Ratings are centred on each user's mean, so an item counts as liked when
+    it is rated above what its reviewer usually gives, and similarities are
+    shrunk towards zero by ``count / (count + shrinkage)`` so that a pair
+    rated by a handful of users does not come out as a perfect match.
+    Entries must be sorted by user. An item is never its own neighbour.
+
+    Only the result is dense (8 bytes per row x item, 72 MB for 3,000
+    titles): the co-occurrence counts are computed a block of rows at a time,
+    so their temporaries stay under MAX_CELLS whatever the catalogue size.
+    """
+    values = center_by_group(users, ratings, n_users)
+    norms = np.sqrt(np.bincount(items, weights=values**2, minlength=n_items))
+    if rows is None:
+        rows = np.arange(n_items)
+
+    similarity = np.zeros((len(rows), n_items))
+    step = max(MAX_CELLS // max(n_items, 1), 1)
+    for lo in range(0, len(rows), step):
+        block = rows[lo : lo + step]
+        dot, count = cooccurrence(users, items, values, n_items, block)
+        denominator = norms[block][:, None] * norms[None, :]
+        out = similarity[lo : lo + step]
+        np.divide(dot, denominator, out=out, where=denominator > 0)
+        out *= count / (count + shrinkage)
+        out[np.arange(len(block)), block] = 0.0
+    return similarity
+
+
+def tfidf(counts: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Weight a document x term count matrix by TF-IDF and L2-normalise its rows.
+
+    Term frequencies are damped (``log1p``) so that a pile-on of votes for
+    one tag does not drown the others, and the smoothed inverse document
+    frequency makes tags that most titles carry count for little.
+    """
+    n_docs = counts.shape[0]
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + n_docs) / (1 + document_frequency)) + 1
+    weights = np.log1p(counts) * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    normalised: NDArray[np.float64] = np.divide(
+        weights,
+        norms,
+        out=np.zeros_like(weights),
+        where=norms > 0,
+    )
+    return normalised
+
+
+# Upper bound on the (padded) ratings gathered at once by one ALS solve step.
+SOLVE_CHUNK = 1 << 16
+
+
+class Factorization(NamedTuple):
+    """A biased matrix factorisation: r(u, i) ~ mean + b_u + b_i + p_u . q_i."""
+
+    global_mean: float
+    user_bias: NDArray[np.float64]
+    item_bias: NDArray[np.float64]
+    user_factors: NDArray[np.float64]
+    item_factors: NDArray[np.float64]
+
+    def predict(
+        self,
+        users: NDArray[np.int64],
+        items: NDArray[np.int64],
+    ) -> NDArray[np.float64]:
+        interaction = np.einsum(
+            "ij,ij->i",
+            self.user_factors[users],
+            self.item_factors[items],
+        )
+        predicted: NDArray[np.float64] = (
+            self.global_mean
+            + self.user_bias[users]
+            + self.item_bias[items]
+            + interaction
+        )
+        return predicted
+
+
+def solve_factors(
+    groups: NDArray[np.int64],
+    others: NDArray[np.int64],
+    values: NDArray[np.float64],
+    n_groups: int,
+    other_factors: NDArray[np.float64],
+    reg: float,
+    workers: int = 1,
+) -> NDArray[np.float64]:
+    """
+    One ALS half-step: each group's factors, given the other side's.
+
+    Entry ``i`` says that group ``groups[i]`` (a user, say) gave ``values[i]``
+    to ``others[i]``; entries must be sorted by group. Each group's factors
+    solve the ridge regression (Q^T Q + reg * n * I) p = Q^T r over its own
+    entries. Groups are bucketed by size rounded up to a power of two and
+    zero-padded to it, so that a chunk of about SOLVE_CHUNK entries is one
+    batched matrix product and one batched solve; chunks are spread over
+    ``workers`` threads (NumPy releases the GIL in the heavy operations).
+    Groups without entries get zero factors.
+    """
+    starts, sizes = group_bounds(groups)
+    keys = groups[starts]
+    rank = other_factors.shape[1]
+    factors = np.zeros((n_groups, rank))
+    diagonal = np.arange(rank)
+
+    capacities = 1 << np.ceil(np.log2(sizes)).astype(np.int64)
+    chunks = []
+    for capacity in np.unique(capacities):
+        members = np.flatnonzero(capacities == capacity)
+        step = max(SOLVE_CHUNK // int(capacity), 1)
+        chunks += [
+            (members[i : i + step], int(capacity)) for i in range(0, len(members), step)
+        ]
+
+    def solve(chunk: tuple[NDArray[np.int64], int]) -> None:
+        members, capacity = chunk
+        slots = np.arange(capacity)
+        filled = slots < sizes[members, None]
+        entries = np.where(filled, starts[members, None] + slots, 0)
+        other = other_factors[others[entries]] * filled[..., None]
+        gram = other.transpose(0, 2, 1) @ other
+        gram[:, diagonal, diagonal] += reg * sizes[members, None]
+        rhs = np.einsum("gsk,gs->gk", other, values[entries])
+        factors[keys[members]] = np.linalg.solve(gram, rhs[..., None])[..., 0]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(solve, chunks))
+    return factors
+
+
+def factorize(
+    users: NDArray[np.int64],
+    items: NDArray[np.int64],
+    ratings: NDArray[np.float64],
+    n_users: int,
+    n_items: int,
+    rank: int = 32,
+    reg: float = 0.05,
+    iterations: int = 10,
+    workers: int = 1,
+    bias_reg: float = 10.0,
+    seed: int = 0,
+) -> Factorization:
+    """
+    Fit a biased matrix factorisation of the ratings by alternating least squares.
+
+    User and item biases are fitted first as shrunken mean offsets (``bias_reg``
+    pseudo-ratings at the global mean); the factors then model what the
+    biases leave over, with ``reg`` weighted by each user's and item's number
+    of ratings. Entries must be sorted by user.
+    """
+    global_mean = float(ratings.mean()) if len(ratings) else 0.0
+    offset = ratings - global_mean
+    item_bias = np.bincount(items, weights=offset, minlength=n_items) / (
+        bias_reg + np.bincount(items, minlength=n_items)
+    )
+    offset -= item_bias[items]
+    user_bias = np.bincount(users, weights=offset, minlength=n_users) / (
+        bias_reg + np.bincount(users, minlength=n_users)
+    )
+    offset -= user_bias[users]
+
+    item_factors = np.random.default_rng(seed).normal(0.0, 0.1, (n_items, rank))
+    user_factors = np.zeros((n_users, rank))
+    by_item = np.argsort(items, kind="stable")
+    for _ in range(iterations):
+        user_factors = solve_factors(
+            users,
+            items,
+            offset,
+            n_users,
+            item_factors,
+            reg,
+            workers,
+        )
+        item_factors = solve_factors(
+            items[by_item],
+            users[by_item],
+            offset[by_item],
+            n_items,
+            user_factors,
+            reg,
+            workers,
+        )
+    return Factorization(
+        global_mean,
+        user_bias,
+        item_bias,
+        user_factors,
+        item_factors,
+    )
@@ -8,11 +8,15 @@ from .collections import (
     CollectionRemoveItemView,
     CollectionUpdateView,
 )
+from .feed import FeedView
+from .recommendations import RecommendedView
 from .reviews import ReviewCreateView, ReviewHelpfulVoteView, ReviewListView
-from .tags import TagVoteView
+from .tags import BulkTagVoteView, TagVoteView
 from .taxonomy import (
+    DirectorChartDataView,
     DirectorDetailView,
     DirectorListView,
+    SeriesChartDataView,
     SeriesDetailView,
     SeriesListView,
 )
@@ -20,6 +24,7 @@ from .titles import MysteryDetailView, MysteryListView
 from .watchlist import WatchListToggleView, WatchListView
 
 __all__ = [
+    "BulkTagVoteView",
     "CollectionAddItemView",
     "CollectionCreateView",
     "CollectionDeleteView",
@@ -28,13 +33,17 @@ __all__ = [
     "CollectionListView",
     "CollectionRemoveItemView",
     "CollectionUpdateView",
+    "DirectorChartDataView",
     "DirectorDetailView",
     "DirectorListView",
+    "FeedView",
     "MysteryDetailView",
     "MysteryListView",
+    "RecommendedView",
     "ReviewCreateView",
     "ReviewListView",
     "ReviewHelpfulVoteView",
+    "SeriesChartDataView",
     "SeriesDetailView",
     "SeriesListView",
     "TagVoteView",
@@ -18,10 +18,13 @@ from django.views.generic import (
 
 from movies.forms import CollectionAddItemForm, CollectionForm
 from movies.models import Collection, CollectionItem, MysteryTitle
-from movies.views.mixins import ElidedPaginationMixin
+from movies.views.mixins import ElidedPaginationMixin, RateLimitMixin
 
 logger = logging.getLogger(__name__)
 
+# Cached list querysets are invalidated whenever their tables change.
+LIST_CACHE_TIMEOUT = 60 * 15
+
 
 class CollectionListView(ElidedPaginationMixin, ListView):
     model = Collection
@@ -30,14 +33,20 @@ class CollectionListView(ElidedPaginationMixin, ListView):
     paginate_by = 12
 
     def get_queryset(self) -> QuerySet[Collection]:
-        return Collection.objects.select_related("user").visible_to(self.request.user)
+        return (
+            Collection.objects.select_related("user")
+            .visible_to(self.request.user)
+            .cached(LIST_CACHE_TIMEOUT)
+        )
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         if self.request.user.is_authenticated:
-            context["my_collections"] = Collection.objects.filter(
-                user=self.request.user,
-            ).order_by("-updated_at")
+            context["my_collections"] = (
+                Collection.objects.filter(user=self.request.user)
+                .order_by("-updated_at")
+                .cached(LIST_CACHE_TIMEOUT)
+            )
         return context
 
 
@@ -99,25 +108,17 @@ class CollectionDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return super().delete(request, *args, **kwargs)
 
 
-class CollectionAddItemView(LoginRequiredMixin, View):
+class CollectionAddItemView(LoginRequiredMixin, RateLimitMixin, View):
+    rate_limit_scope = "collection_add_item"
+
     def post(self, request: HttpRequest, pk: int, movie_slug: str) -> HttpResponse:
         collection = get_object_or_404(Collection, pk=pk, user=request.user)
         movie = get_object_or_404(MysteryTitle, slug=movie_slug)
 
-        if CollectionItem.objects.filter(collection=collection, movie=movie).exists():
-            messages.warning(request, f"{movie.title} is already in {collection.name}.")
-        else:
-            from django.db.models import Max
-
-            next_order = (
-                collection.items.aggregate(max_order=Max("order"))["max_order"] or -1
-            ) + 1
-            CollectionItem.objects.create(
-                collection=collection,
-                movie=movie,
-                order=next_order,
-            )
+        if CollectionItem.objects.append(collection, movie):
             messages.success(request, f"Added {movie.title} to {collection.name}.")
+        else:
+            messages.warning(request, f"{movie.title} is already in {collection.name}.")
 
         return redirect(movie.get_absolute_url())
 
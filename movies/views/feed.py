@@ -0,0 +1,19 @@
+from typing import Any, cast
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.views.generic import TemplateView
+
+from movies import feed
+from users.models import CustomUser
+
+
+class FeedView(LoginRequiredMixin, TemplateView):
+    template_name = "movies/feed.html"
+    feed_size = 50
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        # LoginRequiredMixin guarantees a signed-in user.
+        user = cast(CustomUser, self.request.user)
+        context["reviews"] = feed.recent_reviews(user, self.feed_size)
+        return context
@@ -1,7 +1,14 @@
+import math
 from typing import Any
 
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http.response import HttpResponseBase
+from django.shortcuts import render
+from django.views import View
 from django.views.generic.base import ContextMixin
 
+from caching import ratelimit
+
 
 class ElidedPaginationMixin(ContextMixin):
     """
@@ -18,3 +25,48 @@ class ElidedPaginationMixin(ContextMixin):
                 on_ends=1,
             )
         return context
+
+
+class RateLimitMixin(View):
+    """
+    Throttles writes with per-user and per-IP token buckets.
+
+    Limits are looked up in settings.RATE_LIMITS under ``rate_limit_scope``
+    (see caching.ratelimit). A request over a limit is answered with 429 and
+    a Retry-After header before the view itself runs; the check costs a few
+    queries of its own when the buckets live in the database cache.
+    """
+
+    rate_limit_scope = ""
+    rate_limit_methods = ("POST",)
+
+    def dispatch(
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        if request.method in self.rate_limit_methods:
+            retry_after = ratelimit.check(request, self.rate_limit_scope)
+            if retry_after:
+                return self.rate_limited(request, math.ceil(retry_after))
+        return super().dispatch(request, *args, **kwargs)
+
+    def rate_limited(self, request: HttpRequest, retry_after: int) -> HttpResponse:
+        if (
+            request.headers.get("X-Requested-With") == "XMLHttpRequest"
+            or request.content_type == "application/json"
+        ):
+            response: HttpResponse = JsonResponse(
+                {"error": "Too many requests.", "retry_after": retry_after},
+                status=429,
+            )
+        else:
+            response = render(
+                request,
+                "429.html",
+                {"retry_after": retry_after},
+                status=429,
+            )
+        response["Retry-After"] = str(retry_after)
+        return response
@@ -0,0 +1,28 @@
+from typing import Any, cast
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.views.generic import TemplateView
+
+from movies import predictions
+from movies.models import MysteryTitle, Review
+from movies.snapshots import attach_taxonomy
+from users.models import CustomUser
+
+
+class RecommendedView(LoginRequiredMixin, TemplateView):
+    template_name = "movies/recommended.html"
+    recommendations = 30
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        # LoginRequiredMixin guarantees a signed-in user.
+        user_id = cast(CustomUser, self.request.user).pk
+        reviewed = set(
+            Review.objects.filter(user_id=user_id).values_list("movie_id", flat=True),
+        )
+        movie_ids = predictions.recommend(user_id, self.recommendations, reviewed)
+        movies = MysteryTitle.objects.defer("review_histogram").in_bulk(movie_ids)
+        context["movies"] = [movies[pk] for pk in movie_ids if pk in movies]
+        attach_taxonomy(context["movies"])
+        context["predicted_ratings"] = predictions.predict(user_id, movie_ids)
+        return context
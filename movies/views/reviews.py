@@ -12,9 +12,11 @@ from django.urls import reverse
 from django.views import View
 from django.views.generic import CreateView, ListView
 
+from movies import ledger
+from movies.counters import with_pending
 from movies.forms import ReviewForm
 from movies.models import MysteryTitle, Review, ReviewHelpfulVote
-from movies.views.mixins import ElidedPaginationMixin
+from movies.views.mixins import ElidedPaginationMixin, RateLimitMixin
 from users.models import CustomUser
 
 logger = logging.getLogger(__name__)
@@ -38,11 +40,12 @@ class ReviewListView(ElidedPaginationMixin, ListView):
         context = super().get_context_data(**kwargs)
         context["movie"] = self.movie
 
+        # Get the list of reviews on the current page
+        page_reviews = context.get("reviews", [])
+        with_pending(page_reviews)
+
         # Add user's helpful votes for vote button highlighting
         if self.request.user.is_authenticated:
-            # Get the list of reviews on the current page
-            page_reviews = context.get("reviews", [])
-
             # Fetch votes only for these specific reviews
             votes = ReviewHelpfulVote.objects.filter(
                 user=self.request.user,
@@ -55,6 +58,7 @@ class ReviewListView(ElidedPaginationMixin, ListView):
             # Attach the vote object directly to the review instance
             for review in page_reviews:
                 review.user_vote = vote_map.get(review.pk)
+            ledger.attach_pending_votes(page_reviews, self.request.user)
 
         return context
 
@@ -85,7 +89,7 @@ class ReviewCreateView(LoginRequiredMixin, CreateView):
         return context
 
 
-class ReviewHelpfulVoteView(LoginRequiredMixin, View):
+class ReviewHelpfulVoteView(LoginRequiredMixin, RateLimitMixin, View):
     """
     Handle voting on whether a review was helpful or not.
 
@@ -96,6 +100,8 @@ class ReviewHelpfulVoteView(LoginRequiredMixin, View):
     If the user voted differently, the vote is updated.
     """
 
+    rate_limit_scope = "review_helpful_vote"
+
     def post(self, request: HttpRequest, pk: int) -> HttpResponse:
         """
         Process a helpful vote on a review.
@@ -121,42 +127,17 @@ class ReviewHelpfulVoteView(LoginRequiredMixin, View):
             return HttpResponseBadRequest("Missing or invalid 'is_helpful' parameter.")
         is_helpful = is_helpful_str == "true"
 
-        # Check if user has already voted
-        existing_vote = ReviewHelpfulVote.objects.filter(
-            review=review,
-            user=user,
-        ).first()
-
-        if existing_vote:
-            if existing_vote.is_helpful == is_helpful:
-                # Same vote - remove it (toggle off)
-                existing_vote.delete()
-                vote_type = "helpful" if is_helpful else "not helpful"
-                messages.success(
-                    request,
-                    f"Removed your '{vote_type}' vote.",
-                )
-            else:
-                # Different vote - update it
-                existing_vote.is_helpful = is_helpful
-                existing_vote.save()
-                vote_type = "helpful" if is_helpful else "not helpful"
-                messages.success(
-                    request,
-                    f"Changed your vote to '{vote_type}'.",
-                )
+        if ledger.is_enabled():
+            action = ledger.cast_helpful_vote(review, user, is_helpful)
         else:
-            # New vote
-            ReviewHelpfulVote.objects.create(
-                review=review,
-                user=user,
-                is_helpful=is_helpful,
-            )
-            vote_type = "helpful" if is_helpful else "not helpful"
-            messages.success(
-                request,
-                f"Marked review as '{vote_type}'.",
-            )
+            action = ReviewHelpfulVote.objects.cast_vote(review, user, is_helpful)
+        vote_type = "helpful" if is_helpful else "not helpful"
+        if action == "removed":
+            messages.success(request, f"Removed your '{vote_type}' vote.")
+        elif action == "changed":
+            messages.success(request, f"Changed your vote to '{vote_type}'.")
+        else:
+            messages.success(request, f"Marked review as '{vote_type}'.")
 
         return self._get_response(request, review)
 
@@ -175,16 +156,12 @@ class ReviewHelpfulVoteView(LoginRequiredMixin, View):
         if request.headers.get("X-Requested-With") == "XMLHttpRequest":
             # Refresh review stats
             review.refresh_from_db()
+            with_pending([review])
 
             # Get user's current vote
             user_vote = None
             if request.user.is_authenticated:
-                vote = ReviewHelpfulVote.objects.filter(
-                    review=review,
-                    user=request.user,
-                ).first()
-                if vote:
-                    user_vote = vote.is_helpful
+                user_vote = ledger.count_own_vote(review, request.user)
 
             return JsonResponse(
                 {
@@ -1,20 +1,55 @@
+import json
 import logging
-from typing import Any
+from typing import Any, cast
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpRequest, HttpResponse
-from django.shortcuts import get_object_or_404, redirect
+from django.db.models import Count
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+)
+from django.shortcuts import redirect
 from django.views import View
 from django.views.generic.detail import SingleObjectMixin
 
+from movies import ledger
 from movies.forms import TagVoteForm
 from movies.models import MysteryTitle, Tag, TagVote
+from movies.snapshots import tag_snapshot
+from movies.views.mixins import RateLimitMixin
+from users.models import CustomUser
 
 logger = logging.getLogger(__name__)
 
+# Tag vote counts are invalidated whenever a vote is cast or removed.
+TAG_COUNTS_CACHE_TIMEOUT = 60 * 15
 
-class TagVoteView(LoginRequiredMixin, SingleObjectMixin, View):
+
+def get_tag_counts(movie: MysteryTitle) -> list[Tag]:
+    """Return the title's voted tags, most votes first, with ``vote_count`` set."""
+    # Aggregate votes for each tag on this movie; the tags themselves come
+    # from the in-memory snapshot.
+    vote_counts = (
+        TagVote.objects.filter(movie=movie)
+        .values("tag_id")
+        .annotate(vote_count=Count("pk"))
+        .order_by()
+        .cached(TAG_COUNTS_CACHE_TIMEOUT)
+    )
+    tags_with_counts = []
+    for row in vote_counts:
+        if tag := tag_snapshot.get(row["tag_id"]):
+            tag.vote_count = row["vote_count"]
+            tags_with_counts.append(tag)
+    tags_with_counts.sort(key=lambda tag: (-tag.vote_count, tag.name))
+    return tags_with_counts
+
+
+class TagVoteView(LoginRequiredMixin, RateLimitMixin, SingleObjectMixin, View):
     """
     Handles upvoting/tagging a movie.
     If the user has already voted for this tag on this movie, the vote is removed (toggled).
@@ -22,6 +57,7 @@ class TagVoteView(LoginRequiredMixin, SingleObjectMixin, View):
     """
 
     model = MysteryTitle
+    rate_limit_scope = "tag_vote"
 
     def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
         self.object = self.get_object()
@@ -32,8 +68,9 @@ class TagVoteView(LoginRequiredMixin, SingleObjectMixin, View):
             self._toggle_vote(request.user, tag)
         elif "tag_id" in request.POST:
             # Handle button clicks from the list of existing tags
-            tag_id = request.POST.get("tag_id")
-            tag = get_object_or_404(Tag, pk=tag_id)
+            tag = tag_snapshot.get(request.POST.get("tag_id"))
+            if tag is None:
+                raise Http404("Tag not found")
             self._toggle_vote(request.user, tag)
         else:
             messages.error(request, "Invalid tag selection.")
@@ -41,10 +78,75 @@ class TagVoteView(LoginRequiredMixin, SingleObjectMixin, View):
         return redirect(self.object.get_absolute_url())
 
     def _toggle_vote(self, user: Any, tag: Tag) -> None:
-        vote_query = TagVote.objects.filter(movie=self.object, tag=tag, user=user)
-        if vote_query.exists():
-            vote_query.delete()
-            messages.success(self.request, f"Removed vote for '{tag.name}'.")
+        if ledger.is_enabled():
+            voted = ledger.toggle_tag_vote(self.object, tag, user)
         else:
-            TagVote.objects.create(movie=self.object, tag=tag, user=user)
+            voted = TagVote.objects.toggle(movie=self.object, tag=tag, user=user)
+        if voted:
             messages.success(self.request, f"Voted for '{tag.name}'.")
+        else:
+            messages.success(self.request, f"Removed vote for '{tag.name}'.")
+
+
+class BulkTagVoteView(LoginRequiredMixin, RateLimitMixin, SingleObjectMixin, View):
+    """
+    Adds and removes several of the user's tag votes on a movie at once.
+
+    Expects a JSON body ``{"add": [tag ids], "remove": [tag ids]}``, applies
+    it in one transaction and returns the changes with the updated counts.
+    """
+
+    model = MysteryTitle
+    rate_limit_scope = "bulk_tag_vote"
+    # Most tags a single request may add or remove.
+    max_tags = 50
+
+    def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        self.object = self.get_object()
+        try:
+            data = json.loads(request.body)
+            if not isinstance(data, dict):
+                raise ValueError("Expected a JSON object.")
+            add = self._tag_ids(data.get("add", []))
+            remove = self._tag_ids(data.get("remove", []))
+        except ValueError as exc:
+            return HttpResponseBadRequest(str(exc))
+        if add & remove:
+            return HttpResponseBadRequest("A tag cannot be both added and removed.")
+
+        user = cast(CustomUser, request.user)
+        if ledger.is_enabled():
+            added, removed = ledger.set_tag_votes(self.object, user, add, remove)
+        else:
+            added, removed = TagVote.objects.set_votes(self.object, user, add, remove)
+
+        voted = ledger.voted_tag_ids(self.object, user)
+        return JsonResponse(
+            {
+                "added": sorted(added),
+                "removed": sorted(removed),
+                "tags": [
+                    {
+                        "id": tag.pk,
+                        "name": tag.name,
+                        "slug": tag.slug,
+                        "vote_count": tag.vote_count,
+                        "voted": tag.pk in voted,
+                    }
+                    for tag in get_tag_counts(self.object)
+                ],
+            },
+        )
+
+    def _tag_ids(self, value: Any) -> set[int]:
+        """Validate a list of tag ids against the tag snapshot."""
+        if not isinstance(value, list) or len(value) > self.max_tags:
+            raise ValueError(f"Expected a list of at most {self.max_tags} tag ids.")
+        ids = set()
+        for pk in value:
+            if isinstance(pk, bool) or not isinstance(pk, int):
+                raise ValueError(f"Invalid tag id: {pk!r}")
+            if tag_snapshot.get(pk) is None:
+                raise ValueError(f"Unknown tag id: {pk}")
+            ids.add(pk)
+        return ids
@@ -1,17 +1,158 @@
 import logging
+from collections import defaultdict
 from typing import TYPE_CHECKING, Any, cast
 
-from django.db import models
-from django.db.models import Q
-from django.views.generic import DetailView, ListView
+from django.db.models import Q, QuerySet
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.generic import DetailView, ListView, View
 
-from movies.models import Director, Series
+from caching.snapshots import ModelSnapshot
+from caching.stampede import get_or_compute_versioned
+from caching.tags import fingerprint
+from movies.heatmaps import heatmap_grid
+from movies.models import Director, DirectorStats, Series, SeriesStats
+from movies.snapshots import director_snapshot, series_snapshot
+from movies.views.mixins import ElidedPaginationMixin
 
 logger = logging.getLogger(__name__)
 
+# Chart data is invalidated through the director/series cache tag whenever one
+# of its movies changes, so the timeout only bounds how long an entry lives.
+CHART_CACHE_TIMEOUT = 60 * 60
+# Cached list querysets are invalidated whenever their tables change.
+LIST_CACHE_TIMEOUT = 60 * 15
+# Browsers reuse the chart JSON this long before revalidating it by ETag.
+CHART_MAX_AGE = 60
+# Charts with more rated titles than this are binned into a grid, with one
+# point per occupied cell of CHART_BIN_SIZE x CHART_BIN_SIZE.
+CHART_MAX_POINTS = 200
+CHART_BIN_SIZE = 0.5
+
+
+def taxonomy_tag(obj: Director | Series) -> str:
+    return f"{obj._meta.model_name}:{obj.pk}"
+
+
+def _chart_etag(digest: str) -> str:
+    return quote_etag(f"{digest}-{CHART_MAX_POINTS}")
+
+
+def get_taxonomy_chart(obj: Director | Series) -> tuple[dict[str, Any], str]:
+    """
+    Return the quality vs. difficulty chart data for a director or series.
+
+    The result is cached under the object's cache tag, which is invalidated
+    whenever one of its movies changes. It comes with the fingerprint of the
+    tag generation it was built from, which is older than the current one
+    while a stale chart is served during its recomputation.
+    """
+    tag = taxonomy_tag(obj)
+    return cast(
+        tuple[dict[str, Any], str],
+        get_or_compute_versioned(
+            f"taxonomy-chart:{tag}",
+            lambda: _build_taxonomy_chart(obj),
+            CHART_CACHE_TIMEOUT,
+            tags=[tag],
+        ),
+    )
+
+
+def _build_taxonomy_chart(obj: Director | Series) -> dict[str, Any]:
+    """Query the plot points and averages for a director or series."""
+    # We assume obj has a 'movies' related manager
+    movies_qs = obj.movies.all()
+
+    # 1. Prepare Plot Data (Quality vs Difficulty)
+    # Filter for movies that have at least one metric rated
+    rated_movies = movies_qs.filter(
+        Q(avg_difficulty__gt=0) | Q(avg_quality__gt=0),
+    ).only("title", "slug", "avg_difficulty", "avg_quality")
+
+    plot_data = [
+        {
+            "title": movie.title,
+            "x": movie.avg_difficulty,
+            "y": movie.avg_quality,
+            "url": movie.get_absolute_url(),
+        }
+        for movie in rated_movies
+    ]
+    total = len(plot_data)
+    binned = total > CHART_MAX_POINTS
+    if binned:
+        plot_data = bin_plot_data(plot_data, CHART_BIN_SIZE)
+
+    # 2. Averages of the rated titles come from the precomputed stats row.
+    stats = taxonomy_stats_model(obj).objects.filter(pk=obj.pk).first()
+
+    return {
+        "plot_data": plot_data,
+        "total": total,
+        "binned": binned,
+        "avg_difficulty": stats.avg_difficulty if stats else 0.0,
+        "avg_quality": stats.avg_quality if stats else 0.0,
+    }
+
+
+def bin_plot_data(
+    plot_data: list[dict[str, Any]],
+    bin_size: float,
+) -> list[dict[str, Any]]:
+    """
+    Merge plot points falling into the same grid cell into one point.
+
+    Each merged point sits at the mean of its members and carries their
+    ``count``; cells holding a single title keep its title and url.
+    """
+    cells: defaultdict[tuple[int, int], list[dict[str, Any]]] = defaultdict(list)
+    for point in plot_data:
+        cell = (int(point["x"] // bin_size), int(point["y"] // bin_size))
+        cells[cell].append(point)
+
+    binned = []
+    for _, members in sorted(cells.items()):
+        count = len(members)
+        binned.append(
+            {
+                "title": members[0]["title"] if count == 1 else f"{count} titles",
+                "x": round(sum(point["x"] for point in members) / count, 2),
+                "y": round(sum(point["y"] for point in members) / count, 2),
+                "url": members[0]["url"] if count == 1 else None,
+                "count": count,
+            },
+        )
+    return binned
+
+
+def taxonomy_stats_model(obj: Director | Series) -> type[DirectorStats | SeriesStats]:
+    return DirectorStats if isinstance(obj, Director) else SeriesStats
+
+
+class SnapshotObjectMixin:
+    """Look up a detail view's object by slug in an in-memory snapshot."""
+
+    snapshot: ModelSnapshot[Any]
+    kwargs: dict[str, Any]
+
+    def get_object(self, queryset: QuerySet[Any] | None = None) -> Any:
+        obj = self.snapshot.get_by("slug", self.kwargs["slug"])
+        if obj is None:
+            raise Http404(f"No {self.snapshot.model._meta.verbose_name} found")
+        return obj
+
 
 class TaxonomyChartMixin:
-    """Mixin to provide consistent context data for taxonomy detail views."""
+    """
+    Mixin to provide consistent context data for taxonomy detail views.
+
+    The plot points are fetched by the page from the chart JSON endpoint;
+    the context only carries its URL, plus the averages and the review
+    heatmap stored on the stats row.
+    """
 
     # Explicitly declare that instances of this mixin will have an 'object' attribute
     # of type Director or Series.
@@ -19,49 +160,107 @@ class TaxonomyChartMixin:
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)  # type: ignore[misc]
-
-        # We assume self.object has a 'movies' related manager
-        movies_qs = self.object.movies.all()
-
-        # 1. Prepare Plot Data (Quality vs Difficulty)
-        # Filter for movies that have at least one metric rated
-        rated_movies = movies_qs.filter(
-            Q(avg_difficulty__gt=0) | Q(avg_quality__gt=0),
-        ).only("title", "slug", "avg_difficulty", "avg_quality")
-
-        plot_data = [
+        stats = (
+            taxonomy_stats_model(self.object)
+            .objects.filter(pk=self.object.pk)
+            .cached(CHART_CACHE_TIMEOUT)
+            .first()
+        )
+        avg_difficulty = stats.avg_difficulty if stats else 0.0
+        avg_quality = stats.avg_quality if stats else 0.0
+        context.update(
             {
-                "title": movie.title,
-                "x": movie.avg_difficulty,
-                "y": movie.avg_quality,
-                "url": movie.get_absolute_url(),
-            }
-            for movie in rated_movies
-        ]
-
-        # 2. Calculate Averages
-        # We calculate the average of rated items (excluding 0s)
-        stats = movies_qs.aggregate(
-            avg_qual=models.Avg("avg_quality", filter=Q(avg_quality__gt=0)),
-            avg_diff=models.Avg("avg_difficulty", filter=Q(avg_difficulty__gt=0)),
+                "avg_difficulty": avg_difficulty,
+                "avg_quality": avg_quality,
+                # The averages only cover rated titles, so either being set
+                # means there is at least one point to plot.
+                "has_chart": avg_difficulty > 0 or avg_quality > 0,
+                "heatmap": heatmap_grid(stats.heatmap if stats else []),
+                "chart_url": reverse(
+                    f"movies:{self.object._meta.model_name}_chart",
+                    kwargs={"slug": self.object.slug},
+                ),
+            },
         )
 
-        context["plot_data"] = plot_data
-        context["avg_difficulty"] = stats["avg_diff"] or 0.0
-        context["avg_quality"] = stats["avg_qual"] or 0.0
-
         # Explicitly cast context to dict[str, Any] to satisfy mypy strict return check
         return cast(dict[str, Any], context)
 
 
-class DirectorListView(ListView):
+class TaxonomyChartDataView(SnapshotObjectMixin, View):
+    """
+    Chart data of a director or series as JSON.
+
+    The ETag is derived from the generation of the object's cache tag, so
+    revalidating an unchanged chart costs a cache lookup and a 304. A stale
+    chart served while it is recomputed carries the ETag of the generation it
+    was built from and must be revalidated on the next request.
+    """
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        obj = self.get_object()
+        current = fingerprint([taxonomy_tag(obj)])
+        response = get_conditional_response(request, etag=_chart_etag(current))
+        served = current
+        if response is None:
+            chart, served = get_taxonomy_chart(obj)
+            response = JsonResponse(chart)
+        response.headers["ETag"] = _chart_etag(served)
+        max_age = CHART_MAX_AGE if served == current else 0
+        patch_cache_control(response, public=True, max_age=max_age)
+        return response
+
+
+class TaxonomyListView(ElidedPaginationMixin, ListView):
+    """
+    Paginated list of directors or series, sortable by their precomputed stats.
+
+    The ``sort`` query parameter picks one of SORT_OPTIONS; rows are read
+    from the stats table joined to the model, never aggregated per request.
+    """
+
+    model: type[Director | Series]
+    paginate_by = 24
+    # sort parameter -> (label, ordering)
+    SORT_OPTIONS = {
+        "name": ("Name", "name"),
+        "titles": ("Titles", "-stats__title_count"),
+        "quality": ("Quality", "-stats__avg_quality"),
+        "difficulty": ("Difficulty", "-stats__avg_difficulty"),
+        "fair-play": ("Fair Play %", "-stats__fair_play_pct"),
+        "reviews": ("Reviews", "-stats__review_count"),
+    }
+    sort = "name"
+
+    def get_queryset(self) -> QuerySet[Any]:
+        sort = self.request.GET.get("sort", "")
+        self.sort = sort if sort in self.SORT_OPTIONS else "name"
+        ordering = self.SORT_OPTIONS[self.sort][1]
+        queryset: QuerySet[Any] = (
+            self.model._default_manager.select_related("stats")
+            .order_by(ordering, "name")
+            .cached(LIST_CACHE_TIMEOUT)
+        )
+        return queryset
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context["sort"] = self.sort
+        context["sort_options"] = {
+            key: label for key, (label, _) in self.SORT_OPTIONS.items()
+        }
+        return context
+
+
+class DirectorListView(TaxonomyListView):
     model = Director
     template_name = "movies/director_list.html"
     context_object_name = "directors"
 
 
-class DirectorDetailView(TaxonomyChartMixin, DetailView):
+class DirectorDetailView(SnapshotObjectMixin, TaxonomyChartMixin, DetailView):
     model = Director
+    snapshot = director_snapshot
     template_name = "movies/director_detail.html"
     context_object_name = "director"
 
@@ -69,16 +268,25 @@ class DirectorDetailView(TaxonomyChartMixin, DetailView):
         object: Director
 
 
-class SeriesListView(ListView):
+class DirectorChartDataView(TaxonomyChartDataView):
+    snapshot = director_snapshot
+
+
+class SeriesListView(TaxonomyListView):
     model = Series
     template_name = "movies/series_list.html"
     context_object_name = "series_list"
 
 
-class SeriesDetailView(TaxonomyChartMixin, DetailView):
+class SeriesDetailView(SnapshotObjectMixin, TaxonomyChartMixin, DetailView):
     model = Series
+    snapshot = series_snapshot
     template_name = "movies/series_detail.html"
     context_object_name = "series"
 
     if TYPE_CHECKING:
         object: Series
+
+
+class SeriesChartDataView(TaxonomyChartDataView):
+    snapshot = series_snapshot
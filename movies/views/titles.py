@@ -1,18 +1,22 @@
 import logging
-from typing import Any
+from typing import Any, cast
 
-from django.db.models import Count, QuerySet
+from django.db.models import QuerySet
 from django.views.generic import DetailView, ListView
 
+from movies import ledger, predictions
+from movies.counters import with_pending
 from movies.forms import TagVoteForm
 from movies.models import (
     Collection,
     MysteryTitle,
     ReviewHelpfulVote,
-    Tag,
+    TitleNeighbour,
     WatchListEntry,
 )
+from movies.snapshots import attach_taxonomy
 from movies.views.mixins import ElidedPaginationMixin  # Import the new mixin
+from movies.views.tags import get_tag_counts
 
 DEFAULT_PAGE_SIZE = 15
 
@@ -24,6 +28,12 @@ class MysteryDetailView(DetailView):
     template_name = "movies/mystery_detail.html"
     context_object_name = "movie"
 
+    def get_object(self, queryset: QuerySet[Any] | None = None) -> MysteryTitle:
+        movie = cast(MysteryTitle, super().get_object(queryset))
+        attach_taxonomy([movie])
+        with_pending([movie])
+        return movie
+
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
 
@@ -32,6 +42,7 @@ class MysteryDetailView(DetailView):
 
         # Convert to list to allow attaching attributes
         recent_reviews = list(reviews[:3])
+        with_pending(recent_reviews)
         context["recent_reviews"] = recent_reviews
         context["total_reviews_count"] = reviews.count()
 
@@ -39,26 +50,33 @@ class MysteryDetailView(DetailView):
             context["has_reviewed"] = self.object.reviews.filter(
                 user=self.request.user,
             ).exists()
+            if not context["has_reviewed"]:
+                context["predicted_rating"] = predictions.predict(
+                    self.request.user.pk,
+                    [self.object.pk],
+                ).get(self.object.pk)
 
         # Tag data
-        # Aggregate votes for each tag on this movie
-        tags_with_counts = (
-            Tag.objects.filter(votes__movie=self.object)
-            .annotate(vote_count=Count("votes"))
-            .order_by("-vote_count", "name")
+        context["tags_with_counts"] = get_tag_counts(self.object)
+
+        # Precomputed by the build_similar_titles command
+        context["rated_alike"] = TitleNeighbour.titles_for(
+            self.object,
+            TitleNeighbour.Kind.RATINGS,
+        )
+        context["tagged_alike"] = TitleNeighbour.titles_for(
+            self.object,
+            TitleNeighbour.Kind.TAGS,
         )
-        context["tags_with_counts"] = tags_with_counts
 
         # Pass the form for adding new tags
         context["tag_form"] = TagVoteForm()
 
         # Get the set of Tag IDs the current user has voted for
         if self.request.user.is_authenticated:
-            context["user_voted_tag_ids"] = set(
-                self.object.tag_votes.filter(user=self.request.user).values_list(
-                    "tag_id",
-                    flat=True,
-                ),
+            context["user_voted_tag_ids"] = ledger.voted_tag_ids(
+                self.object,
+                self.request.user,
             )
         else:
             context["user_voted_tag_ids"] = set()
@@ -77,6 +95,7 @@ class MysteryDetailView(DetailView):
             # Attach vote to review objects
             for review in recent_reviews:
                 review.user_vote = vote_map.get(review.pk)
+            ledger.attach_pending_votes(recent_reviews, self.request.user)
 
         # Watchlist status
         if self.request.user.is_authenticated:
@@ -89,9 +108,12 @@ class MysteryDetailView(DetailView):
 
         # User's Collections
         if self.request.user.is_authenticated:
-            context["user_collections"] = Collection.objects.filter(
-                user=self.request.user,
-            ).order_by("-updated_at")
+            # Flag collections that already hold this movie in the same query
+            context["user_collections"] = (
+                Collection.objects.filter(user=self.request.user)
+                .with_movie_flag(self.object)
+                .order_by("-updated_at")
+            )
         else:
             context["user_collections"] = []
 
@@ -109,10 +131,21 @@ class MysteryListView(ElidedPaginationMixin, ListView):
     def get_queryset(self) -> QuerySet[MysteryTitle]:
         self.query = self.request.GET.get("q")
 
-        # Get all objects -> search if applicable -> order
-        return MysteryTitle.objects.search(self.query).order_by("-release_year")
+        # Get all objects -> search if applicable -> order. The histograms are
+        # only read for cards missing from the cache, in one batch.
+        return (
+            MysteryTitle.objects.search(self.query)
+            .defer("review_histogram")
+            .order_by("-release_year")
+        )
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
+        attach_taxonomy(context["movies"])
         context["search_query"] = self.query
+        if self.request.user.is_authenticated:
+            context["predicted_ratings"] = predictions.predict(
+                self.request.user.pk,
+                [movie.pk for movie in context["movies"]],
+            )
         return context
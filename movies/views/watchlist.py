@@ -9,6 +9,7 @@ from django.views import View
 from django.views.generic import ListView
 
 from movies.models import MysteryTitle, WatchListEntry
+from movies.views.mixins import RateLimitMixin
 from users.models import CustomUser
 
 logger = logging.getLogger(__name__)
@@ -28,23 +29,19 @@ class WatchListView(LoginRequiredMixin, ListView):
         ).select_related("movie", "movie__director")
 
 
-class WatchListToggleView(LoginRequiredMixin, View):
+class WatchListToggleView(LoginRequiredMixin, RateLimitMixin, View):
+    rate_limit_scope = "watchlist_toggle"
+
     def post(self, request: HttpRequest, slug: str) -> HttpResponse:
         movie = get_object_or_404(MysteryTitle, slug=slug)
 
-        # cast is needed here as well for the get_or_create call
+        # cast is needed here as well for the toggle call
         user = cast(CustomUser, request.user)
 
-        entry, created = WatchListEntry.objects.get_or_create(
-            user=user,
-            movie=movie,
-        )
-
-        if not created:
-            entry.delete()
-            logger.info("User %s removed %s from watchlist", user, movie)
-        else:
+        if WatchListEntry.objects.toggle(user=user, movie=movie):
             logger.info("User %s added %s to watchlist", user, movie)
+        else:
+            logger.info("User %s removed %s from watchlist", user, movie)
 
         # Redirect back to the movie detail page
         return redirect(movie.get_absolute_url())
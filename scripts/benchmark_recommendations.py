@@ -0,0 +1,114 @@
+"""
+Time the vectorised recommendation builds and ALS on synthetic ratings.
+
+No database is involved: ratings are drawn with a long-tailed popularity per
+title and activity per user, as on the real site, and fed straight to
+movies.vectors. Needs the "ml" dependency group. The similarity matrix is
+dense, 8 bytes per stale title x title (72 MB for the default 3,000 titles),
+so memory grows with the square of ``--titles``.
+
+    python scripts/benchmark_recommendations.py --reviews 1000000
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from movies.vectors import factorize, item_similarities, top_k  # noqa: E402
+
+Arrays = tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.float64]]
+
+
+def synthetic_ratings(
+    reviews: int,
+    users: int,
+    titles: int,
+    seed: int = 0,
+) -> Arrays:
+    """Return (users, items, quality) arrays sorted by user, one review per pair."""
+    rng = np.random.default_rng(seed)
+    user_weights = rng.pareto(1.5, users) + 1
+    title_weights = rng.pareto(1.2, titles) + 1
+    user = rng.choice(users, reviews, p=user_weights / user_weights.sum())
+    item = rng.choice(titles, reviews, p=title_weights / title_weights.sum())
+    pairs = np.unique(user * titles + item)
+    user, item = pairs // titles, pairs % titles
+    quality = rng.integers(1, 6, len(pairs)).astype(np.float64)
+    return user, item, quality
+
+
+def timed[T](label: str, func: Callable[..., T], *args: Any) -> T:
+    started = time.perf_counter()
+    result = func(*args)
+    sys.stdout.write(f"{label:<28}{time.perf_counter() - started:8.2f}s\n")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--titles", type=int, default=3_000)
+    parser.add_argument(
+        "--stale",
+        type=int,
+        default=50,
+        help="Titles per incremental build",
+    )
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rank", type=int, default=32, help="Factorisation rank")
+    parser.add_argument("--workers", type=int, default=1, help="ALS threads")
+    args = parser.parse_args()
+
+    users, items, quality = synthetic_ratings(args.reviews, args.users, args.titles)
+    sys.stdout.write(
+        f"{len(users)} reviews by {args.users} users of {args.titles} titles\n",
+    )
+
+    similarity = timed(
+        "full similarity",
+        item_similarities,
+        users,
+        items,
+        quality,
+        args.users,
+        args.titles,
+    )
+    timed("full top-k", top_k, similarity, args.k)
+
+    stale = np.random.default_rng(1).choice(args.titles, args.stale, replace=False)
+    timed(
+        f"incremental ({args.stale} titles)",
+        item_similarities,
+        users,
+        items,
+        quality,
+        args.users,
+        args.titles,
+        np.sort(stale),
+    )
+    timed(
+        f"ALS (rank {args.rank}, {args.workers} workers)",
+        factorize,
+        users,
+        items,
+        quality,
+        args.users,
+        args.titles,
+        args.rank,
+        0.05,
+        10,
+        args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
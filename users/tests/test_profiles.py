@@ -1,8 +1,12 @@
+from datetime import timedelta
+
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 
-from config.tests.factories import ReviewFactory, UserFactory
-from movies.models import MysteryTitle
+from config.tests.factories import MovieFactory, ReviewFactory, UserFactory
+from movies.models import MysteryTitle, ReviewerStats, ReviewHelpfulVote
+from users.views.profiles import UserDetailView
 
 
 class UserProfileTests(TestCase):
@@ -102,3 +106,128 @@ class UserProfileTests(TestCase):
         url = reverse("signup")
         response = self.client.get(url)
         self.assertNotContains(response, "My Profile")
+
+
+class ProfilePaginationTests(TestCase):
+    def setUp(self) -> None:
+        self.user, _ = UserFactory.create()
+        self.url = reverse("profile", kwargs={"username": self.user.username})
+        self.per_page = UserDetailView.reviews_per_page
+        now = timezone.now()
+        self.reviews = [
+            ReviewFactory.create(user=self.user, movie=MovieFactory.create())
+            for _ in range(self.per_page + 5)
+        ]
+        # Two reviews share a timestamp so the page break has to use the pk.
+        for i, review in enumerate(self.reviews):
+            review.created_at = now - timedelta(minutes=i // 2)
+            review.save(update_fields=["created_at"])
+
+    def test_pages_walk_all_reviews_once(self) -> None:
+        """Test that following the cursor shows every review exactly once."""
+        response = self.client.get(self.url)
+        first = response.context["reviews"]
+        self.assertEqual(len(first), self.per_page)
+        self.assertTrue(response.context["is_first_page"])
+        self.assertContains(response, "Older reviews")
+        self.assertContains(response, f"Reviews ({len(self.reviews)})")
+
+        response = self.client.get(
+            self.url,
+            {"after": response.context["next_cursor"]},
+        )
+        second = response.context["reviews"]
+        self.assertEqual(len(second), 5)
+        self.assertIsNone(response.context["next_cursor"])
+        self.assertContains(response, "Newest")
+
+        shown = [review.pk for review in first + second]
+        expected = sorted(
+            self.reviews,
+            key=lambda review: (review.created_at, review.pk),
+            reverse=True,
+        )
+        self.assertEqual(shown, [review.pk for review in expected])
+
+    def test_invalid_cursor_shows_first_page(self) -> None:
+        """Test that a malformed cursor falls back to the newest reviews."""
+        for cursor in ("junk", "12-", "-3", "9" * 30 + "-1"):
+            response = self.client.get(self.url, {"after": cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context["reviews"]), self.per_page)
+
+
+class ReviewerStatsTests(TestCase):
+    def setUp(self) -> None:
+        self.user, _ = UserFactory.create()
+
+    def stats(self) -> ReviewerStats:
+        return ReviewerStats.objects.get(user=self.user)
+
+    def assert_matches_compute(self) -> None:
+        stats = self.stats()
+        for name, value in ReviewerStats.compute(self.user.pk).items():
+            self.assertEqual(getattr(stats, name), value, name)
+
+    def test_new_user_gets_empty_stats(self) -> None:
+        """Test that signing up creates a zeroed stats row."""
+        stats = self.stats()
+        self.assertEqual(stats.review_count, 0)
+        self.assertEqual(stats.avg_quality, 0.0)
+
+    def test_reviews_update_stats(self) -> None:
+        """Test that creating, editing and deleting reviews keeps stats exact."""
+        first = ReviewFactory.create(
+            user=self.user,
+            movie=MovieFactory.create(),
+            quality=4,
+            is_fair_play=True,
+        )
+        second = ReviewFactory.create(
+            user=self.user,
+            movie=MovieFactory.create(),
+            quality=2,
+            is_fair_play=False,
+        )
+        self.assert_matches_compute()
+        self.assertEqual(self.stats().avg_quality, 3.0)
+        self.assertEqual(self.stats().fair_play_rate, 50.0)
+
+        second.quality = 5
+        second.solved = True
+        second.save()
+        self.assert_matches_compute()
+        self.assertEqual(self.stats().solve_rate, 50.0)
+
+        first.delete()
+        self.assert_matches_compute()
+        self.assertEqual(self.stats().review_count, 1)
+
+    def test_helpful_votes_update_stats(self) -> None:
+        """Test that helpful votes on a user's reviews are counted for them."""
+        review = ReviewFactory.create(user=self.user, movie=MovieFactory.create())
+        voter, _ = UserFactory.create()
+
+        ReviewHelpfulVote.objects.cast_vote(review, voter, is_helpful=True)
+        self.assertEqual(self.stats().helpful_votes_received, 1)
+        ReviewHelpfulVote.objects.cast_vote(review, voter, is_helpful=False)
+        self.assertEqual(self.stats().helpful_votes_received, 0)
+        ReviewHelpfulVote.objects.cast_vote(review, voter, is_helpful=True)
+        ReviewHelpfulVote.objects.cast_vote(review, voter, is_helpful=True)
+        self.assertEqual(self.stats().helpful_votes_received, 0)
+        self.assert_matches_compute()
+
+    def test_profile_shows_stats(self) -> None:
+        """Test that the profile page shows the precomputed stats."""
+        ReviewFactory.create(
+            user=self.user,
+            movie=MovieFactory.create(),
+            quality=4,
+            solved=True,
+        )
+        url = reverse("profile", kwargs={"username": self.user.username})
+
+        response = self.client.get(url)
+
+        self.assertContains(response, "4.0/5")
+        self.assertContains(response, "100%")
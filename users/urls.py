@@ -1,8 +1,13 @@
 from django.urls import path
 
-from users.views import SignUpView, UserDetailView
+from users.views import FollowToggleView, SignUpView, UserDetailView
 
 urlpatterns = [
     path("signup/", SignUpView.as_view(), name="signup"),
     path("profile/<str:username>/", UserDetailView.as_view(), name="profile"),
+    path(
+        "profile/<str:username>/follow/",
+        FollowToggleView.as_view(),
+        name="follow_toggle",
+    ),
 ]
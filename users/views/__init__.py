@@ -1,4 +1,4 @@
-from .profiles import UserDetailView
+from .profiles import FollowToggleView, UserDetailView
 from .signup import SignUpView
 
-__all__ = ["UserDetailView", "SignUpView"]
+__all__ = ["FollowToggleView", "UserDetailView", "SignUpView"]
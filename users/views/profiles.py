@@ -1,10 +1,38 @@
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import Q
+from django.http import HttpRequest, HttpResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.views import View
 from django.views.generic import DetailView
 
+from movies.models import Follow, Review, ReviewerStats
+from movies.views.mixins import RateLimitMixin
+
 User = get_user_model()
 
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def encode_cursor(review: Review) -> str:
+    """Return the ``after`` cursor for the reviews older than ``review``."""
+    micros = (review.created_at - EPOCH) // timedelta(microseconds=1)
+    return f"{micros}-{review.pk}"
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int] | None:
+    """Parse an ``after`` cursor into (created_at, pk), or None if invalid."""
+    micros, _, pk = cursor.partition("-")
+    if not (micros.isdigit() and pk.isdigit()):
+        return None
+    try:
+        return EPOCH + timedelta(microseconds=int(micros)), int(pk)
+    except OverflowError:
+        return None
+
 
 class UserDetailView(DetailView):
     model = User
@@ -12,10 +40,54 @@ class UserDetailView(DetailView):
     context_object_name = "profile_user"
     slug_field = "username"
     slug_url_kwarg = "username"
+    reviews_per_page = 20
+
+    def get_reviews(self) -> tuple[list[Review], str | None]:
+        """
+        Return a page of the user's reviews, newest first, and the next cursor.
+
+        Pages are keyed on the last review shown rather than numbered, so a
+        page deep into a prolific reviewer's history is one index range scan
+        and no count is needed.
+        """
+        reviews = self.object.review_set.select_related("movie").order_by(
+            "-created_at",
+            "-pk",
+        )
+        after = decode_cursor(self.request.GET.get("after", ""))
+        if after:
+            created_at, pk = after
+            reviews = reviews.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk),
+            )
+        page = list(reviews[: self.reviews_per_page + 1])
+        if len(page) > self.reviews_per_page:
+            page = page[: self.reviews_per_page]
+            return page, encode_cursor(page[-1])
+        return page, None
 
     def get_context_data(self, **kwargs: dict[str, Any]) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context["reviews"] = self.object.review_set.select_related("movie").order_by(
-            "-created_at",
+        reviews, next_cursor = self.get_reviews()
+        context["reviews"] = reviews
+        context["next_cursor"] = next_cursor
+        context["is_first_page"] = "after" not in self.request.GET
+        context["stats"] = ReviewerStats.objects.filter(
+            user=self.object,
+        ).first() or ReviewerStats(user=self.object)
+        user = self.request.user
+        context["is_following"] = (
+            user.is_authenticated
+            and Follow.objects.filter(follower=user, followee=self.object).exists()
         )
         return context
+
+
+class FollowToggleView(LoginRequiredMixin, RateLimitMixin, View):
+    rate_limit_scope = "follow_toggle"
+
+    def post(self, request: HttpRequest, username: str) -> HttpResponse:
+        followee = get_object_or_404(User, username=username)
+        if followee != request.user:
+            Follow.objects.toggle(follower=request.user, followee=followee)
+        return redirect("profile", username=username)